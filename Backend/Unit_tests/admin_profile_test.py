@@ -0,0 +1,71 @@
+"""
+/admin/profile in-process: auth, then a capture while the loop does real work.
+"""
+import asyncio
+import dataclasses
+import os
+import sys
+from pathlib import Path
+
+os.environ["SKYJO_SNAPSHOT_DIR"] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx  # noqa: E402
+
+from Backend.app import main as app_main  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+from Backend.app.profiler import profiler  # noqa: E402
+
+
+async def busy_loop(stop: asyncio.Event):
+    engine = GameStore().create_game()
+    for name in ("A", "B", "C", "D"):
+        engine.add_player(name)
+    while not stop.is_set():
+        for _ in range(200):  # a slow-ish handler between awaits
+            engine.public_state()
+        await asyncio.sleep(0)
+
+
+async def main():
+    original = app_main.settings
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.post("/admin/profile", params={"seconds": 0.1})
+        assert r.status_code == 404, "admin endpoints are off without a token"
+
+        app_main.settings = dataclasses.replace(original, admin_token="s3cret")
+        try:
+            r = await client.post("/admin/profile", params={"seconds": 0.1},
+                                  headers={"Authorization": "Bearer nope"})
+            assert r.status_code == 401
+
+            auth = {"Authorization": "Bearer s3cret"}
+            stop = asyncio.Event()
+            worker = asyncio.create_task(busy_loop(stop))
+            first = asyncio.create_task(client.post("/admin/profile", params={"seconds": 0.5}, headers=auth))
+            await asyncio.sleep(0.05)
+            busy = await client.post("/admin/profile", params={"seconds": 0.1}, headers=auth)
+            assert busy.status_code == 409, busy.text
+            r = await first
+            stop.set()
+            await worker
+
+            assert r.status_code == 200, r.text
+            lines = r.text.strip().splitlines()
+            assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+            assert any("public_state" in line for line in lines), "hot engine call missing from profile"
+            assert not profiler.running
+            print(f"✅ collapsed profile: {len(lines)} distinct stacks")
+
+            r = await client.post("/admin/profile", params={"seconds": 0.2, "format": "speedscope"}, headers=auth)
+            doc = r.json()
+            prof = doc["profiles"][0]
+            assert prof["type"] == "sampled" and len(prof["samples"]) == len(prof["weights"])
+            assert all(i < len(doc["shared"]["frames"]) for s in prof["samples"] for i in s)
+            print("✅ speedscope profile is well-formed")
+        finally:
+            app_main.settings = original
+
+
+asyncio.run(main())
@@ -0,0 +1,172 @@
+"""
+In-process WebSocket client for the FastAPI app: speaks ASGI directly to
+`app.main.app`, no uvicorn, no ports. Waits are on conditions (a message
+arrived) rather than timed polling, so a scenario runs as fast as the server
+code does.
+
+    async with isolated_store():
+        table = await AsgiWebSocket.open()
+        await table.send("create_table")
+        code = (await table.expect_type("table_created"))["payload"]["code"]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("SKYJO_SNAPSHOT_DIR", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app import main as app_main  # noqa: E402
+from Backend.app import ws as ws_module  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+
+Message = Dict[str, Any]
+
+DEFAULT_TIMEOUT_S = 2.0
+
+
+@asynccontextmanager
+async def isolated_store(seed=None):
+    """
+    Give the app a fresh GameStore for the duration of one test. With `seed`
+    every game it creates gets a reproducible deck and player ids.
+    """
+    fresh = GameStore()
+    if seed is not None:
+        rng = random.Random(seed)
+        fresh.seeds = lambda: rng.getrandbits(64)
+    saved = ws_module.store, ws_module.cluster.store, app_main.store
+    ws_module.store = ws_module.cluster.store = app_main.store = fresh
+    try:
+        yield fresh
+    finally:
+        ws_module.store, ws_module.cluster.store, app_main.store = saved
+
+
+class AsgiWebSocket:
+    def __init__(self, app=None, path: str = "/ws"):
+        self.app = app or app_main.app
+        self.path = path
+        self.inbox: List[Message] = []
+        self.closed = False
+        self.close_code: Optional[int] = None
+        self._cursor = 0
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._arrived = asyncio.Condition()
+        self._accepted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def open(cls, app=None, path: str = "/ws") -> "AsgiWebSocket":
+        conn = cls(app, path)
+        await conn.connect()
+        return conn
+
+    # -------------------------
+    # ASGI plumbing
+    # -------------------------
+    async def connect(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"inproc")],
+            "client": ("inproc", 0),
+            "server": ("inproc", 80),
+            "subprotocols": [],
+        }
+        await self._to_app.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app))
+        await asyncio.wait_for(self._accepted.wait(), DEFAULT_TIMEOUT_S)
+
+    async def _from_app(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "websocket.accept":
+            self._accepted.set()
+            return
+        async with self._arrived:
+            if kind == "websocket.send":
+                text = message.get("text")
+                if text is None:
+                    text = message["bytes"].decode()
+                self.inbox.append(json.loads(text))
+            elif kind == "websocket.close":
+                self.closed = True
+                self.close_code = message.get("code", 1000)
+            self._arrived.notify_all()
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self._task, DEFAULT_TIMEOUT_S)
+        self._task = None
+
+    # -------------------------
+    # Client API
+    # -------------------------
+    async def send(self, type_: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        await self._to_app.put({"type": "websocket.receive", "text": json.dumps({"type": type_, "payload": payload or {}})})
+
+    async def expect(self, pred: Callable[[Message], bool], what: str, timeout_s: float = DEFAULT_TIMEOUT_S) -> Message:
+        """Return the next unread message matching pred; earlier unread messages are skipped."""
+        async def find() -> Message:
+            async with self._arrived:
+                while True:
+                    for i in range(self._cursor, len(self.inbox)):
+                        if pred(self.inbox[i]):
+                            self._cursor = i + 1
+                            return self.inbox[i]
+                    self._cursor = len(self.inbox)
+                    if self.closed:
+                        raise AssertionError(f"socket closed while waiting for {what}")
+                    await self._arrived.wait()
+
+        try:
+            return await asyncio.wait_for(find(), timeout_s)
+        except asyncio.TimeoutError:
+            tail = [m.get("type") for m in self.inbox[-8:]]
+            raise AssertionError(f"Timeout waiting for {what}; last messages: {tail}") from None
+
+    async def expect_type(self, type_: str, **kw) -> Message:
+        return await self.expect(lambda m: m.get("type") == type_, f"type={type_}", **kw)
+
+    async def expect_phase(self, phase: str, **kw) -> Message:
+        return await self.expect(
+            lambda m: m.get("type") == "game_public_state" and m["payload"]["game"]["phase"] == phase,
+            f"phase={phase}", **kw,
+        )
+
+    async def expect_event(self, event_type: str, **kw) -> Message:
+        return await self.expect(
+            lambda m: m.get("type") == "info" and ((m.get("payload") or {}).get("event") or {}).get("type") == event_type,
+            f"info.event.type={event_type}", **kw,
+        )
+
+    async def expect_closed(self, timeout_s: float = DEFAULT_TIMEOUT_S) -> int:
+        """Wait until the server closes the socket; returns the close code."""
+        async def closed() -> int:
+            async with self._arrived:
+                await self._arrived.wait_for(lambda: self.closed)
+                return self.close_code
+
+        try:
+            return await asyncio.wait_for(closed(), timeout_s)
+        except asyncio.TimeoutError:
+            raise AssertionError("Timeout waiting for the server to close the socket") from None
+
+    def errors(self) -> List[Message]:
+        return [m for m in self.inbox if m.get("type") == "error"]
+
+    def assert_no_errors(self) -> None:
+        errs = self.errors()
+        assert not errs, f"server returned errors: {[e['payload'] for e in errs]}"
@@ -0,0 +1,105 @@
+"""
+Unseen-card counts: after every command of random play (reshuffles, undo and
+snapshot restores included) the incremental per-value counts equal a
+from-scratch scan of deck + face-down grid cards; get_card_counts in-process
+(asgi_ws transport).
+"""
+import asyncio
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import isolated_store  # noqa: E402
+from engine_fixtures import new_game, random_command, scratch_unseen  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.game.deck import CARD_VALUES, COPIES_PER_VALUE  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+
+
+def visible(g) -> Counter:
+    seen = Counter(g.discard)
+    for p in g.players:
+        seen.update(v for v, up in zip(p.grid_values, p.grid_face_up) if up)
+        if p.drawn_card is not None:
+            seen[p.drawn_card] += 1
+    return seen
+
+
+def matches_scratch_over_random_play():
+    commands = 0
+    for seed in range(12):
+        rng = random.Random(seed)
+        engine = new_game(seed, players=2 + seed % 4)
+        while engine.game.phase != Phase.GAME_OVER and commands < 600 * (seed + 1):
+            engine = random_command(engine, rng)
+            commands += 1
+            g = engine.game
+            counts = engine.unseen.as_dict()
+            assert counts == scratch_unseen(g), (seed, commands)
+            assert engine.unseen.total == sum(counts.values())
+            # Unseen + visible is always the whole deck (removed columns sit on the discard pile).
+            seen = visible(g)
+            assert all(counts[v] + seen[v] == COPIES_PER_VALUE for v in CARD_VALUES), (seed, commands)
+    print(f"✅ {commands} random commands: counts equal a from-scratch scan")
+
+
+def reshuffle():
+    engine = new_game(5, players=2, reveal=(0, 5))
+    g = engine.game
+    # Nothing left to draw: the next draw shuffles the discard pile (minus its top) back in.
+    g.discard.extend(g.deck)
+    g.deck = []
+    engine.unseen.recount(g)
+    hidden_before = engine.unseen.total
+    back_in = len(g.discard) - 1
+    engine.draw_from_deck(g.players[g.current_player_idx].id)
+    assert engine.unseen.total == hidden_before + back_in - 1
+    assert engine.unseen.as_dict() == scratch_unseen(g)
+    print("✅ a reshuffle puts the discard pile back among the unseen cards")
+
+
+def api():
+    engine = new_game(4, players=2)
+    p = engine.game.players[0]
+    before = engine.unseen.count(p.grid_values[3])
+    engine.reveal_setup_card(p.id, 3)
+    assert engine.unseen.count(p.grid_values[3]) == before - 1
+    counts = engine.card_counts()
+    assert counts["unseenTotal"] == len(engine.game.deck) + 2 * 12 - 1
+    assert set(counts["unseen"]) == {str(v) for v in CARD_VALUES}
+    try:
+        engine.unseen.count(13)
+        raise AssertionError("13 is not a card")
+    except ValueError:
+        pass
+    print("✅ card_counts(): per value, total and deck size")
+
+
+async def inproc():
+    async with isolated_store(seed="card-counts"):
+        t = await Table().create()
+        await t.start()
+        game = await t.setup()
+        cur = t.seat(game["currentPlayerId"])
+        await cur.send("get_card_counts")
+        counts = (await cur.ws.expect_type("card_counts"))["payload"]
+        setup_reveals = 2 * len(t.seats)
+        assert counts["deckCount"] == game["deckCount"]
+        assert counts["unseenTotal"] == game["deckCount"] + 12 * len(t.seats) - setup_reveals
+        assert sum(counts["unseen"].values()) == counts["unseenTotal"]
+        cur.ws.assert_no_errors()
+        print("✅ get_card_counts answers the asking socket")
+        await t.close()
+
+
+async def main():
+    matches_scratch_over_random_play()
+    reshuffle()
+    api()
+    await inproc()
+
+
+asyncio.run(main())
@@ -0,0 +1,214 @@
+"""
+Sharding / pub-sub test without a server: two Cluster instances (= two workers)
+share an InMemoryPubSub, each with its own GameStore.
+"""
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app.cluster import Cluster, InMemoryPubSub, UnixSocketPubSub  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+
+
+class FakeWS:
+    def __init__(self):
+        self.state = SimpleNamespace(code=None, player_id=None)
+        self.inbox = []
+
+    async def send_json(self, data):
+        self.inbox.append(data)
+
+    def last(self, type_):
+        for msg in reversed(self.inbox):
+            if msg["type"] == type_:
+                return msg
+        return None
+
+
+def make_handler(store: GameStore, cluster: Cluster):
+    async def handle(ws, raw):
+        t = raw["type"]
+        p = raw.get("payload") or {}
+        if t == "create_table":
+            engine = store.create_game(accept_code=cluster.owns)
+            ws.state.code = engine.game.code
+            store.register_socket(engine.game.code, ws)
+            await ws.send_json({"type": "table_created", "payload": {"code": engine.game.code}})
+        elif t == "join_game":
+            engine = store.get_game(p["code"])
+            player_id, token = engine.add_player(p["name"])
+            ws.state.code = p["code"]
+            ws.state.player_id = player_id
+            store.register_socket(p["code"], ws)
+            store.bind_player(p["code"], player_id, ws)
+            await ws.send_json({"type": "joined", "payload": {"playerId": player_id, "token": token}})
+        elif t == "ping":
+            engine = store.get_game(ws.state.code)
+            for s in list(store.sockets(ws.state.code)):
+                await s.send_json({
+                    "type": "pong",
+                    "payload": {"shard": cluster.shard_id, "players": len(engine.game.players)},
+                })
+    return handle
+
+
+async def settle(pred, rounds: int = 200):
+    for _ in range(rounds):
+        if pred():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+async def test_ownership_is_deterministic():
+    a = Cluster(GameStore(), shard_count=4, shard_id=0)
+    b = Cluster(GameStore(), shard_count=4, shard_id=3)
+    codes = [f"C{i:04d}" for i in range(4000)]
+    assert [a.owner(c) for c in codes] == [b.owner(c) for c in codes]
+    spread = Counter(a.owner(c) for c in codes)
+    assert min(spread.values()) > 800, spread
+
+    # Draining a shard only moves that shard's codes.
+    before = {c: a.owner(c) for c in codes}
+    a._set_draining(2, True)
+    moved = [c for c in codes if a.owner(c) != before[c]]
+    assert moved and all(before[c] == 2 for c in moved)
+    print("✅ ownership deterministic and balanced:", dict(spread))
+
+
+async def test_cross_shard_routing_and_drain():
+    bus = InMemoryPubSub()
+    stores = [GameStore(), GameStore()]
+    shards = [Cluster(stores[i], shard_count=2, shard_id=i, pubsub=bus) for i in range(2)]
+    for i, c in enumerate(shards):
+        c.bind_handler(make_handler(stores[i], c))
+        await c.start()
+
+    table = FakeWS()
+    shards[0].attach(table)
+    await shards[0].route(table, {"type": "create_table", "payload": {}})
+    code = table.last("table_created")["payload"]["code"]
+    assert shards[0].owns(code) and code in stores[0].games_by_code
+
+    # Player connection lands on the other worker.
+    player = FakeWS()
+    shards[1].attach(player)
+    await shards[1].route(player, {"type": "join_game", "payload": {"code": code, "name": "P1"}})
+    await settle(lambda: player.last("joined") is not None)
+    assert player.state.remote_code == code
+    assert not stores[1].games_by_code
+
+    await shards[1].route(player, {"type": "ping", "payload": {}})
+    await settle(lambda: player.last("pong") is not None and table.last("pong") is not None)
+    assert player.last("pong")["payload"] == {"shard": 0, "players": 1}
+    print("✅ cross-shard join + fan-out via owner shard 0")
+
+    # Drain shard 0: the game and all its connections move to shard 1.
+    moved = await shards[0].drain()
+    assert moved == 1
+    await settle(lambda: code in stores[1].games_by_code)
+    assert code not in stores[0].games_by_code
+    await settle(lambda: shards[1].draining == {0})
+
+    table.inbox.clear()
+    player.inbox.clear()
+    await shards[0].route(table, {"type": "ping", "payload": {}})
+    await settle(lambda: player.last("pong") is not None and table.last("pong") is not None)
+    assert table.last("pong")["payload"] == {"shard": 1, "players": 1}
+    assert len(stores[1].sockets(code)) == 2
+    print("✅ drain migrated game; both sockets now served by shard 1")
+
+    # Disconnect of the table (held on shard 0) unregisters its proxy on the owner.
+    await shards[0].detach(table)
+    await settle(lambda: len(stores[1].sockets(code)) == 1)
+    print("✅ detach unregistered remote socket")
+
+    for c in shards:
+        await c.stop()
+
+
+async def test_restart_after_drain_hands_games_back():
+    bus = InMemoryPubSub()
+    stores = [GameStore(), GameStore()]
+    shards = [Cluster(stores[i], shard_count=2, shard_id=i, pubsub=bus) for i in range(2)]
+    for i, c in enumerate(shards):
+        c.bind_handler(make_handler(stores[i], c))
+        await c.start()
+
+    table = FakeWS()
+    shards[0].attach(table)
+    await shards[0].route(table, {"type": "create_table", "payload": {}})
+    code = table.last("table_created")["payload"]["code"]
+
+    await shards[0].drain()
+    await settle(lambda: code in stores[1].games_by_code and shards[1].draining == {0})
+
+    # Shard 0 restarts with an empty store and says hello: shard 1 migrates the game back.
+    await bus.unsubscribe("shard:0")
+    stores[0] = GameStore()
+    shards[0] = Cluster(stores[0], shard_count=2, shard_id=0, pubsub=bus)
+    shards[0].bind_handler(make_handler(stores[0], shards[0]))
+    await shards[0].start()
+    await settle(lambda: code in stores[0].games_by_code)
+    assert not stores[1].has_game(code) and not shards[1].draining
+
+    player = FakeWS()
+    shards[1].attach(player)
+    await shards[1].route(player, {"type": "join_game", "payload": {"code": code, "name": "P1"}})
+    await settle(lambda: player.last("joined") is not None)
+    await shards[1].route(player, {"type": "ping", "payload": {}})
+    await settle(lambda: player.last("pong") is not None)
+    assert player.last("pong")["payload"] == {"shard": 0, "players": 1}
+    print("✅ drain, restart, rejoin: the restarted shard serves its game again")
+
+    for c in shards:
+        await c.stop()
+
+
+async def test_unix_socket_pubsub():
+    with tempfile.TemporaryDirectory() as parent:
+        tmp = os.path.join(parent, "shards")
+        os.makedirs(tmp, mode=0o755)
+        os.chmod(tmp, 0o755)
+        bus = UnixSocketPubSub(tmp)
+        got = []
+        done = asyncio.Event()
+
+        async def handler(msg):
+            got.append(msg["n"])
+            if len(got) == 50:
+                done.set()
+
+        await bus.subscribe("shard:0", handler)
+        sender = UnixSocketPubSub(tmp)
+        for n in range(50):
+            await sender.publish("shard:0", {"n": n})
+        await asyncio.wait_for(done.wait(), timeout=2.0)
+        assert got == list(range(50))
+        assert stat.S_IMODE(os.stat(tmp).st_mode) == 0o700, "shard sockets live in a private directory"
+        await sender.stop()
+        await bus.stop()
+        try:
+            await sender.publish("shard:0", {"n": -1})
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("publish without subscriber should fail")
+    print("✅ unix socket pubsub keeps order, in a 0700 directory")
+
+
+async def main():
+    await test_ownership_is_deterministic()
+    await test_cross_shard_routing_and_drain()
+    await test_restart_after_drain_hands_games_back()
+    await test_unix_socket_pubsub()
+
+
+asyncio.run(main())
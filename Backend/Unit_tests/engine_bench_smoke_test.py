@@ -0,0 +1,39 @@
+"""
+Smoke run of the engine micro-benchmarks: every benchmark builds and runs at
+every player count, and compare() flags a regression beyond the threshold.
+"""
+import copy
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import engine_bench  # noqa: E402
+
+# Every benchmark once per player count (tiny target: this checks they run, not how fast).
+for name, factory in engine_bench.BENCHMARKS.items():
+    for n in engine_bench.PLAYER_COUNTS:
+        op, setup = factory(n)
+        state = setup()
+        op(state)
+print(f"✅ {len(engine_bench.BENCHMARKS)} benchmarks run at {engine_bench.PLAYER_COUNTS} players")
+
+assert engine_bench.play_full_game(4, seed=7) >= 1
+
+current = engine_bench.run(["public_state"], [2], quick=True)
+assert set(current["results"]) == {"public_state[2p]"}, current
+assert current["results"]["public_state[2p]"]["rel"] > 0
+
+slower = copy.deepcopy(current)
+slower["results"]["public_state[2p]"]["rel"] *= 1.5
+assert engine_bench.compare(slower, current, 0.25), "50% slower must be a regression"
+assert not engine_bench.compare(current, slower, 0.25), "faster is never a regression"
+print("✅ compare() flags regressions beyond the threshold")
+
+with tempfile.TemporaryDirectory() as tmp:
+    baseline = Path(tmp) / "engine.json"
+    args = ["--only", "private_state", "-p", "2", "--quick", "--baseline", str(baseline)]
+    assert engine_bench.main(args + ["--update"]) == 0 and baseline.exists()
+    assert engine_bench.main(args + ["--threshold", "10"]) == 0
+print("✅ baseline written and compared")
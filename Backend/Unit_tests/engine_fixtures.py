@@ -0,0 +1,94 @@
+"""
+Engine fixtures shared by the server-less tests: a started game and a random
+legal-move driver, so every property test plays the same kind of game.
+
+    engine = new_game(seed, players=3)
+    while engine.game.phase != Phase.GAME_OVER:
+        engine = random_command(engine, rng)
+"""
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app.game.deck import CARD_VALUES  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+from Backend.app.game.rules import CLASSIC, RuleSet  # noqa: E402
+
+TURN_PHASES = (Phase.TURN_CHOOSE_SOURCE, Phase.TURN_RESOLVE)
+
+
+def new_game(seed: int, players: int = 2, rules: RuleSet = CLASSIC, code: str = "TEST",
+             reveal: Iterable[int] = ()) -> GameEngine:
+    """A started game; with `reveal`, every player turns those setup cards and turns begin."""
+    engine = GameEngine(code=code, seed=seed, rules=rules)
+    for i in range(players):
+        pid, _ = engine.add_player(f"P{i}")
+        engine.set_ready(pid)
+    engine.start_game_if_ready()
+    reveal = tuple(reveal)
+    for p in engine.game.players:
+        for i in reveal:
+            engine.reveal_setup_card(p.id, i)
+    engine.commit()
+    return engine
+
+
+def turn_command(engine: GameEngine, rng: random.Random) -> None:
+    """One legal move for the current player (TURN_CHOOSE_SOURCE or TURN_RESOLVE)."""
+    g = engine.game
+    p = g.players[g.current_player_idx]
+    if g.phase == Phase.TURN_CHOOSE_SOURCE:
+        if g.discard and rng.random() < 0.4:
+            engine.take_discard(p.id)
+        else:
+            engine.draw_from_deck(p.id)
+        return
+    open_slots = [i for i in range(g.grid_size) if not p.grid_removed[i]]
+    hidden = [i for i in open_slots if not p.grid_face_up[i]]
+    r = rng.random()
+    if r < 0.5 or not hidden:
+        engine.swap_into_grid(p.id, rng.choice(open_slots))
+    elif r < 0.7:
+        engine.discard_drawn_and_reveal(p.id, rng.choice(hidden))
+    elif r < 0.85:
+        engine.discard_drawn(p.id)
+    else:
+        engine.auto_play()
+
+
+def play_command(engine: GameEngine, rng: random.Random) -> None:
+    """One legal command in any phase but GAME_OVER: next round, a setup reveal or a turn move."""
+    g = engine.game
+    if g.phase == Phase.ROUND_OVER:
+        engine.start_new_round(g.players[0].id)
+    elif g.phase == Phase.SETUP_REVEAL:
+        p = rng.choice([p for p in g.players if p.setup_reveals_done < g.setup_reveals_per_player])
+        engine.reveal_setup_card(p.id, rng.choice([i for i in range(g.grid_size) if not p.grid_face_up[i]]))
+    else:
+        turn_command(engine, rng)
+
+
+def random_command(engine: GameEngine, rng: random.Random) -> GameEngine:
+    """play_command, with the odd undo and snapshot restore mixed into turns; returns the live engine."""
+    if engine.game.phase in TURN_PHASES:
+        if engine.can_undo() and rng.random() < 0.1:
+            engine.undo()
+            return engine
+        if rng.random() < 0.02:
+            return GameEngine.from_snapshot(engine.to_snapshot())
+    play_command(engine, rng)
+    return engine
+
+
+def scratch_unseen(g) -> Dict[int, int]:
+    """Unseen cards per value (deck + face-down grid cards), counted from scratch."""
+    unseen = Counter(g.deck)
+    for p in g.players:
+        unseen.update(v for v, up, removed in zip(p.grid_values, p.grid_face_up, p.grid_removed)
+                      if not up and not removed)
+    return {v: unseen[v] for v in CARD_VALUES}
@@ -0,0 +1,50 @@
+"""
+Smoke run of the fan-out benchmark: every op runs against fake sockets, and
+under churn _broadcast reaps disconnected sockets but keeps ones that raised
+an arbitrary error.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import fanout_bench  # noqa: E402
+from fanout_bench import Fleet, measure, ws_module  # noqa: E402
+
+
+async def with_fleet(fleet, fn):
+    saved = ws_module.store
+    ws_module.store = fleet.store
+    try:
+        return await fn()
+    finally:
+        ws_module.store = saved
+
+
+async def main():
+    fleet = Fleet(tables=5, sockets_per_table=6, players=3).build()
+    for name in fanout_bench.OPS:
+        r = await with_fleet(fleet, lambda: measure(name, fleet, iterations=2))
+        assert r["frames"] > 0 and r["sockets"] == 30 and r["reaped"] == 0, r
+    print("✅ all fan-out ops ran against 30 fake sockets")
+
+    # One broadcast per iteration reaches every socket, so every failing one is reaped and replaced.
+    fleet = Fleet(tables=4, sockets_per_table=10, players=4).build()
+    r = await with_fleet(fleet, lambda: measure("broadcast", fleet, 3, fail_rate=0.25, fail_mode="disconnect"))
+    assert r["reaped"] == 3 * 10, r
+    assert fleet.socket_count() == 40
+    assert all(s.fail is None for s in fleet.all_sockets())
+    for code in fleet.engines:
+        bound = fleet.store.player_sockets_by_code[code]
+        assert all(len(socks) == 1 for socks in bound.values()) and len(bound) == 4
+    assert not any(s in fleet.store.sockets(s.state.code) for s in fleet.retired)
+    print("✅ disconnected sockets reaped from the store under churn")
+
+    fleet = Fleet(tables=2, sockets_per_table=10).build()
+    r = await with_fleet(fleet, lambda: measure("broadcast", fleet, 2, fail_rate=0.5, fail_mode="error"))
+    assert r["reaped"] == 0 and fleet.socket_count() == 20, r
+    print("✅ sockets with transient send errors stay registered")
+
+
+asyncio.run(main())
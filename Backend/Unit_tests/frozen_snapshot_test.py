@@ -0,0 +1,157 @@
+"""
+Copy-on-write snapshots without a server: after every command the published
+engine.frozen equals a from-scratch copy of the live game, unchanged parts
+are shared with the previous snapshot, old snapshots never change, and a
+reader thread only ever sees consistent states.
+"""
+import random
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from engine_fixtures import new_game, play_command  # noqa: E402
+from Backend.app.game.deck import build_deck  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.frozen import SCALARS  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+
+CARDS = len(build_deck(random.Random(0)))
+
+
+def scratch(g) -> dict:
+    """Everything a snapshot must hold, copied from the live game."""
+    return {
+        **{name: getattr(g, name) for name in SCALARS},
+        "players": [
+            (p.id, p.name, p.ready, p.has_finished_round, tuple(p.grid_values), tuple(p.grid_face_up),
+             tuple(p.grid_removed), p.drawn_card, p.setup_reveals_done, tuple(p.setup_revealed_indices),
+             p.setup_done_order)
+            for p in g.players
+        ],
+        "deck": tuple(g.deck),
+        "discard": tuple(g.discard),
+        "round_scores": dict(g.round_scores),
+        "total_scores": dict(g.total_scores),
+        "round_history": [dict(h) for h in g.round_history],
+    }
+
+
+def as_dict(f) -> dict:
+    return {
+        **{name: getattr(f, name) for name in SCALARS},
+        "players": [
+            (p.id, p.name, p.ready, p.has_finished_round, p.grid_values, p.grid_face_up, p.grid_removed,
+             p.drawn_card, p.setup_reveals_done, p.setup_revealed_indices, p.setup_done_order)
+            for p in f.players
+        ],
+        "deck": f.deck,
+        "discard": f.discard,
+        "round_scores": dict(f.round_scores),
+        "total_scores": dict(f.total_scores),
+        "round_history": [dict(h) for h in f.round_history],
+    }
+
+
+def cards_in_play(f) -> int:
+    on_grids = sum(1 for p in f.players for removed in p.grid_removed if not removed)
+    in_hand = sum(1 for p in f.players if p.drawn_card is not None)
+    return f.deck_count + len(f.discard) + on_grids + in_hand
+
+
+def random_command(engine: GameEngine, rng: random.Random) -> bool:
+    """One legal command, table selection changes included; False once the game is over."""
+    g = engine.game
+    if g.phase == Phase.GAME_OVER:
+        return False
+    if g.phase == Phase.TURN_CHOOSE_SOURCE and rng.random() < 0.2:
+        engine.set_table_selection(rng.choice(("deck", "discard", None)))
+    else:
+        play_command(engine, rng)
+    return True
+
+
+def matches_scratch_over_random_play():
+    commands = 0
+    for seed in range(12):
+        rng = random.Random(seed)
+        engine = new_game(seed, players=2 + seed % 4)
+        history = [(engine.frozen, scratch(engine.game))]
+        while commands < 400 * (seed + 1) and random_command(engine, rng):
+            commands += 1
+            f = engine.commit()
+            expected = scratch(engine.game)
+            assert as_dict(f) == expected, (seed, commands)
+            history.append((f, expected))
+        # Snapshots taken earlier still show their own moment.
+        for f, expected in history:
+            assert as_dict(f) == expected
+        versions = [f.version for f, _ in history]
+        assert versions == sorted(versions)
+    print(f"✅ {commands} random commands: every snapshot equals a from-scratch copy and never changes")
+
+
+def shares_unchanged_parts():
+    engine = new_game(7, players=4)
+    g = engine.game
+    for p in g.players:
+        engine.reveal_setup_card(p.id, 0)
+        engine.reveal_setup_card(p.id, 5)
+    before = engine.commit()
+    assert engine.commit() is before, "no-op commit republishes nothing"
+
+    cur = g.players[g.current_player_idx]
+    engine.draw_from_deck(cur.id)
+    after_draw = engine.commit()
+    assert after_draw.version == before.version + 1
+    assert after_draw.deck_cards is before.deck_cards and after_draw.deck_count == before.deck_count - 1
+    assert after_draw.discard is before.discard
+    for old, new in zip(before.players, after_draw.players):
+        assert (new is old) == (new.id != cur.id)
+
+    engine.swap_into_grid(cur.id, 1)
+    after_swap = engine.commit()
+    assert after_swap.discard is not after_draw.discard and after_swap.discard[:-1] == after_draw.discard
+    assert after_swap.total_scores is before.total_scores and after_swap.round_history is before.round_history
+    shared = sum(a is b for a, b in zip(after_draw.players, after_swap.players))
+    assert shared == len(g.players) - 1, shared
+    print("✅ one move copies one player; deck tuple, scores and history shared")
+
+
+def reader_thread_sees_consistent_states():
+    engine = new_game(3, players=4)
+    stop = threading.Event()
+    seen = []
+    problems = []
+
+    def reader():
+        while not stop.is_set():
+            f = engine.frozen
+            if f.phase != Phase.LOBBY and cards_in_play(f) != CARDS:
+                problems.append((f.version, cards_in_play(f)))
+            seen.append(f.version)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    rng = random.Random(3)
+    try:
+        for _ in range(20):
+            engine = new_game(rng.randrange(10**6), players=4)
+            while random_command(engine, rng):
+                engine.commit()
+    finally:
+        stop.set()
+        t.join()
+    assert not problems, problems[:5]
+    assert len(seen) > 100
+    print(f"✅ reader thread: {len(seen)} snapshot reads, all consistent")
+
+
+def main():
+    matches_scratch_over_random_play()
+    shares_unchanged_parts()
+    reader_thread_sees_consistent_states()
+
+
+main()
@@ -0,0 +1,101 @@
+"""
+Heartbeats in-process (asgi_ws transport): ping/pong RTT, connection_stats for
+the table view, and reaping of silent connections (close code 4408).
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.heartbeat import CLOSE_HEARTBEAT_TIMEOUT, Heartbeat  # noqa: E402
+from Backend.app.metrics import HEARTBEAT_TIMEOUTS  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def settle():
+    # Let the endpoint tasks drain their inboxes.
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def stats_where(pred):
+    def match(m):
+        return m.get("type") == "connection_stats" and pred({p["playerId"]: p for p in m["payload"]["players"]})
+    return match
+
+
+async def main():
+    clock = Clock()
+    saved = ws_module.heartbeat
+    # Swept by hand; the interval only matters for the background task.
+    hb = ws_module.heartbeat = Heartbeat(
+        15.0, 45.0,
+        ping=ws_module._ping, reap=ws_module._reap, after_sweep=ws_module._push_connection_stats, clock=clock,
+    )
+    try:
+        async with isolated_store() as store:
+            t = await Table().create()
+            fast, silent = t.seats
+            assert len(hb.conns) == 3
+
+            await hb.sweep()
+            ping = await fast.ws.expect_type("ping")
+            await silent.ws.expect_type("ping")
+            await t.ws.expect_type("ping")
+            clock.now += 0.042
+            await fast.ws.send("pong", {"id": ping["payload"]["id"]})
+            await silent.ws.send("pong", {"id": -1})  # not the outstanding ping
+            await settle()
+            assert fast.ws.errors() == [] and silent.ws.errors() == []
+            print("✅ pings sent, pongs answered without errors")
+
+            await hb.sweep()
+            msg = await t.ws.expect(
+                stats_where(lambda ps: ps[fast.player_id]["rttMs"] is not None), "connection_stats with RTT"
+            )
+            players = {p["playerId"]: p for p in msg["payload"]["players"]}
+            assert players[fast.player_id] == {"playerId": fast.player_id, "connected": True, "rttMs": 42.0}, players
+            assert players[silent.player_id]["rttMs"] is None and players[silent.player_id]["connected"]
+            assert not any(m.get("type") == "connection_stats" for m in fast.ws.inbox), "players get no stats"
+            print("✅ RTT measured and pushed to the table view only")
+
+            # Everyone but `silent` shows a sign of life; then the timeout passes.
+            before = HEARTBEAT_TIMEOUTS.value()
+            clock.now += 30
+            await fast.send("get_round_history")
+            await t.ws.send("get_round_history")
+            await settle()
+            clock.now += 20
+            assert await hb.sweep() == 1
+            assert await silent.ws.expect_closed() == CLOSE_HEARTBEAT_TIMEOUT
+            assert HEARTBEAT_TIMEOUTS.value() - before == 1
+            assert all(s.state.player_id != silent.player_id for s in store.sockets(t.code))
+            assert not store.player_sockets(t.code, silent.player_id)
+            assert len(hb.conns) == 2
+            await t.ws.expect(
+                stats_where(lambda ps: not ps[silent.player_id]["connected"] and ps[fast.player_id]["connected"]),
+                "connection_stats with the reaped player disconnected",
+            )
+            print("✅ silent connection reaped with 4408 and unregistered")
+
+            # The reaped client's late disconnect is harmless.
+            await silent.ws.close()
+            await fast.ws.close()
+            await t.ws.close()
+            assert hb.conns == {}
+            print("✅ closed connections untracked")
+    finally:
+        ws_module.heartbeat = saved
+
+
+asyncio.run(main())
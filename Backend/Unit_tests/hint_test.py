@@ -0,0 +1,183 @@
+"""
+Move hints: expected score changes on hand-built grids, symmetric grids
+sharing one cache entry, the bounded LRU, and request_hint in-process
+(asgi_ws transport) with the evaluation running off the event loop.
+"""
+import asyncio
+import threading
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.game.advisor import HintCache, evaluate, hint_payload  # noqa: E402
+from Backend.app.game.deck import CARD_VALUES  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+from Backend.app.metrics import HINTS  # noqa: E402
+
+
+def resolve_game(values, face_up, drawn) -> GameEngine:
+    """Two players in TURN_RESOLVE; the current one holds `drawn` over the given grid."""
+    engine = GameEngine(code="HINT", seed=1)
+    for name in ("A", "B"):
+        pid, _ = engine.add_player(name)
+        engine.set_ready(pid)
+    engine.start_game_if_ready()
+    g = engine.game
+    p = g.players[0]
+    p.grid_values = list(values)
+    p.grid_face_up = list(face_up)
+    g.current_player_idx = 0
+    g.phase = Phase.TURN_RESOLVE
+    p.drawn_card = drawn
+    engine.unseen.recount(g)
+    return engine
+
+
+def hint(engine: GameEngine) -> dict:
+    key, order = engine.hint_key(engine.game.players[0].id)
+    return hint_payload(key, evaluate(key), order)
+
+
+def by_action(h: dict) -> dict:
+    return {(a["action"], a.get("index")): a["expectedDelta"] for a in h["actions"]}
+
+
+def expected_values():
+    # Column 0 (indices 0, 4, 8) holds 5, 5 face up and a face-down 9.
+    values = [5, 1, 2, 3, 5, 10, 6, 7, 9, 11, 12, 4]
+    face_up = [True, True, True, True, True, True, True, True, False, False, False, False]
+    engine = resolve_game(values, face_up, drawn=5)
+    counts = engine.unseen.as_dict()
+    total = sum(counts.values())
+    mean = sum(v * c for v, c in counts.items()) / total
+    d = by_action(hint(engine))
+
+    assert d[("swap_into_grid", 5)] == round(5 - 10, 3)
+    assert d[("swap_into_grid", 8)] == round(-(5 + 5 + mean), 3), "completing the column removes it"
+    assert d[("swap_into_grid", 9)] == round(5 - mean, 3)
+    assert d[("discard_drawn_and_reveal", 8)] == round(-3 * 5 * counts[5] / total, 3)
+    assert d[("discard_drawn_and_reveal", 9)] == 0.0
+    assert ("discard_drawn_and_reveal", 0) not in d, "face-up cards cannot be revealed"
+    assert d[("discard_drawn", None)] == 0.0
+    best = hint(engine)["best"]
+    assert best == {"action": "swap_into_grid", "index": 8, "expectedDelta": d[("swap_into_grid", 8)]}
+    print("✅ swap / reveal / discard deltas from the unseen-card distribution")
+
+    # Choosing a source: taking the discard top = its best swap; drawing
+    # averages the best follow-up over every unseen value.
+    g = engine.game
+    g.players[0].drawn_card = None
+    g.phase = Phase.TURN_CHOOSE_SOURCE
+    g.discard.append(-2)
+    engine.unseen.recount(g)
+    h = hint(engine)
+    take = by_action(h)[("take_discard", None)]
+    assert take == round(-2 - 10, 3), take
+    draw = by_action(h)[("draw_from_deck", None)]
+    assert draw <= 0.0 and h["card"] == -2
+    print(f"✅ take_discard {take} vs draw_from_deck {draw}")
+
+    g.phase = Phase.ROUND_OVER
+    try:
+        engine.hint_key(g.players[0].id)
+        raise AssertionError("no hints outside a turn")
+    except ValueError as e:
+        assert str(e) == "Hints are only available during a turn"
+
+
+def symmetric_grids_share_a_key():
+    values = [5, 1, 2, 3, 5, 10, 6, 7, 9, 11, 12, 4]
+    face_up = [True] * 8 + [False] * 4
+    a = resolve_game(values, face_up, drawn=3)
+    # Same columns in another order, rows shuffled inside a column.
+    perm = [3, 0, 1, 2]  # new column c takes old column perm[c]
+    rows = [[0, 1, 2], [2, 1, 0], [1, 0, 2], [0, 2, 1]]
+    b_values, b_up = [0] * 12, [False] * 12
+    for c in range(4):
+        for r in range(3):
+            src = perm[c] + 4 * rows[c][r]
+            b_values[c + 4 * r], b_up[c + 4 * r] = values[src], face_up[src]
+    b = resolve_game(b_values, b_up, drawn=3)
+    key_a, order_a = a.hint_key(a.game.players[0].id)
+    key_b, order_b = b.hint_key(b.game.players[0].id)
+    assert key_a == key_b and order_a != order_b
+    # Same deltas, each on the matching grid index.
+    da, db = by_action(hint(a)), by_action(hint(b))
+    for c in range(4):
+        for r in range(3):
+            src = perm[c] + 4 * rows[c][r]
+            assert db[("swap_into_grid", c + 4 * r)] == da[("swap_into_grid", src)]
+    print("✅ permuted grids: one canonical key, deltas mapped back to each grid's indices")
+
+
+def lru_is_bounded():
+    cache = HintCache(2)
+    cache.put(("k", 1), {"x": 1})
+    cache.put(("k", 2), {"x": 2})
+    assert cache.get(("k", 1)) == {"x": 1}
+    cache.put(("k", 3), {"x": 3})
+    assert cache.get(("k", 2)) is None, "least recently used goes first"
+    assert len(cache) == 2 and cache.hits == 1 and cache.misses == 1
+    off = HintCache(0)
+    off.put(("k", 1), {"x": 1})
+    assert len(off) == 0
+    print("✅ LRU keeps the most recently used entries, size 0 disables caching")
+
+
+async def inproc():
+    saved = ws_module.hints, ws_module.evaluate
+    ws_module.hints = HintCache(16)
+    threads = []
+
+    def recording(key):
+        threads.append(threading.get_ident())
+        return evaluate(key)
+
+    ws_module.evaluate = recording
+    try:
+        async with isolated_store(seed="hints"):
+            t = await Table().create()
+            await t.start()
+            game = await t.setup()
+            cur = t.seat(game["currentPlayerId"])
+            other = next(s for s in t.seats if s is not cur)
+            misses, hits = HINTS.value("miss"), HINTS.value("hit")
+            await cur.send("request_hint")
+            first = (await cur.ws.expect_type("hint"))["payload"]
+            assert first["phase"] == "TURN_CHOOSE_SOURCE" and first["card"] == game["discardTop"]
+            assert {a["action"] for a in first["actions"]} == {"take_discard", "draw_from_deck"}
+            await cur.send("request_hint")
+            again = (await cur.ws.expect_type("hint"))["payload"]
+            assert again == first
+            assert HINTS.value("miss") - misses == 1 and HINTS.value("hit") - hits == 1
+            assert threads and threading.get_ident() not in threads, "evaluated in a worker thread"
+
+            await other.send("request_hint")
+            err = await other.ws.expect_type("error")
+            assert err["payload"]["message"] == "Not your turn"
+
+            await cur.send("draw_from_deck")
+            await t.turn_of(cur.player_id, "TURN_RESOLVE")
+            await cur.send("request_hint")
+            h = (await cur.ws.expect_type("hint"))["payload"]
+            assert h["phase"] == "TURN_RESOLVE" and h["card"] in CARD_VALUES
+            assert sum(a["action"] == "swap_into_grid" for a in h["actions"]) == 12
+            cur.ws.assert_no_errors()
+            print("✅ request_hint: current player only, repeat served from cache, evaluated off the loop")
+            await t.close()
+    finally:
+        ws_module.hints, ws_module.evaluate = saved
+
+
+async def main():
+    expected_values()
+    symmetric_grids_share_a_key()
+    lru_is_bounded()
+    await inproc()
+
+
+asyncio.run(main())
@@ -0,0 +1,233 @@
+"""
+Read-only HTTP views in-process: GET /games/{code}/state with ETag / 304 and
+the SSE stream of GET /games/{code}/events, both served from the shared
+public_feed frame (no re-encoding per reader).
+"""
+import asyncio
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import httpx  # noqa: E402
+
+from asgi_ws import app_main, isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.cluster import Cluster, InMemoryPubSub  # noqa: E402
+from Backend.app.feed import PublicFeed  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+from Backend.app.metrics import HTTP_STATE  # noqa: E402
+
+
+class SseClient:
+    """Raw ASGI GET that hands out body chunks as they are streamed."""
+
+    def __init__(self, path: str, headers=()):
+        self.path = path
+        self.headers = [(k.lower().encode(), v.encode()) for k, v in headers]
+        self.status = None
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self._gone = asyncio.Event()
+        self._task = None
+
+    async def open(self) -> "SseClient":
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": self.path, "raw_path": self.path.encode(),
+            "query_string": b"", "root_path": "", "headers": self.headers,
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        sent_request = False
+
+        async def receive():
+            nonlocal sent_request
+            if not sent_request:
+                sent_request = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self._gone.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                self.status = message["status"]
+            elif message["type"] == "http.response.body" and message.get("body"):
+                await self.chunks.put(message["body"])
+
+        self._task = asyncio.create_task(app_main.app(scope, receive, send))
+        for _ in range(100):
+            if self.status is not None:
+                break
+            await asyncio.sleep(0.01)
+        return self
+
+    async def next(self, timeout_s: float = 2.0) -> bytes:
+        return await asyncio.wait_for(self.chunks.get(), timeout_s)
+
+    async def close(self) -> None:
+        self._gone.set()
+        await asyncio.wait_for(self._task, 2.0)
+
+
+def sse_fields(chunk: bytes) -> dict:
+    fields = {}
+    for line in chunk.decode().strip().split("\n"):
+        key, _, value = line.partition(": ")
+        fields[key] = value
+    return fields
+
+
+async def main():
+    saved = ws_module.public_feed, ws_module.settings
+    feed = ws_module.public_feed = PublicFeed()
+    ws_module.settings = dataclasses.replace(saved[1], sse_keepalive_s=0.2)
+    transport = httpx.ASGITransport(app=app_main.app)
+    try:
+        async with isolated_store(seed="http-views") as store, \
+                httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            t = await Table().create()
+            await t.start()
+            game = await t.setup()
+            engine = store.get_game(t.code)
+
+            r = await client.get(f"/games/{t.code.lower()}/state")
+            assert r.status_code == 200 and r.headers["content-type"] == "application/json"
+            assert r.json() == {"game": game}
+            etag = r.headers["etag"]
+            assert etag == feed.latest(t.code).etag
+            r = await client.get(f"/games/{t.code}/state", headers={"If-None-Match": etag})
+            assert r.status_code == 304 and r.content == b"" and r.headers["etag"] == etag
+            assert (await client.get("/games/NOPE/state")).status_code == 404
+            print("✅ state served with an ETag, If-None-Match answers 304")
+
+            # Many readers, no serialization: nothing calls public_state().
+            calls = 0
+            original = engine.public_state
+
+            def counting():
+                nonlocal calls
+                calls += 1
+                return original()
+
+            engine.public_state = counting
+            before = HTTP_STATE.value("not_modified")
+            for _ in range(50):
+                assert (await client.get(f"/games/{t.code}/state", headers={"If-None-Match": etag})).status_code == 304
+                assert (await client.get(f"/games/{t.code}/state")).headers["etag"] == etag
+            assert calls == 0 and HTTP_STATE.value("not_modified") - before == 50
+            del engine.public_state
+            # An identical re-broadcast keeps the version.
+            await ws_module._broadcast(t.code, "game_public_state", engine.public_state())
+            assert feed.latest(t.code).etag == etag
+            print("✅ 100 readers, zero re-encodes; identical state keeps its ETag")
+
+            stream = await SseClient(f"/games/{t.code}/events").open()
+            assert stream.status == 200
+            first = sse_fields(await stream.next())
+            assert first["event"] == "game_public_state" and f'"{first["id"]}"' == etag
+            assert first["data"] == feed.latest(t.code).body
+            assert feed.streams(t.code) == 1
+
+            cur = t.seat(game["currentPlayerId"])
+            await cur.send("draw_from_deck")
+            await t.turn_of(cur.player_id, "TURN_RESOLVE")
+            update = sse_fields(await stream.next())
+            assert update["id"] != first["id"]
+            assert json.loads(update["data"])["game"]["phase"] == "TURN_RESOLVE"
+            r = await client.get(f"/games/{t.code}/state", headers={"If-None-Match": etag})
+            assert r.status_code == 200 and r.headers["etag"] == f'"{update["id"]}"'
+            assert (await stream.next()) == b": keepalive\n\n"
+            print("✅ SSE stream: current state, then every change, keepalives when idle")
+
+            # Reconnecting with the last id seen: no duplicate of that state.
+            again = await SseClient(f"/games/{t.code}/events", [("Last-Event-ID", update["id"])]).open()
+            assert (await again.next()) == b": keepalive\n\n"
+            await again.close()
+            await stream.close()
+            assert feed.streams() == 0
+            assert (await client.get("/games/NOPE/events")).status_code == 404
+            print("✅ Last-Event-ID resumes without a duplicate; closed streams unsubscribe")
+            await t.close()
+    finally:
+        ws_module.public_feed, ws_module.settings = saved
+
+
+async def other_shard():
+    """
+    Two shards on an InMemoryPubSub: the game lives on shard 0 (a stub owner),
+    the HTTP request reaches the app's worker as shard 1, which mirrors it.
+    """
+    bus = InMemoryPubSub()
+    owner_store = GameStore()
+    owner = Cluster(owner_store, shard_count=2, shard_id=0, pubsub=bus)
+    spectate_calls = 0
+
+    async def owner_handler(ws, raw):
+        nonlocal spectate_calls
+        if raw["type"] != "spectate_game":
+            return
+        code = raw["payload"]["code"]
+        spectate_calls += 1
+        if not owner_store.has_game(code):
+            await ws.send_text(ws_module._encode("error", {"message": "Spectate failed: Game not found"}))
+            return
+        ws.state.code = code
+        owner_store.add_spectator(code, ws)
+        await ws.send_text(ws_module._encode("spectating", {"code": code}))
+        await ws.send_text(ws_module._encode("game_public_state", owner_store.get_game(code).public_state()))
+
+    owner.bind_handler(owner_handler)
+    saved = ws_module.cluster, ws_module.public_feed, ws_module.MIRROR_WAIT_S
+    local = ws_module.cluster = Cluster(ws_module.store, shard_count=2, shard_id=1, pubsub=bus)
+    local.bind_handler(ws_module._handle_and_commit)
+    ws_module.public_feed = PublicFeed()
+    ws_module.MIRROR_WAIT_S = 0.5
+    await owner.start()
+    await local.start()
+    transport = httpx.ASGITransport(app=app_main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            engine = owner_store.create_game(accept_code=owner.owns)
+            code = engine.game.code
+            r = await client.get(f"/games/{code}/state")
+            assert r.status_code == 200, r.text
+            assert r.json() == engine.public_state()
+            assert (await client.get(f"/games/{code}/state")).status_code == 200
+            assert spectate_calls == 1 and len(owner_store.spectators(code)) == 1, "one mirror per game"
+
+            stream = await SseClient(f"/games/{code}/events").open()
+            assert json.loads(sse_fields(await stream.next())["data"]) == engine.public_state()
+            engine.add_player("P1")
+            text = ws_module._encode("game_public_state", engine.public_state())
+            for spectator in owner_store.spectators(code):
+                await spectator.send_text(text)
+            update = json.loads(sse_fields(await stream.next())["data"])
+            assert [p["name"] for p in update["game"]["players"]] == ["P1"]
+            await stream.close()
+            print("✅ a worker that does not own the game serves its state and stream through the owner")
+
+            missing = next(c for c in (f"Z{i:03d}" for i in range(1000)) if owner.owns(c))
+            assert (await client.get(f"/games/{missing}/state")).status_code == 404
+            await bus.unsubscribe("shard:0")
+            other = owner_store.create_game(accept_code=owner.owns).game.code
+            r = await client.get(f"/games/{other}/state")
+            assert r.status_code == 503, r.status_code
+            assert other not in ws_module._mirrors
+            print("✅ unknown game on the owner: 404; owner unreachable: 503")
+    finally:
+        for m in list(ws_module._mirrors.values()):
+            if m.reaper is not None:
+                m.reaper.cancel()
+        ws_module._mirrors.clear()
+        await local.stop()
+        await bus.stop()
+        ws_module.cluster, ws_module.public_feed, ws_module.MIRROR_WAIT_S = saved
+
+
+async def run():
+    await main()
+    await other_shard()
+
+
+asyncio.run(run())
@@ -0,0 +1,239 @@
+"""
+Full game scenarios in-process (asgi_ws transport): no server on 8001 needed.
+Each scenario gets its own GameStore and a seeded deck, and scenarios run in
+parallel worker processes.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import AsgiWebSocket, isolated_store  # noqa: E402
+
+SCENARIOS: Dict[str, Callable] = {}
+
+
+def scenario(fn):
+    SCENARIOS[fn.__name__] = fn
+    return fn
+
+
+@dataclass
+class Seat:
+    name: str
+    ws: AsgiWebSocket
+    token: str
+    player_id: str
+
+    async def send(self, type_: str, **payload) -> None:
+        payload["token"] = self.token
+        await self.ws.send(type_, payload)
+
+
+class Table:
+    """Table view + players, with the common flows of the ws_* scripts."""
+
+    def __init__(self):
+        self.ws: AsgiWebSocket = None
+        self.code = ""
+        self.seats: List[Seat] = []
+
+    async def create(self, names=("P1", "P2")) -> "Table":
+        self.ws = await AsgiWebSocket.open()
+        await self.ws.send("create_table")
+        self.code = (await self.ws.expect_type("table_created"))["payload"]["code"]
+        await self.ws.expect_phase("LOBBY")
+        for name in names:
+            ws = await AsgiWebSocket.open()
+            await ws.send("join_game", {"code": self.code, "name": name})
+            joined = (await ws.expect_type("joined"))["payload"]
+            await ws.expect_type("player_private_state")
+            self.seats.append(Seat(name, ws, joined["token"], joined["playerId"]))
+        return self
+
+    def seat(self, player_id: str) -> Seat:
+        return next(s for s in self.seats if s.player_id == player_id)
+
+    async def turn_of(self, player_id: str, phase: str = "TURN_CHOOSE_SOURCE") -> dict:
+        msg = await self.ws.expect(
+            lambda m: m.get("type") == "game_public_state"
+            and m["payload"]["game"]["phase"] == phase
+            and m["payload"]["game"]["currentPlayerId"] == player_id,
+            f"{phase} for {player_id}",
+        )
+        return msg["payload"]["game"]
+
+    async def start(self) -> None:
+        for s in self.seats:
+            await s.send("set_ready", ready=True)
+        await self.ws.expect_phase("SETUP_REVEAL")
+
+    async def setup(self) -> dict:
+        for s in self.seats:
+            await s.send("setup_reveal", index=0)
+            await s.send("setup_reveal", index=5)
+        game = (await self.ws.expect_phase("TURN_CHOOSE_SOURCE"))["payload"]["game"]
+        for s in self.seats:
+            s.ws.assert_no_errors()
+        return game
+
+    async def force_round_end(self, current_id: str, finisher_value: int, other_value: int) -> dict:
+        """
+        Current player gets one hidden card left and finishes by swapping it;
+        everyone else is fully face-up and discards on their last turn.
+        """
+        finisher = self.seat(current_id)
+        for s in self.seats:
+            value = finisher_value if s is finisher else other_value
+            face = [True] * 12
+            if s is finisher:
+                face[2] = False
+            await s.send("debug_set_player_grid", values=[value] * 12, faceUp=face, removed=[False] * 12)
+            await self.ws.expect_type("info")
+
+        await self.turn_of(finisher.player_id)
+        await finisher.send("draw_from_deck")
+        await self.turn_of(finisher.player_id, "TURN_RESOLVE")
+        await finisher.send("swap_into_grid", index=2)
+        await self.ws.expect_event("final_round_started")
+
+        order = [s.player_id for s in self.seats]
+        i = order.index(finisher.player_id)
+        for step in range(1, len(order)):
+            pid = order[(i + step) % len(order)]
+            await self.turn_of(pid)
+            await self.seat(pid).send("draw_from_deck")
+            await self.turn_of(pid, "TURN_RESOLVE")
+            await self.seat(pid).send("discard_drawn")
+
+        await self.ws.expect_event("round_ended")
+        return (await self.ws.expect_phase("ROUND_OVER"))["payload"]["game"]
+
+    async def close(self) -> None:
+        for s in self.seats:
+            await s.ws.close()
+        await self.ws.close()
+
+
+# -------------------------
+# Scenarios
+# -------------------------
+@scenario
+async def create_and_join():
+    t = await Table().create(("P1", "P2", "P3"))
+    lobby = (await t.ws.expect(
+        lambda m: m.get("type") == "game_public_state" and len(m["payload"]["game"]["players"]) == 3,
+        "three players in lobby",
+    ))["payload"]["game"]
+    assert [p["name"] for p in lobby["players"]] == ["P1", "P2", "P3"]
+    await t.close()
+
+
+@scenario
+async def turn_draw_and_swap():
+    t = await Table().create()
+    await t.start()
+    game = await t.setup()
+    cur = t.seat(game["currentPlayerId"])
+    await cur.send("draw_from_deck")
+    resolve = await t.turn_of(cur.player_id, "TURN_RESOLVE")
+    drawn = resolve["tableDrawnCard"]
+    await cur.send("swap_into_grid", index=3)
+    nxt = next(s for s in t.seats if s is not cur)
+    await t.turn_of(nxt.player_id)
+    me = (await cur.ws.expect(
+        lambda m: m.get("type") == "player_private_state" and m["payload"]["me"]["grid"][3]["isFaceUp"],
+        "private state with swapped card",
+    ))["payload"]["me"]
+    assert me["grid"][3]["value"] == drawn
+    cur.ws.assert_no_errors()
+    await t.close()
+
+
+@scenario
+async def round2_setup_then_turns():
+    t = await Table().create()
+    await t.start()
+    game = await t.setup()
+    await t.force_round_end(game["currentPlayerId"], finisher_value=1, other_value=0)
+
+    await t.seats[0].send("start_new_round")
+    await t.ws.expect_phase("SETUP_REVEAL")
+    game = await t.setup()
+    assert game["roundIndex"] == 2, game["roundIndex"]
+    await t.close()
+
+
+@scenario
+async def game_over_threshold():
+    t = await Table().create()
+    await t.start()
+    game = await t.setup()
+    over = await t.force_round_end(game["currentPlayerId"], finisher_value=12, other_value=12)
+    assert max(over["roundScores"].values()) >= 100, over["roundScores"]
+
+    await t.seats[0].send("start_new_round")
+    ev = (await t.ws.expect_event("game_over"))["payload"]["event"]
+    final = (await t.ws.expect_phase("GAME_OVER"))["payload"]["game"]
+    assert final["winnerId"] == ev["winnerId"] and final["rankedTotals"]
+    assert final["roundHistoryCount"] == 1
+    await t.close()
+
+
+@scenario
+async def full_game_happy_path():
+    t = await Table().create()
+    await t.start()
+    game = await t.setup()
+    await t.force_round_end(game["currentPlayerId"], finisher_value=1, other_value=0)
+
+    await t.seats[0].send("start_new_round")
+    await t.ws.expect_phase("SETUP_REVEAL")
+    game = await t.setup()
+    await t.force_round_end(game["currentPlayerId"], finisher_value=12, other_value=12)
+
+    await t.seats[0].send("start_new_round")
+    final = (await t.ws.expect_phase("GAME_OVER"))["payload"]["game"]
+    assert final["totalScores"] and final["winnerId"] is not None and final["rankedTotals"]
+
+    await t.ws.send("get_round_history", {"offset": 0, "limit": 10})
+    hist = (await t.ws.expect_type("round_history"))["payload"]
+    assert hist["total"] == 2 and [i["roundIndex"] for i in hist["items"]] == [1, 2]
+    for s in t.seats:
+        s.ws.assert_no_errors()
+    await t.close()
+
+
+# -------------------------
+# Runner
+# -------------------------
+def run_one(name: str) -> float:
+    async def go():
+        async with isolated_store(seed=name):  # deterministic deck per scenario
+            await SCENARIOS[name]()
+
+    t0 = time.perf_counter()
+    asyncio.run(go())
+    return time.perf_counter() - t0
+
+
+def main(names=None) -> None:
+    names = list(names or SCENARIOS)
+    t0 = time.perf_counter()
+    # fork: workers inherit the already-imported app instead of importing it again.
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1), mp_context=ctx) as pool:
+        for name, elapsed in zip(names, pool.map(run_one, names)):
+            print(f"✅ {name} ({elapsed * 1000:.0f}ms)")
+    print(f"✅ {len(names)} in-process scenarios in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+"""
+Event-loop lag monitor + /ready, in-process (no server needed).
+"""
+import asyncio
+import dataclasses
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["SKYJO_SNAPSHOT_DIR"] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from Backend.app import main as app_main  # noqa: E402
+from Backend.app.loopmon import LoopLagMonitor  # noqa: E402
+
+
+async def test_monitor_sees_blocking():
+    mon = LoopLagMonitor(interval_s=0.01)
+    mon.start()
+    await asyncio.sleep(0.1)
+    quiet = mon.percentiles((0.5,))[0.5]
+
+    for _ in range(3):
+        time.sleep(0.05)  # a handler that blocks the loop
+        await asyncio.sleep(0.02)
+    await mon.stop()
+
+    assert quiet < 0.02, quiet
+    assert mon.max() >= 0.04, mon.max()
+    print(f"✅ lag monitor: quiet p50={quiet * 1000:.2f}ms, max after blocking={mon.max() * 1000:.1f}ms")
+
+
+def test_ready_endpoint():
+    with TestClient(app_main.app) as client:
+        r = client.get("/ready")
+        assert r.status_code == 200, r.text
+        assert r.json()["ready"] is True
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "create_table", "payload": {}})
+            assert ws.receive_json()["type"] == "table_created"
+
+        original = app_main.settings
+        app_main.settings = dataclasses.replace(original, ready_max_games=1)
+        try:
+            r = client.get("/ready")
+            assert r.status_code == 503, r.text
+            assert r.json()["reasons"] == ["too_many_games"]
+        finally:
+            app_main.settings = original
+
+        for _ in range(20):
+            app_main.loop_lag.record(1.0)
+        r = client.get("/ready")
+        assert r.status_code == 503 and "event_loop_lag" in r.json()["reasons"], r.text
+
+        metrics = client.get("/metrics").text
+        assert 'skyjo_event_loop_lag_seconds{quantile="0.99"}' in metrics
+    print("✅ /ready flips to 503 on game count and loop lag")
+
+
+async def main():
+    await test_monitor_sees_blocking()
+    test_ready_endpoint()
+
+
+asyncio.run(main())
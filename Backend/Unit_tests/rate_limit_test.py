@@ -0,0 +1,127 @@
+"""
+Admission control in-process (asgi_ws transport): per-connection and per-game
+token buckets, the connection and game caps, close codes and the
+skyjo_ws_throttled_total counter.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import AsgiWebSocket, isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.metrics import THROTTLED  # noqa: E402
+from Backend.app.ratelimit import CLOSE_POLICY_VIOLATION, CLOSE_TRY_AGAIN_LATER, Admission  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def with_admission(**limits):
+    clock = Clock()
+    saved = ws_module.admission
+    ws_module.admission = Admission(clock=clock, **limits)
+    return clock, saved
+
+
+async def settle():
+    # Let the endpoint tasks drain their inboxes.
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+async def connection_rate():
+    clock, saved = with_admission(conn_rate=1, conn_burst=5)
+    try:
+        async with isolated_store():
+            t = await Table().create()
+            before = THROTTLED.value("conn_rate")
+            seat = t.seats[0]
+            for _ in range(7):
+                await seat.send("set_ready", ready=True)
+            err = await seat.ws.expect_type("error")
+            assert err["payload"]["throttled"] == "conn_rate", err
+            await settle()
+            assert THROTTLED.value("conn_rate") - before == 3  # join_game took a token too
+            assert len(seat.ws.errors()) == 1, "one error per throttled streak"
+
+            # Tokens come back with time.
+            clock.now += 3
+            await seat.send("get_round_history")
+            await seat.ws.expect_type("round_history")
+            print("✅ connection bucket throttles after the burst and refills")
+
+            # Keep hammering through a whole burst while throttled: closed with 1008.
+            for _ in range(12):
+                await seat.send("get_round_history")
+            assert await seat.ws.expect_closed() == CLOSE_POLICY_VIOLATION
+            assert THROTTLED.value("closed") >= 1
+            print("✅ flooding connection closed with 1008")
+            await t.close()
+    finally:
+        ws_module.admission = saved
+
+
+async def game_rate():
+    clock, saved = with_admission(game_rate=1, game_burst=3)
+    try:
+        async with isolated_store():
+            t = await Table().create()  # the 2 joins take 2 tokens of this game
+            before = THROTTLED.value("game_rate")
+            await t.seats[0].send("get_round_history")
+            await t.seats[0].ws.expect_type("round_history")
+            # The bucket is shared: the other player is throttled now.
+            await t.seats[1].send("get_round_history")
+            err = await t.seats[1].ws.expect_type("error")
+            assert err["payload"]["throttled"] == "game_rate", err
+            assert THROTTLED.value("game_rate") - before == 1
+
+            # Another game has its own bucket.
+            other = await AsgiWebSocket.open()
+            await other.send("create_table")
+            await other.expect_type("table_created")
+            await other.close()
+            print("✅ per-game bucket shared by all sockets of one game")
+            await t.close()
+    finally:
+        ws_module.admission = saved
+
+
+async def caps():
+    _, saved = with_admission(max_connections=2, max_games=1)
+    try:
+        async with isolated_store():
+            a = await AsgiWebSocket.open()
+            b = await AsgiWebSocket.open()
+            c = await AsgiWebSocket.open()
+            assert await c.expect_closed() == CLOSE_TRY_AGAIN_LATER
+            assert ws_module.admission.connections == 2
+            print("✅ connection over the cap refused with 1013")
+
+            await a.send("create_table")
+            await a.expect_type("table_created")
+            await b.send("create_table")
+            await b.expect_type("error")
+            assert await b.expect_closed() == CLOSE_TRY_AGAIN_LATER
+            await settle()
+            assert ws_module.admission.connections == 1
+            await a.close()
+            assert ws_module.admission.connections == 0
+            print("✅ create_table over the game cap refused with 1013")
+    finally:
+        ws_module.admission = saved
+
+
+async def main():
+    await connection_rate()
+    await game_rate()
+    await caps()
+
+
+asyncio.run(main())
@@ -0,0 +1,229 @@
+"""
+Rule sets: presets and create_table payload validation, the precomputed
+line tables, row removal, no finisher doubling, the quick threshold, random
+play on a custom grid and deck (live counters still match a recount), the
+rules surviving a snapshot, joins capped by the deck size, and create_table
+with rules in-process (asgi_ws transport).
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import AsgiWebSocket, isolated_store  # noqa: E402
+from engine_fixtures import new_game  # noqa: E402
+from Backend.app.game.deck import UnseenCards  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+from Backend.app.game.rules import CLASSIC, RULESETS, RuleSet  # noqa: E402
+from Backend.app.game.zobrist import full_hash  # noqa: E402
+
+
+def raises(raw, message: str) -> None:
+    try:
+        RuleSet.from_payload(raw)
+    except ValueError as e:
+        assert str(e) == message, (raw, str(e))
+        return
+    raise AssertionError(f"accepted {raw!r}")
+
+
+def presets_and_payloads():
+    assert RuleSet.from_payload(None) is CLASSIC
+    assert RuleSet.from_payload("quick") is RULESETS["quick"]
+    custom = RuleSet.from_payload({"preset": "quick", "cols": 3, "removeRows": True})
+    assert custom.name == "custom" and custom.game_over_threshold == 50 and custom.grid_size == 9
+    assert RuleSet.from_payload(custom.to_dict()) == custom, "to_dict() is a valid payload"
+    assert RuleSet.from_payload({"deck": {"1": 20, "2": 20}}).card_values == (1, 2)
+
+    raises("turbo", "Unknown rule set: turbo")
+    raises(42, "rules must be a preset name or an object")
+    raises({"jokers": True}, "Unknown rule: jokers")
+    raises({"rows": "3"}, "rows must be an integer")
+    raises({"removeRows": 1}, "removeRows must be true or false")
+    raises({"deck": [1, 2]}, "deck must be a list of [value, copies] pairs")
+    raises({"deck": [[1, 20], [1, 20]]}, "Deck needs distinct values with non-negative copies")
+    raises({"deck": [[5, 25]]}, "Deck too small for two players")
+    raises({"gameOverThreshold": 0}, "gameOverThreshold must be positive")
+    raises({"rows": 1}, "Column removal needs at least two rows")
+    raises({"setupReveals": 13}, "setupReveals must be between 1 and the grid size")
+    raises({"setupReveals": 0}, "setupReveals must be between 1 and the grid size")
+    raises({"rows": 1000, "cols": 1000}, "Grid can have at most 6 rows and 6 columns")
+    raises({"cols": 7}, "Grid can have at most 6 rows and 6 columns")
+    raises({"deck": [[0, 10 ** 9]]}, "Deck can have at most 500 cards")
+    raises({"deck": [[0, 300], [1, 201]]}, "Deck can have at most 500 cards")
+    assert RuleSet.from_payload({"rows": 6, "cols": 6, "deck": [[0, 250], [1, 250]]}).grid_size == 36
+    print("✅ presets, payload overrides and validation errors")
+
+
+def derived_tables():
+    assert CLASSIC.column_indices == ((0, 4, 8), (1, 5, 9), (2, 6, 10), (3, 7, 11))
+    assert [kind for kind, _, _ in CLASSIC.lines] == ["col"] * 4
+    both = RULESETS["rows_and_columns"]
+    assert [(kind, n, idxs) for kind, n, idxs in both.lines if kind == "row"] == [
+        ("row", 0, (0, 1, 2, 3)), ("row", 1, (4, 5, 6, 7)), ("row", 2, (8, 9, 10, 11)),
+    ]
+    assert len(CLASSIC.deck_cards) == 75 and CLASSIC.card_values == UnseenCards().values
+    assert CLASSIC.public == CLASSIC.to_dict() and CLASSIC.public["removeColumns"] is True
+    print("✅ line tables, deck and public description built once per rule set")
+
+
+def row_removal():
+    engine = new_game(1, rules=RULESETS["rows_and_columns"])
+    p = engine.game.players[0]
+    # Row 1 and column 1 both complete once index 5 shows a 7.
+    p.grid_values = [7, 7, 1, 2, 7, 7, 7, 7, 3, 7, 4, 6]
+    p.grid_face_up = [True] * 12
+    events = engine._check_and_remove_columns(p)
+    assert events == [
+        {"col": 1, "value": 7, "indices": [1, 5, 9]},
+        {"row": 1, "value": 7, "indices": [4, 5, 6, 7]},
+    ], events
+    assert [i for i in range(12) if p.grid_removed[i]] == [1, 4, 5, 6, 7, 9]
+    assert engine.game.discard[-6:] == [7] * 6, "the shared card is discarded once"
+
+    classic = new_game(1)
+    q = classic.game.players[0]
+    q.grid_values = [1, 2, 3, 4, 7, 7, 7, 7, 5, 6, 8, 9]
+    q.grid_face_up = [True] * 12
+    assert classic._check_and_remove_columns(q) == [], "classic rules keep full rows"
+    print("✅ a row and a column completed together are both removed")
+
+
+def scoring_variants():
+    for rules, doubled in ((CLASSIC, True), (RULESETS["no_doubling"], False)):
+        engine = new_game(1, rules=rules)
+        g = engine.game
+        a, b = g.players
+        a.grid_values, b.grid_values = [3] * 12, [0] * 12
+        g.finisher_id = a.id
+        engine._end_round()
+        assert g.finisher_doubled is doubled and g.round_scores[a.id] == (72 if doubled else 36)
+
+    engine = new_game(1, rules=RULESETS["quick"])
+    g = engine.game
+    g.phase = Phase.ROUND_OVER
+    g.round_scores = {g.players[0].id: 55, g.players[1].id: 10}
+    engine.start_new_round(g.players[0].id)
+    assert g.phase == Phase.GAME_OVER
+    assert engine.consume_events()[-1]["threshold"] == 50
+    print("✅ no_doubling scores the finisher once; quick ends the game at 50")
+
+
+def custom_rules_random_play():
+    rules = RuleSet.from_payload({
+        "rows": 2, "cols": 3, "setupReveals": 1, "removeRows": True,
+        "deck": [[-5, 4], [0, 10], [1, 10], [2, 10], [3, 6], [20, 2]],
+    })
+    commands = 0
+    for seed in range(8):
+        rng = random.Random(seed)
+        engine = new_game(seed, players=2 + seed % 3, rules=rules)
+        g = engine.game
+        assert g.grid_size == 6 and all(len(p.grid_values) == 6 for p in g.players)
+        while g.phase != Phase.GAME_OVER and commands < 400 * (seed + 1):
+            if g.phase == Phase.ROUND_OVER:
+                engine.start_new_round(g.players[0].id)
+            elif g.phase == Phase.SETUP_REVEAL:
+                p = next(p for p in g.players if p.setup_reveals_done < rules.setup_reveals)
+                engine.reveal_setup_card(p.id, rng.choice([i for i in range(6) if not p.grid_face_up[i]]))
+            elif rng.random() < 0.05:
+                engine = GameEngine.from_snapshot(engine.to_snapshot())
+                g = engine.game
+            else:
+                engine.auto_play()
+            commands += 1
+            scratch = UnseenCards(rules.card_values)
+            scratch.recount(g)
+            assert engine.unseen.as_tuple() == scratch.as_tuple(), (seed, commands)
+            assert engine.state_hash() == full_hash(g), (seed, commands)
+        assert engine.rules == rules
+        assert engine.public_state()["game"]["rules"]["cols"] == 3
+    print(f"✅ 2x3 grid, custom deck, row removal: counters and fingerprint hold over {commands} commands")
+
+
+def snapshot_keeps_rules():
+    engine = new_game(1, rules=RULESETS["rows_and_columns"])
+    restored = GameEngine.from_snapshot(engine.to_snapshot())
+    assert restored.rules == RULESETS["rows_and_columns"]
+    assert engine.to_snapshot()["rules"] is not None
+    assert new_game(1).to_snapshot()["rules"] is None, "classic games store no rules"
+    assert GameEngine.from_snapshot(new_game(1).to_snapshot()).rules is CLASSIC
+    print("✅ snapshots keep the rule set")
+
+
+MINIMAL = {"rows": 2, "cols": 2, "deck": [[0, 5], [1, 5]]}
+
+
+def minimal_deck():
+    rules = RuleSet.from_payload(MINIMAL)
+    engine = GameEngine(code="RULE", seed=1, rules=rules)
+    ids = [engine.add_player(f"P{i}")[0] for i in range(2)]
+    try:
+        engine.add_player("P2")
+        raise AssertionError("a third 2x2 grid does not fit in 10 cards")
+    except ValueError as e:
+        assert str(e) == "Cannot join: not enough cards for another player"
+    assert len(engine.game.players) == 2
+    for pid in ids:
+        engine.set_ready(pid)
+    assert engine.start_game_if_ready() and len(engine.game.deck) == 1
+    print("✅ a join the deck cannot deal is refused; the game still starts")
+
+
+async def inproc():
+    async with isolated_store(seed="rules"):
+        table = await AsgiWebSocket.open()
+        await table.send("create_table", {"rules": "rows_and_columns"})
+        await table.expect_type("table_created")
+        game = (await table.expect_phase("LOBBY"))["payload"]["game"]
+        assert game["rules"]["name"] == "rows_and_columns" and game["rules"]["removeRows"] is True
+        table.assert_no_errors()
+
+        bad = await AsgiWebSocket.open()
+        await bad.send("create_table", {"rules": {"cols": 0}})
+        err = await bad.expect_type("error")
+        assert err["payload"]["message"] == "Create failed: Grid needs at least one row and one column"
+        print("✅ create_table takes a rule set; invalid rules are rejected")
+        await table.close()
+        await bad.close()
+
+        table = await AsgiWebSocket.open()
+        await table.send("create_table", {"rules": MINIMAL})
+        code = (await table.expect_type("table_created"))["payload"]["code"]
+        seats = []
+        for name in ("P0", "P1", "P2"):
+            ws = await AsgiWebSocket.open()
+            await ws.send("join_game", {"code": code, "name": name})
+            seats.append(ws)
+        tokens = [(await ws.expect_type("joined"))["payload"]["token"] for ws in seats[:2]]
+        err = await seats[2].expect_type("error")
+        assert err["payload"]["message"] == "Join failed: Cannot join: not enough cards for another player"
+        for ws, token in zip(seats, tokens):
+            await ws.send("set_ready", {"token": token, "ready": True})
+        await table.expect_phase("SETUP_REVEAL")
+        await seats[0].send("set_ready", {"token": tokens[0], "ready": False})
+        err = await seats[0].expect_type("error")
+        assert err["payload"]["message"] == "Cannot change ready state after game start"
+        await seats[0].send("setup_reveal", {"token": tokens[0], "index": 0})
+        await seats[0].expect(lambda m: m.get("type") == "player_private_state"
+                              and m["payload"]["me"]["grid"][0]["isFaceUp"], "index 0 revealed")
+        print("✅ a third join on a 10-card 2x2 table is refused; a bad set_ready is an error, not a disconnect")
+        for ws in (table, *seats):
+            await ws.close()
+
+
+async def main():
+    presets_and_payloads()
+    derived_tables()
+    row_removal()
+    scoring_variants()
+    custom_rules_random_play()
+    snapshot_keeps_rules()
+    minimal_deck()
+    await inproc()
+
+
+asyncio.run(main())
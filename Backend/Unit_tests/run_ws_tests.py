@@ -1,5 +1,8 @@
+import argparse
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PYTHON = sys.executable
@@ -18,6 +21,30 @@ CORE_TESTS = [
     "ws_force_column_test.py",
     "ws_round2_setup_then_turns_test.py",
     "ws_game_over_threshold_test.py",
+    "ws_table_selection_coalesce_test.py",
+    "ws_targeted_private_state_test.py",
+    "cluster_sharding_test.py",
+    "snapshot_restore_test.py",
+    "ws_metrics_test.py",
+    "loop_lag_ready_test.py",
+    "admin_profile_test.py",
+    "structured_logging_test.py",
+    "ws_loadtest_smoke_test.py",
+    "inproc_scenarios_test.py",
+    "engine_bench_smoke_test.py",
+    "fanout_bench_smoke_test.py",
+    "session_replay_test.py",
+    "rate_limit_test.py",
+    "heartbeat_test.py",
+    "turn_timeout_test.py",
+    "spectator_test.py",
+    "http_views_test.py",
+    "frozen_snapshot_test.py",
+    "undo_test.py",
+    "card_counts_test.py",
+    "hint_test.py",
+    "zobrist_test.py",
+    "rules_test.py",
 ]
 
 # Tests die we expliciet NIET draaien
@@ -33,18 +60,19 @@ def should_skip(test_name: str) -> bool:
     return any(test_name.startswith(p) for p in EXCLUDED_PREFIXES)
 
 
-def run_test(test_path: Path) -> bool:
-    print("\n" + "=" * 70)
-    print(f"▶ RUNNING {test_path.name}")
-    print("=" * 70)
-
-    result = subprocess.run(
+def run_test(test_path: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
         [PYTHON, str(test_path)],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
     )
 
+
+def report(test_path: Path, result: subprocess.CompletedProcess) -> bool:
+    print("\n" + "=" * 70)
+    print(f"▶ RAN {test_path.name}")
+    print("=" * 70)
     print(result.stdout)
 
     if result.returncode != 0:
@@ -59,6 +87,11 @@ def run_test(test_path: Path) -> bool:
 # Main
 # -------------------------
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="tests die tegelijk draaien (elk in een eigen proces)")
+    args = ap.parse_args()
+
     base_dir = Path(__file__).parent
 
     # Sanity check: bestaan alle core tests?
@@ -68,16 +101,21 @@ def main():
             print(f"❌ Core test missing: {name}")
             sys.exit(1)
 
-    # Run core tests
+    # Run core tests, in parallel; output per test in CORE_TESTS order
+    paths = []
     for name in CORE_TESTS:
         if should_skip(name):
             print(f"⚠️  Skipping debug test: {name}")
             continue
+        paths.append(base_dir / name)
 
-        ok = run_test(base_dir / name)
-        if not ok:
-            print("\n🛑 STOPPING: at least one core test failed.")
-            sys.exit(1)
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(run_test, paths))
+
+    failed = [p.name for p, r in zip(paths, results) if not report(p, r)]
+    if failed:
+        print(f"\n🛑 FAILED: {', '.join(failed)}")
+        sys.exit(1)
 
     print("\n🎉 ALL CORE WEBSOCKET TESTS PASSED 🎉")
     sys.exit(0)
@@ -0,0 +1,89 @@
+"""
+Record a session in-process (asgi_ws transport), then replay the log through
+Backend/tools/replay.py: every recorded game_public_state must be reproduced,
+and a tampered log must be caught.
+"""
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.recorder import recording_path  # noqa: E402
+from Backend.tools import replay  # noqa: E402
+
+
+async def play_session() -> None:
+    t = await Table().create(("P1", "P2", "P3"))
+    await t.start()
+    game = await t.setup()
+    # A burst of cosmetic table updates: coalesced live, flushed from the log on replay.
+    for source in ("deck", "discard", "deck"):
+        await t.ws.send("table_set_selection", {"source": source})
+    await asyncio.sleep(0.1)
+    for _ in range(6):
+        cur = t.seat(game["currentPlayerId"])
+        await cur.send("draw_from_deck")
+        game = await t.turn_of(cur.player_id, "TURN_RESOLVE")
+        await cur.send("discard_drawn")
+        game = (await t.ws.expect(
+            lambda m: m.get("type") == "game_public_state"
+            and m["payload"]["game"]["phase"] == "TURN_CHOOSE_SOURCE"
+            and m["payload"]["game"]["currentPlayerId"] != cur.player_id,
+            "next turn",
+        ))["payload"]["game"]
+    # A reconnect on a fresh socket: the resume token must be translated too.
+    seat = t.seats[0]
+    await seat.ws.close()
+    seat.ws = await type(t.ws).open()
+    await seat.send("resume_game", code=t.code)
+    await seat.ws.expect_type("player_private_state")
+    await t.close()
+
+
+async def record(path: str) -> None:
+    ws_module.recorder.start(path, max_bytes=2048, backups=20)
+    try:
+        async with isolated_store():
+            await play_session()
+    finally:
+        ws_module.recorder.stop()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = recording_path(tmp, 0)
+        asyncio.run(record(path))
+        assert Path(path + ".1").exists(), "small max_bytes should have rotated the log"
+
+        records = replay.load([tmp])
+        kinds = {r["k"] for r in records}
+        assert {"in", "game", "join", "flush", "out", "bye"} <= kinds, kinds
+        print(f"✅ recorded {len(records)} records ({sum(r['k'] == 'in' for r in records)} inbound)")
+
+        result = asyncio.run(replay.replay(records))
+        assert not result["mismatches"], result["mismatches"]
+        assert result["handler_failures"] == 0, result
+        print(f"✅ replay reproduced every public state ({result['messages']} messages)")
+
+        result = asyncio.run(replay.replay(records, pace="original", speed=20))
+        assert not result["mismatches"], result["mismatches"]
+        print(f"✅ paced replay (20x) reproduced it too in {result['elapsed_s']:.2f}s")
+
+        # Keep a drawn card instead of discarding it: the replayed states must diverge.
+        tampered = json.loads(json.dumps(records))
+        move = next(r for r in tampered if r["k"] == "in" and r["m"]["type"] == "discard_drawn")
+        move["m"]["type"] = "swap_into_grid"
+        move["m"]["payload"]["index"] = 3
+        result = asyncio.run(replay.replay(tampered))
+        assert result["mismatches"], "tampered log should not replay cleanly"
+        print("✅ tampered log detected:", result["mismatches"][0])
+
+        assert replay.main([tmp]) == 0
+
+
+main()
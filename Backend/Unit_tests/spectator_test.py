@@ -0,0 +1,111 @@
+"""
+Spectators in-process (asgi_ws transport): spectate_game, read-only
+enforcement, the per-spectator rate cap, isolation of the player broadcast
+from slow or dead viewers, and the end-of-round reveal.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import AsgiWebSocket, isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.coalesce import Coalescer  # noqa: E402
+
+
+class FakeViewer:
+    """A spectator socket that hangs (`delay_s`) or is already gone."""
+
+    def __init__(self, delay_s: float = 0.0, dead: bool = False):
+        self.state = SimpleNamespace(code=None, player_id=None, conn_id=f"fake{id(self)}", spectator=True)
+        self.delay_s = delay_s
+        self.dead = dead
+
+    async def send_text(self, text: str) -> None:
+        if self.dead:
+            raise RuntimeError("gone")
+        await asyncio.sleep(self.delay_s)
+
+
+def public_states(ws: AsgiWebSocket):
+    return [m for m in ws.inbox if m.get("type") == "game_public_state"]
+
+
+async def main():
+    saved = ws_module.spectator_feed, ws_module.SPECTATOR_SEND_TIMEOUT_S
+    ws_module.spectator_feed = Coalescer(0.2, ws_module._flush_spectators)  # 5 updates/s
+    ws_module.SPECTATOR_SEND_TIMEOUT_S = 0.3
+    try:
+        async with isolated_store(seed="spectate") as store:
+            t = await Table().create()
+            await t.start()
+            game = await t.setup()
+
+            spec = await AsgiWebSocket.open()
+            await spec.send("spectate_game", {"code": t.code.lower()})
+            assert (await spec.expect_type("spectating"))["payload"] == {"code": t.code}
+            state = (await spec.expect_type("game_public_state"))["payload"]["game"]
+            assert state["phase"] == "TURN_CHOOSE_SOURCE"
+            assert len(store.spectators(t.code)) == 1
+            assert all(not getattr(s.state, "spectator", False) for s in store.sockets(t.code))
+
+            await spec.send("draw_from_deck", {"token": t.seats[0].token})
+            err = await spec.expect_type("error")
+            assert "Spectators" in err["payload"]["message"], err
+            await spec.send("spectate_game", {"code": "NOPE"})
+            await spec.expect(lambda m: m.get("type") == "error" and "Spectate failed" in m["payload"]["message"],
+                              "second spectate rejected")
+            cur = t.seat(game["currentPlayerId"])
+            assert store.get_game(t.code).game.phase.value == "TURN_CHOOSE_SOURCE"  # nothing was played
+            print("✅ spectate_game sends the current state; spectators cannot act")
+
+            # A burst of states: players get every one, the spectator only the latest.
+            engine = store.get_game(t.code)
+            before_player = len(public_states(cur.ws))
+            before_spec = len(public_states(spec))
+            for i in range(20):
+                engine.set_table_selection("deck" if i % 2 else None)
+                await ws_module._broadcast(t.code, "game_public_state", engine.public_state())
+            await asyncio.sleep(0.35)
+            assert len(public_states(cur.ws)) - before_player == 20
+            assert len(public_states(spec)) - before_spec == 1, len(public_states(spec)) - before_spec
+            assert public_states(spec)[-1]["payload"]["game"]["tableSelectedSource"] == "deck"
+            print("✅ spectator updates capped by the feed window, latest state delivered")
+
+            # A hung and a dead viewer never delay the players and get dropped.
+            slow, dead = FakeViewer(delay_s=10), FakeViewer(dead=True)
+            store.add_spectator(t.code, slow)
+            store.add_spectator(t.code, dead)
+            engine.set_table_selection("discard")
+            t0 = time.perf_counter()
+            await ws_module._broadcast(t.code, "game_public_state", engine.public_state())
+            assert time.perf_counter() - t0 < 0.05
+            await asyncio.sleep(0.2 + 0.3 + 0.2)
+            assert not any(isinstance(s, FakeViewer) for s in store.spectators(t.code))
+            assert len(store.spectators(t.code)) == 1
+            print("✅ slow and dead spectators isolated from the player broadcast and reaped")
+
+            # End of the round: one reveal with every grid value.
+            await t.force_round_end(cur.player_id, finisher_value=1, other_value=0)
+            reveal = (await spec.expect_type("round_reveal", timeout_s=3))["payload"]
+            assert reveal["roundIndex"] == 1 and set(reveal["scores"]) == {s.player_id for s in t.seats}, reveal
+            grids = {g["playerId"]: g["values"] for g in reveal["grids"]}
+            assert len(grids) == 2 and all(len(v) == 12 for v in grids.values())
+            other = next(s for s in t.seats if s is not cur)
+            assert all(v in (0, None) for v in grids[other.player_id]), grids
+            await ws_module._broadcast(t.code, "game_public_state", engine.public_state())
+            await asyncio.sleep(0.35)
+            assert sum(m.get("type") == "round_reveal" for m in spec.inbox) == 1
+            print("✅ round_reveal sent once at the end of the round")
+
+            await spec.close()
+            assert not store.spectators(t.code)
+            await t.close()
+    finally:
+        ws_module.spectator_feed, ws_module.SPECTATOR_SEND_TIMEOUT_S = saved
+
+
+asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Structured logging in-process: queue handler does not block on a slow sink,
+context fields land in the JSON, sampling, and set-detection only when enabled.
+"""
+import io
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ["SKYJO_SNAPSHOT_DIR"] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app import logs, ws  # noqa: E402
+
+
+class SlowSink(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.setFormatter(logs.JsonFormatter())
+
+    def emit(self, record):
+        time.sleep(0.01)  # a stalled stdout pipe
+        self.lines.append(self.format(record))
+
+
+def test_queue_handler_and_fields():
+    logs.configure_logging("INFO", "json")
+    # Swap the listener's stderr sink for a slow in-memory one.
+    sink = SlowSink()
+    logs._listener.handlers = (sink,)
+
+    log = logs.get_logger("test")
+    fake_ws = SimpleNamespace(state=SimpleNamespace(code="ABCD", player_id="p1"))
+    t0 = time.perf_counter()
+    for _ in range(50):
+        log.info("moved", extra=logs.ctx(fake_ws, "swap_into_grid"))
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.1, f"logging blocked the caller for {elapsed:.3f}s"
+
+    logs.shutdown_logging()  # flushes the queue
+    assert len(sink.lines) == 50
+    doc = json.loads(sink.lines[0])
+    assert doc["msg"] == "moved" and doc["code"] == "ABCD"
+    assert doc["playerId"] == "p1" and doc["type"] == "swap_into_grid"
+    print(f"✅ 50 records queued in {elapsed * 1000:.1f}ms despite a 10ms/record sink")
+
+
+def test_sampler():
+    log = logs.get_logger("sampler_test")
+    log.propagate = False
+    seen = []
+    handler = logging.Handler()
+    handler.emit = seen.append
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+    s = logs.Sampler(10)
+    for _ in range(35):
+        s.log(log, logging.INFO, "connect", "WS CONNECT")
+    for _ in range(10):
+        s.log(log, logging.INFO, "other", "other")
+    assert len(seen) == 3 + 1, len(seen)
+    assert all(r.sampled == 10 for r in seen)
+    print("✅ sampler lets 1 in N through per key")
+
+
+def test_debug_sets_is_free_when_off():
+    calls = []
+    original = ws.find_sets
+    ws.find_sets = lambda obj, path="root": calls.append(path)
+    try:
+        ws.sets_log.setLevel(logging.INFO)
+        ws._encode("game_public_state", {"x": [1, 2]})
+        assert calls == []
+
+        ws.sets_log.setLevel(logging.DEBUG)
+        ws._encode("game_public_state", {"x": [1, 2]})
+        assert calls == ["root"]
+    finally:
+        ws.find_sets = original
+        ws.sets_log.setLevel(logging.NOTSET)
+
+    out = []
+    handler = logging.Handler()
+    handler.emit = lambda r: out.append(r.getMessage())
+    ws.sets_log.addHandler(handler)
+    ws.sets_log.setLevel(logging.DEBUG)
+    ws.find_sets({"a": [{"b": {3}}]})
+    ws.sets_log.setLevel(logging.NOTSET)
+    ws.sets_log.removeHandler(handler)
+    assert out and "root.a[0].b" in out[0], out
+    print("✅ find_sets only runs with skyjo.debug_sets at DEBUG")
+
+
+test_queue_handler_and_fields()
+test_sampler()
+test_debug_sets_is_free_when_off()
@@ -0,0 +1,174 @@
+"""
+Turn deadlines: the shared TimerWheel (arm / re-arm / cancel, deadlines past
+one revolution, catching up after a stall, tens of thousands of timers) and
+the AFK auto-play in-process (asgi_ws transport), including its replay.
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import isolated_store, ws_module  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.metrics import TURN_TIMEOUTS  # noqa: E402
+from Backend.app.timers import TimerWheel  # noqa: E402
+from Backend.tools import replay  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def wheel_semantics():
+    clock = Clock()
+    fired = []
+
+    async def fire(key):
+        fired.append((key, clock.now))
+
+    wheel = TimerWheel(fire, tick_s=0.25, slots=8, clock=clock)  # one revolution = 2 s
+    wheel.arm("a", 1.0)
+    wheel.arm("b", 5.0)   # 2.5 revolutions away
+    wheel.arm("c", 1.0)
+    wheel.arm("c", 3.0)   # re-armed: the first deadline is gone
+    wheel.arm("d", 0.5)
+    wheel.cancel("d")
+    assert len(wheel) == 3 and wheel.deadline("d") is None
+
+    while clock.now < 1006:
+        clock.now += 0.25
+        await wheel.advance()
+    times = dict(fired)
+    assert sorted(times) == ["a", "b", "c"], fired
+    for key, delay in (("a", 1.0), ("b", 5.0), ("c", 3.0)):
+        assert 1000 + delay <= times[key] < 1000 + delay + 0.25, (key, times[key])
+    assert len(wheel) == 0
+    print("✅ arm / re-arm / cancel, deadline past one revolution")
+
+    # A stall of many revolutions: everything due fires once on the next tick.
+    fired.clear()
+    for i in range(20):
+        wheel.arm(f"k{i}", 0.1 * i)
+    clock.now += 100
+    assert await wheel.advance() == 20 and len(wheel) == 0
+    print("✅ catch-up after a stall")
+
+
+async def wheel_at_scale():
+    clock = Clock()
+    fired = {}
+
+    async def fire(key):
+        assert key not in fired, f"{key} fired twice"
+        fired[key] = clock.now
+
+    rng = random.Random(7)
+    wheel = TimerWheel(fire, clock=clock)
+    deadline = {}
+    n = 50_000
+    for i in range(n):
+        delay = rng.uniform(1, 60)
+        wheel.arm(f"g{i}", delay)
+        deadline[f"g{i}"] = clock.now + delay
+    # Every game moves a few times: O(1) re-arms.
+    for _ in range(3):
+        for i in rng.sample(range(n), n // 2):
+            delay = rng.uniform(1, 60)
+            wheel.arm(f"g{i}", delay)
+            deadline[f"g{i}"] = clock.now + delay
+        clock.now += 0.25
+        await wheel.advance()
+    cancelled = {f"g{i}" for i in range(0, n, 10) if f"g{i}" not in fired}
+    for key in cancelled:
+        wheel.cancel(key)
+        del deadline[key]
+    assert len(wheel) == len(deadline)
+
+    while len(wheel):
+        clock.now += 0.25
+        await wheel.advance()
+    assert fired.keys() == deadline.keys()
+    late = max(fired[k] - deadline[k] for k in deadline)
+    assert all(fired[k] >= deadline[k] for k in deadline)
+    assert late <= 0.25 + 1e-9, late
+    print(f"✅ {n} timers, {3 * n // 2} re-arms, {len(cancelled)} cancels: each fired once, within one tick")
+
+
+async def afk_table():
+    clock = Clock()
+    saved = ws_module.turn_timers, ws_module.turn_timeouts, ws_module.recorder
+    wheel = ws_module.turn_timers = TimerWheel(ws_module._turn_timeout, clock=clock)
+    ws_module.turn_timeouts = {"SETUP_REVEAL": 60.0, "TURN_CHOOSE_SOURCE": 30.0, "TURN_RESOLVE": 20.0}
+    capture = ws_module.recorder = replay.CaptureRecorder()
+
+    async def wait(seconds):
+        clock.now += seconds
+        await wheel.advance()
+
+    try:
+        async with isolated_store(seed="afk"):
+            t = await Table().create()
+            await t.start()
+            assert wheel.deadline(t.code) == clock.now + 60
+            active, afk = t.seats
+            await active.send("setup_reveal", index=0)
+            await active.send("setup_reveal", index=5)
+            await active.ws.expect_type("player_private_state")
+            before = TURN_TIMEOUTS.value("SETUP_REVEAL")
+
+            await wait(59)
+            assert t.ws.inbox[-1]["payload"]["game"]["phase"] == "SETUP_REVEAL"
+            await wait(1.25)
+            ev = (await t.ws.expect_event("turn_timed_out"))["payload"]["event"]
+            assert ev["playerId"] == afk.player_id and ev["action"] == "setup_reveal" and ev["indices"] == [0, 1], ev
+            game = (await t.ws.expect_phase("TURN_CHOOSE_SOURCE"))["payload"]["game"]
+            assert TURN_TIMEOUTS.value("SETUP_REVEAL") - before == 1
+            assert wheel.deadline(t.code) == clock.now + 30
+            print("✅ setup deadline reveals for the AFK player only")
+
+            # The current player moves: the deadline is re-armed for the next phase.
+            cur = t.seat(game["currentPlayerId"])
+            other = afk if cur is active else active
+            await wait(10)
+            await cur.send("draw_from_deck")
+            await t.turn_of(cur.player_id, "TURN_RESOLVE")
+            assert wheel.deadline(t.code) == clock.now + 20
+            await wait(20.25)
+            ev = (await t.ws.expect_event("turn_timed_out"))["payload"]["event"]
+            assert ev == {"type": "turn_timed_out", "playerId": cur.player_id, "phase": "TURN_RESOLVE",
+                          "action": "discard_and_reveal", "indices": ev["indices"]}, ev
+            await t.turn_of(other.player_id)
+            print("✅ resolve deadline discards the drawn card and reveals one")
+
+            # Nobody moves at all: a whole turn is played per deadline.
+            await wait(30.25)
+            ev = (await t.ws.expect_event("turn_timed_out"))["payload"]["event"]
+            assert ev["playerId"] == other.player_id and ev["phase"] == "TURN_CHOOSE_SOURCE", ev
+            await t.turn_of(cur.player_id)
+            for s in t.seats:
+                s.ws.assert_no_errors()
+            print("✅ choose deadline plays a full turn and passes it on")
+            await t.close()
+    finally:
+        ws_module.turn_timers, ws_module.turn_timeouts, ws_module.recorder = saved
+
+    kinds = [r["k"] for r in capture.records]
+    assert kinds.count("timeout") == 3, kinds
+    result = await replay.replay(capture.records)
+    assert not result["mismatches"], result["mismatches"]
+    print("✅ auto-played turns replay from the recording")
+
+
+async def main():
+    await wheel_semantics()
+    await wheel_at_scale()
+    await afk_table()
+
+
+asyncio.run(main())
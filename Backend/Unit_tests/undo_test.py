@@ -0,0 +1,183 @@
+"""
+Undo of turn commands: engine-level (state, deck, discard and RNG restored,
+bounded depth, no undo across rounds, a reshuffle rolled back) and the
+undo_turn table command in-process (asgi_ws transport).
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from asgi_ws import AsgiWebSocket, isolated_store  # noqa: E402
+from engine_fixtures import new_game as fresh_game, turn_command  # noqa: E402
+from inproc_scenarios_test import Table  # noqa: E402
+from Backend.app.game.engine import UNDO_CHECKPOINTS_MAX, GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+
+
+def state(engine: GameEngine):
+    g = engine.game
+    return (
+        repr(sorted((k, v) for k, v in g.__dict__.items() if k != "players")),
+        repr([sorted(p.__dict__.items()) for p in g.players]),
+        engine.rng.getstate(),
+    )
+
+
+def new_game(seed: int, players: int = 3) -> GameEngine:
+    """Setup reveals done: the first player is choosing a source."""
+    return fresh_game(seed, players, code="UNDO", reveal=(0, 5))
+
+
+def engine_undo():
+    commands = undone = 0
+    for seed in range(10):
+        rng = random.Random(seed)
+        engine = new_game(seed, players=2 + seed % 3)
+        stack = []
+        while engine.game.phase in (Phase.TURN_CHOOSE_SOURCE, Phase.TURN_RESOLVE) and commands < 300 * (seed + 1):
+            before = engine.frozen
+            stack.append(state(engine))
+            turn_command(engine, rng)
+            engine.commit()
+            commands += 1
+            assert engine._undo[-1][0] is before, "a checkpoint is the published snapshot itself"
+            if rng.random() < 0.3:
+                # Undo one to a few steps; each must land exactly on the earlier state.
+                for _ in range(rng.randint(1, min(3, len(engine._undo)))):
+                    engine.undo()
+                    engine.commit()
+                    assert state(engine) == stack.pop()
+                    undone += 1
+            stack = stack[-UNDO_CHECKPOINTS_MAX:]
+    print(f"✅ {commands} turn commands, {undone} undos: game, deck, discard and RNG restored exactly")
+
+    engine = new_game(1)
+    rng = random.Random(1)
+    for _ in range(UNDO_CHECKPOINTS_MAX + 4):
+        turn_command(engine, rng)
+    n = 0
+    while engine.can_undo():
+        engine.undo()
+        n += 1
+    assert n == UNDO_CHECKPOINTS_MAX
+    try:
+        engine.undo()
+        raise AssertionError("undo past the oldest checkpoint")
+    except ValueError:
+        pass
+    print(f"✅ at most {UNDO_CHECKPOINTS_MAX} checkpoints kept")
+
+
+def reshuffle_rolled_back():
+    engine = new_game(5)
+    g = engine.game
+    # One card left: the second draw reshuffles the discard pile with the RNG.
+    g.deck = g.deck[:1]
+    g.discard.extend([3, 4, 5, 6, 7, 8])
+    engine._discard_changed = True
+    engine.commit()
+    rng = random.Random(0)
+    while len(g.deck) > 0 or g.phase != Phase.TURN_CHOOSE_SOURCE:
+        turn_command(engine, rng)
+    before = state(engine)
+    pid = g.players[g.current_player_idx].id
+    drawn = engine.draw_from_deck(pid)
+    assert engine._undo[-1][1] is not None, "the reshuffle saved the RNG state"
+    engine.undo()
+    assert state(engine) == before
+    assert engine.draw_from_deck(pid) == drawn, "replaying the draw reshuffles identically"
+    print("✅ a draw that reshuffled is undone, RNG included")
+
+
+def no_undo_across_rounds():
+    engine = new_game(2, players=2)
+    g = engine.game
+    rng = random.Random(2)
+    while g.phase != Phase.ROUND_OVER:
+        turn_command(engine, rng)
+    assert engine.can_undo(), "the round-ending move can be undone"
+    engine.start_new_round(g.players[0].id)
+    assert not engine.can_undo()
+    print("✅ no undo across a new round")
+
+
+def auto_play_is_one_step():
+    engine = new_game(3)
+    g = engine.game
+    before = state(engine)
+    depth = len(engine._undo)
+    engine.auto_play()
+    assert len(engine._undo) == depth + 1, "draw and discard share one checkpoint"
+    engine.undo()
+    assert state(engine) == before and g.phase == Phase.TURN_CHOOSE_SOURCE
+
+    # Timed out while holding a card: only the automatic discard is undone.
+    pid = g.players[g.current_player_idx].id
+    engine.draw_from_deck(pid)
+    holding = state(engine)
+    engine.auto_play()
+    engine.undo()
+    assert state(engine) == holding and engine._get_player(pid).drawn_card is not None
+    print("✅ an AFK auto-play is undone as one move")
+
+
+async def table_undo():
+    async with isolated_store(seed="undo"):
+        t = await Table().create()
+        await t.start()
+        game = await t.setup()
+        cur = t.seat(game["currentPlayerId"])
+        other = next(s for s in t.seats if s is not cur)
+
+        await cur.send("draw_from_deck")
+        await t.turn_of(cur.player_id, "TURN_RESOLVE")
+        await cur.ws.expect(lambda m: m.get("type") == "player_private_state"
+                            and m["payload"]["me"]["drawnCard"] is not None, "drawn card")
+        other_private = sum(m.get("type") == "player_private_state" for m in other.ws.inbox)
+
+        await cur.send("undo_turn")
+        err = await cur.ws.expect_type("error")
+        assert err["payload"]["message"] == "Only the table can undo."
+
+        # A failed join leaves the socket unbound, so it cannot undo either.
+        stranger = await AsgiWebSocket.open()
+        await stranger.send("join_game", {"code": t.code, "name": "Eve"})
+        err = await stranger.expect_type("error")
+        assert err["payload"]["message"].startswith("Join failed"), err
+        await stranger.send("undo_turn")
+        err = await stranger.expect(lambda m: m.get("type") == "error"
+                                    and "Join failed" not in m["payload"]["message"], "undo refused")
+        assert err["payload"]["message"] == "Not in a game yet. Create or join first.", err
+        await stranger.close()
+
+        await t.ws.send("undo_turn")
+        ev = (await t.ws.expect_event("turn_undone"))["payload"]["event"]
+        assert ev == {"type": "turn_undone", "playerIds": [cur.player_id], "canUndo": False}, ev
+        back = await t.turn_of(cur.player_id)
+        assert back["deckCount"] == game["deckCount"] and back["tableDrawnCard"] is None
+        me = (await cur.ws.expect(lambda m: m.get("type") == "player_private_state"
+                                  and m["payload"]["me"]["drawnCard"] is None, "hand restored"))
+        assert me["payload"]["gameMeta"]["phase"] == "TURN_CHOOSE_SOURCE"
+        assert sum(m.get("type") == "player_private_state" for m in other.ws.inbox) == other_private, \
+            "untouched players get no correction"
+
+        await t.ws.send("undo_turn")
+        err = await t.ws.expect_type("error")
+        assert err["payload"]["message"] == "Nothing to undo"
+        other.ws.assert_no_errors()
+        print("✅ undo_turn from the table: minimal correction; players and failed joiners cannot undo")
+        await t.close()
+
+
+async def main():
+    engine_undo()
+    reshuffle_rolled_back()
+    no_undo_across_rounds()
+    auto_play_is_one_step()
+    await table_undo()
+
+
+asyncio.run(main())
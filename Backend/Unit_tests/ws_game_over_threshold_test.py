@@ -131,6 +131,16 @@ async def main():
     assert game.get("totalScores") is not None
     print("✅ GAME_OVER reached. totalScores:", game.get("totalScores"))
 
+    # History is no longer inlined in public state; fetch it on demand.
+    assert game.get("roundHistoryCount") == 1
+    assert game.get("lastRoundScores") is not None
+    await table.send(json.dumps({"type": "get_round_history", "payload": {"offset": 0, "limit": 10}}))
+    hist = await recv_until_type(table, "round_history")
+    assert hist["payload"]["total"] == 1
+    assert hist["payload"]["items"][0]["roundIndex"] == 1
+    assert hist["payload"]["items"][0]["scores"] == game.get("lastRoundScores")
+    print("✅ round_history page:", hist["payload"])
+
     await p1.close()
     await p2.close()
     await table.close()
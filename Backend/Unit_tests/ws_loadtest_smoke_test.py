@@ -0,0 +1,14 @@
+"""
+Smoke run of the load generator: a few bot tables must finish full games
+without errors against the server on port 8001.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.tools import loadtest  # noqa: E402
+
+rc = loadtest.main(["--tables", "3", "--players", "3", "--think-ms", "0", "--max-error-rate", "0"])
+assert rc == 0, "load test reported stalls, connect failures or errors"
+print("✅ loadtest bots finished 3 full games without errors")
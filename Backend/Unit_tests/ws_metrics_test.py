@@ -0,0 +1,68 @@
+import asyncio
+import json
+import urllib.request
+
+import websockets
+
+URI = "ws://127.0.0.1:8001/ws"
+METRICS_URL = "http://127.0.0.1:8001/metrics"
+
+
+async def recv_until_type(ws, wanted_type: str):
+    while True:
+        msg = json.loads(await asyncio.wait_for(ws.recv(), timeout=3.0))
+        if msg.get("type") == wanted_type:
+            return msg
+
+
+def scrape() -> dict:
+    """Parse the text exposition into {'name{labels}': value}."""
+    with urllib.request.urlopen(METRICS_URL, timeout=3.0) as resp:
+        assert resp.headers["content-type"].startswith("text/plain"), resp.headers["content-type"]
+        body = resp.read().decode()
+    samples = {}
+    for line in body.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        key, value = line.rsplit(" ", 1)
+        samples[key] = float(value)
+    return samples
+
+
+async def main():
+    before = scrape()
+
+    table = await websockets.connect(URI)
+    await table.send(json.dumps({"type": "create_table", "payload": {}}))
+    code = (await recv_until_type(table, "table_created"))["payload"]["code"]
+
+    player = await websockets.connect(URI)
+    await player.send(json.dumps({"type": "join_game", "payload": {"code": code, "name": "P1"}}))
+    await recv_until_type(player, "joined")
+    await recv_until_type(table, "game_public_state")
+    await player.send(json.dumps({"type": "made_up_type", "payload": {}}))
+    await recv_until_type(player, "error")
+
+    after = scrape()
+
+    def delta(key):
+        return after.get(key, 0.0) - before.get(key, 0.0)
+
+    assert delta('skyjo_ws_message_seconds_count{type="create_table"}') >= 1
+    assert delta('skyjo_ws_message_seconds_count{type="join_game"}') >= 1
+    assert delta('skyjo_ws_message_seconds_count{type="other"}') >= 1
+    assert not any("made_up_type" in k for k in after), "unknown types must not become labels"
+    assert delta('skyjo_broadcast_seconds_count{type="game_public_state"}') >= 1
+    assert delta('skyjo_ws_frame_bytes_total{type="game_public_state"}') > 0
+    assert delta('skyjo_engine_seconds_count{method="public_state"}') >= 1
+    assert delta('skyjo_engine_seconds_count{method="private_state"}') >= 1
+    assert after['skyjo_games{phase="LOBBY"}'] >= 1
+    assert after['skyjo_sockets{role="player"}'] >= 1
+    assert after['skyjo_sockets{role="table"}'] >= 1
+    print("✅ /metrics exposes message, broadcast, frame, engine and gauge samples.")
+
+    await player.close()
+    await table.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import websockets
+
+URI = "ws://127.0.0.1:8001/ws"
+
+
+async def recv_any(ws, timeout_s: float = 3.0):
+    return json.loads(await asyncio.wait_for(ws.recv(), timeout=timeout_s))
+
+
+async def recv_until_type(ws, wanted_type: str):
+    while True:
+        msg = await recv_any(ws)
+        if msg.get("type") == wanted_type:
+            return msg
+
+
+async def wait_for_phase(ws, phase: str):
+    while True:
+        msg = await recv_until_type(ws, "game_public_state")
+        if msg["payload"]["game"]["phase"] == phase:
+            return msg
+
+
+async def drain(ws, quiet_s: float = 0.3):
+    """Collect everything that arrives until the socket stays quiet for quiet_s."""
+    msgs = []
+    while True:
+        try:
+            msgs.append(await recv_any(ws, timeout_s=quiet_s))
+        except asyncio.TimeoutError:
+            return msgs
+
+
+async def main():
+    table = await websockets.connect(URI)
+    await table.send(json.dumps({"type": "create_table", "payload": {}}))
+    code = (await recv_until_type(table, "table_created"))["payload"]["code"]
+    print("CODE:", code)
+
+    players = []
+    for name in ("P1", "P2"):
+        ws = await websockets.connect(URI)
+        await ws.send(json.dumps({"type": "join_game", "payload": {"code": code, "name": name}}))
+        token = (await recv_until_type(ws, "joined"))["payload"]["token"]
+        players.append((ws, token))
+
+    for ws, token in players:
+        await ws.send(json.dumps({"type": "set_ready", "payload": {"token": token, "ready": True}}))
+    await wait_for_phase(table, "SETUP_REVEAL")
+
+    for ws, token in players:
+        for idx in (0, 5):
+            await ws.send(json.dumps({"type": "setup_reveal", "payload": {"token": token, "index": idx}}))
+    await wait_for_phase(table, "TURN_CHOOSE_SOURCE")
+    await drain(table)
+
+    # Burst of cosmetic taps: deck -> discard -> deck(reveal) ... ending on deck + reveal.
+    burst = 20
+    for i in range(burst):
+        source = "deck" if i % 2 == 0 else "discard"
+        await table.send(json.dumps({"type": "table_set_selection", "payload": {"source": source}}))
+    await table.send(json.dumps({"type": "table_set_selection", "payload": {"source": "deck"}}))
+    await table.send(json.dumps({"type": "table_set_deck_mode", "payload": {"mode": "reveal"}}))
+
+    msgs = await drain(table)
+    states = [m for m in msgs if m.get("type") == "game_public_state"]
+    errors = [m for m in msgs if m.get("type") == "error"]
+    print("public states after burst:", len(states), "errors:", len(errors))
+
+    assert not errors, errors
+    assert states, "expected at least one coalesced broadcast"
+    assert len(states) < burst // 2, f"burst was not coalesced ({len(states)} broadcasts)"
+    final = states[-1]["payload"]["game"]
+    assert final["tableSelectedSource"] == "deck", final["tableSelectedSource"]
+    assert final["tableDeckMode"] == "reveal", final["tableDeckMode"]
+    print("✅ Table selection burst coalesced into final state.")
+
+    for ws, _ in players:
+        await ws.close()
+    await table.close()
+
+
+asyncio.run(main())
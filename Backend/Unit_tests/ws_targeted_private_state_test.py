@@ -0,0 +1,84 @@
+import asyncio
+import json
+import websockets
+
+URI = "ws://127.0.0.1:8001/ws"
+
+
+async def recv_any(ws, timeout_s: float = 3.0):
+    return json.loads(await asyncio.wait_for(ws.recv(), timeout=timeout_s))
+
+
+async def recv_until_type(ws, wanted_type: str):
+    while True:
+        msg = await recv_any(ws)
+        if msg.get("type") == wanted_type:
+            return msg
+
+
+async def wait_for_phase(ws, phase: str):
+    while True:
+        msg = await recv_until_type(ws, "game_public_state")
+        if msg["payload"]["game"]["phase"] == phase:
+            return msg
+
+
+async def drain(ws, quiet_s: float = 0.3):
+    msgs = []
+    while True:
+        try:
+            msgs.append(await recv_any(ws, timeout_s=quiet_s))
+        except asyncio.TimeoutError:
+            return msgs
+
+
+async def main():
+    table = await websockets.connect(URI)
+    await table.send(json.dumps({"type": "create_table", "payload": {}}))
+    code = (await recv_until_type(table, "table_created"))["payload"]["code"]
+    print("CODE:", code)
+
+    players = {}
+    for name in ("P1", "P2", "P3"):
+        ws = await websockets.connect(URI)
+        await ws.send(json.dumps({"type": "join_game", "payload": {"code": code, "name": name}}))
+        joined = (await recv_until_type(ws, "joined"))["payload"]
+        players[joined["playerId"]] = (ws, joined["token"])
+
+    for ws, token in players.values():
+        await ws.send(json.dumps({"type": "set_ready", "payload": {"token": token, "ready": True}}))
+    await wait_for_phase(table, "SETUP_REVEAL")
+
+    for ws, token in players.values():
+        for idx in (0, 5):
+            await ws.send(json.dumps({"type": "setup_reveal", "payload": {"token": token, "index": idx}}))
+    state = await wait_for_phase(table, "TURN_CHOOSE_SOURCE")
+    for ws, _ in players.values():
+        await drain(ws)
+
+    current_id = state["payload"]["game"]["currentPlayerId"]
+    actor_ws, actor_token = players[current_id]
+    others = [ws for pid, (ws, _) in players.items() if pid != current_id]
+
+    await actor_ws.send(json.dumps({"type": "draw_from_deck", "payload": {"token": actor_token}}))
+    await recv_until_type(actor_ws, "player_private_state")
+    await actor_ws.send(json.dumps({"type": "swap_into_grid", "payload": {"token": actor_token, "index": 1}}))
+
+    mine = await recv_until_type(actor_ws, "player_private_state")
+    assert mine["payload"]["me"]["grid"][1]["isFaceUp"] is True
+
+    for ws in others:
+        msgs = await drain(ws)
+        kinds = [m["type"] for m in msgs]
+        assert "player_private_state" not in kinds, kinds
+        publics = [m for m in msgs if m["type"] == "game_public_state"]
+        assert publics, "bystanders still need the public update"
+        assert publics[-1]["payload"]["game"]["currentPlayerId"] != current_id
+    print("✅ Only the acting player received a private update.")
+
+    for ws, _ in players.values():
+        await ws.close()
+    await table.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+State fingerprint without a server: after every command of random play
+(reshuffles, column removals, undo and snapshot restores included) the
+XOR-maintained engine.state_hash() equals a from-scratch recomputation;
+equal states hash equal, any changed feature changes the hash.
+"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from engine_fixtures import new_game, random_command  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+from Backend.app.game.zobrist import full_hash  # noqa: E402
+
+
+def features(g) -> tuple:
+    """Everything the fingerprint covers."""
+    return (
+        g.phase, g.current_player_idx, g.discard[-1] if g.discard else None, tuple(sorted(g.deck)),
+        tuple(
+            tuple(None if removed else (v, up) for v, up, removed in zip(p.grid_values, p.grid_face_up, p.grid_removed))
+            for p in g.players
+        ),
+    )
+
+
+def matches_scratch_over_random_play():
+    commands = 0
+    seen = {}
+    for seed in range(16):
+        rng = random.Random(seed)
+        engine = new_game(seed, players=2 + seed % 4)
+        while engine.game.phase != Phase.GAME_OVER and commands < 500 * (seed + 1):
+            engine = random_command(engine, rng)
+            commands += 1
+            h = engine.state_hash()
+            assert h == full_hash(engine.game), (seed, commands)
+            assert 0 <= h < 2 ** 64
+            state = features(engine.game)
+            assert seen.setdefault(h, state) == state, "two different states, one fingerprint"
+    print(f"✅ {commands} random commands: incremental hash equals a from-scratch recomputation")
+
+
+def equal_states_hash_equal():
+    rng = random.Random(7)
+    a = new_game(7, players=3)
+    for _ in range(40):
+        a = random_command(a, rng)
+    b = GameEngine.from_snapshot(a.to_snapshot())
+    assert a.state_hash() == b.state_hash()
+
+    # Undo lands on the earlier fingerprint.
+    while a.game.phase != Phase.TURN_CHOOSE_SOURCE:
+        a = random_command(a, rng)
+    before = a.state_hash()
+    a.draw_from_deck(a.game.players[a.game.current_player_idx].id)
+    assert a.state_hash() != before
+    a.undo()
+    assert a.state_hash() == before
+
+    # One changed feature, different fingerprint.
+    p = a.game.players[0]
+    p.grid_face_up[11] = not p.grid_face_up[11]
+    assert full_hash(a.game) != before
+    p.grid_face_up[11] = not p.grid_face_up[11]
+    a.game.deck[0], a.game.deck[-1] = a.game.deck[-1], a.game.deck[0]
+    assert full_hash(a.game) == before, "deck order is not part of the fingerprint, its composition is"
+    print("✅ restore and undo reproduce the fingerprint; a single flipped card changes it")
+
+
+def main():
+    matches_scratch_over_random_play()
+    equal_states_hash_equal()
+
+
+main()
@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import base64
+import fcntl
+import hashlib
+import json
+import marshal
+import os
+import uuid
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .game.engine import GameEngine
+from .game.store import GameStore
+from .logs import get_logger
+
+log = get_logger("cluster")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+# -------------------------
+# Pub/sub transports
+# -------------------------
+class PubSub(abc.ABC):
+    """
+    Minimal channel transport between workers. Messages are JSON-able dicts and
+    are delivered in publish order per (publisher, channel).
+    """
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def unsubscribe(self, channel: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        ...
+
+
+class InMemoryPubSub(PubSub):
+    """
+    In-process transport. Several Cluster instances sharing one InMemoryPubSub
+    behave like workers on one host, which is what the tests use.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues[channel] = queue
+        self._tasks[channel] = asyncio.create_task(_pump(queue, handler))
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._queues.pop(channel, None)
+        task = self._tasks.pop(channel, None)
+        if task is not None:
+            task.cancel()
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        queue = self._queues.get(channel)
+        if queue is None:
+            raise ConnectionError(f"No subscriber for {channel}")
+        # Round-trip through JSON so nothing is shared by reference, like on a wire.
+        queue.put_nowait(json.loads(json.dumps(message)))
+
+    async def stop(self) -> None:
+        for channel in list(self._tasks):
+            await self.unsubscribe(channel)
+
+
+class UnixSocketPubSub(PubSub):
+    """
+    Host-local transport over unix domain sockets: every subscribed channel is a
+    listening socket `<directory>/<channel>.sock`, messages are JSON lines.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._servers: Dict[str, asyncio.AbstractServer] = {}
+        self._clients: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self._writers: Dict[str, asyncio.StreamWriter] = {}
+        self._connect_locks: Dict[str, asyncio.Lock] = {}
+
+    def _path(self, channel: str) -> str:
+        return os.path.join(self.directory, channel.replace(":", "-") + ".sock")
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        private_dir(self.directory)
+        path = self._path(channel)
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a previous run; the shard lock guarantees we own it
+
+        clients = self._clients.setdefault(channel, set())
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            clients.add(writer)
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        await handler(json.loads(line))
+                    except Exception as e:
+                        log.warning("pubsub handler error (ignored): %r", e)
+            finally:
+                clients.discard(writer)
+                writer.close()
+
+        self._servers[channel] = await asyncio.start_unix_server(on_client, path=path)
+
+    async def unsubscribe(self, channel: str) -> None:
+        server = self._servers.pop(channel, None)
+        if server is None:
+            return
+        server.close()
+        for writer in list(self._clients.pop(channel, set())):
+            writer.close()
+            await writer.wait_closed()
+        try:
+            os.unlink(self._path(channel))
+        except FileNotFoundError:
+            pass
+
+    async def _writer(self, channel: str) -> asyncio.StreamWriter:
+        writer = self._writers.get(channel)
+        if writer is not None and not writer.is_closing():
+            return writer
+        lock = self._connect_locks.setdefault(channel, asyncio.Lock())
+        async with lock:
+            writer = self._writers.get(channel)
+            if writer is None or writer.is_closing():
+                try:
+                    _, writer = await asyncio.open_unix_connection(self._path(channel))
+                except (FileNotFoundError, ConnectionRefusedError) as e:
+                    raise ConnectionError(f"No subscriber for {channel}") from e
+                self._writers[channel] = writer
+            return writer
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        data = json.dumps(message, separators=(",", ":")).encode() + b"\n"
+        for attempt in (1, 2):
+            writer = await self._writer(channel)
+            try:
+                writer.write(data)
+                await writer.drain()
+                return
+            except (ConnectionError, OSError):
+                self._writers.pop(channel, None)
+                if attempt == 2:
+                    raise ConnectionError(f"Publish to {channel} failed")
+
+    async def stop(self) -> None:
+        for channel in list(self._servers):
+            await self.unsubscribe(channel)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+async def _pump(queue: asyncio.Queue, handler: Handler) -> None:
+    while True:
+        msg = await queue.get()
+        try:
+            await handler(msg)
+        except Exception as e:
+            log.warning("pubsub handler error (ignored): %r", e)
+
+
+def private_dir(directory: str) -> None:
+    """
+    Create `directory` readable by this user only. Anyone who can connect to a
+    shard socket can inject frames, so refuse a directory someone else owns and
+    tighten a group/world-accessible one.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.stat(directory)
+    if st.st_uid != os.getuid():
+        raise RuntimeError(f"{directory} is owned by another user")
+    if st.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def claim_shard(directory: str, shard_count: int) -> Tuple[int, int]:
+    """
+    Claim the first free shard id on this host by taking an exclusive flock on
+    `<directory>/shard-<i>.lock`. Returns (shard_id, fd); keep the fd open for the
+    lifetime of the process. Lets `uvicorn --workers N` hand out ids 0..N-1.
+    """
+    private_dir(directory)
+    for shard_id in range(shard_count):
+        fd = os.open(os.path.join(directory, f"shard-{shard_id}.lock"), os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            continue
+        return shard_id, fd
+    raise RuntimeError(f"All {shard_count} shards already claimed in {directory}")
+
+
+# -------------------------
+# Remote connections
+# -------------------------
+class RemoteSocket:
+    """
+    Owner-side stand-in for a WebSocket held by another shard. It is registered
+    in the GameStore like a real socket; send_json publishes the frame back to
+    the shard holding the client connection.
+    """
+
+    def __init__(self, cluster: "Cluster", origin: int, conn_id: str):
+        self.cluster = cluster
+        self.origin = origin
+        self.state = SimpleNamespace(code=None, player_id=None, conn_id=conn_id, is_table=False)
+
+    async def send_json(self, data: Any) -> None:
+        try:
+            await self.cluster._publish(self.origin, {
+                "kind": "frame",
+                "conn": self.state.conn_id,
+                "code": self.state.code,
+                "playerId": self.state.player_id,
+                "data": data,
+            })
+        except ConnectionError as e:
+            # Origin shard is gone: surface it like a dead socket so callers unregister us.
+            raise RuntimeError("Remote connection lost") from e
+
+    async def send_text(self, text: str) -> None:
+        # Frames are already encoded by the owner; ship them as-is.
+        try:
+            await self.cluster._publish(self.origin, {
+                "kind": "frame",
+                "conn": self.state.conn_id,
+                "code": self.state.code,
+                "playerId": self.state.player_id,
+                "text": text,
+            })
+        except ConnectionError as e:
+            raise RuntimeError("Remote connection lost") from e
+
+
+def _shard_weight(code: str, shard_id: int) -> bytes:
+    return hashlib.blake2b(f"{code}:{shard_id}".encode(), digest_size=8).digest()
+
+
+# -------------------------
+# Cluster
+# -------------------------
+class Cluster:
+    """
+    Routes games to their owning shard (worker).
+
+    The owner of a game code is chosen by rendezvous hashing over the shards that
+    are not draining, so every worker computes the same owner without
+    coordination and a drain only moves the games of the drained shard.
+    Connections stay on the worker that accepted them: messages for a game owned
+    elsewhere are forwarded to the owner, which runs the normal handler against a
+    RemoteSocket and publishes the resulting frames back.
+
+    With shard_count == 1 everything is handled locally and no transport is used.
+    """
+
+    def __init__(
+        self,
+        store: GameStore,
+        shard_count: int = 1,
+        shard_id: Optional[int] = None,
+        pubsub: Optional[PubSub] = None,
+        lock_dir: Optional[str] = None,
+        drain_on_stop: bool = False,
+    ):
+        self.store = store
+        self.shard_count = max(1, shard_count)
+        self.shard_id = shard_id
+        self.pubsub = pubsub
+        self.lock_dir = lock_dir
+        self.drain_on_stop = drain_on_stop
+        self.draining: Set[int] = set()
+        self._handler: Optional[Callable[[Any, Dict[str, Any]], Awaitable[None]]] = None
+        self._local_conns: Dict[str, Any] = {}
+        self._proxies: Dict[Tuple[int, str], RemoteSocket] = {}
+        self._lock_fd: Optional[int] = None
+        if not self.enabled:
+            self.shard_id = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.shard_count > 1
+
+    def bind_handler(self, handler: Callable[[Any, Dict[str, Any]], Awaitable[None]]) -> None:
+        self._handler = handler
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        if self.pubsub is None:
+            raise RuntimeError("Cluster with several shards needs a PubSub")
+        if self.shard_id is None:
+            if not self.lock_dir:
+                raise RuntimeError("Cluster needs shard_id or lock_dir to claim one")
+            self.shard_id, self._lock_fd = claim_shard(self.lock_dir, self.shard_count)
+        await self.pubsub.start()
+        await self.pubsub.subscribe(self._channel(self.shard_id), self._on_message)
+        # A (re)started shard is live again for everyone.
+        await self._publish_all({"kind": "hello", "shard": self.shard_id})
+
+    async def stop(self) -> None:
+        if not self.enabled:
+            return
+        if self.drain_on_stop and self.store.game_count():
+            await self.drain()
+        if self.pubsub is not None:
+            await self.pubsub.unsubscribe(self._channel(self.shard_id))
+            await self.pubsub.stop()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    # ---------------------------
+    # Ownership
+    # ---------------------------
+    def owner(self, code: str) -> int:
+        if not self.enabled:
+            return 0
+        # Not cached: codes come from clients, and a few hashes are cheap.
+        live = [s for s in range(self.shard_count) if s not in self.draining] or list(range(self.shard_count))
+        return max(live, key=lambda s: _shard_weight(code, s))
+
+    def owns(self, code: str) -> bool:
+        return self.owner(code) == self.shard_id
+
+    def _set_draining(self, shard_id: int, draining: bool) -> None:
+        if draining:
+            self.draining.add(shard_id)
+        else:
+            self.draining.discard(shard_id)
+
+    # ---------------------------
+    # Connections (shard holding the client socket)
+    # ---------------------------
+    def attach(self, ws: Any) -> None:
+        ws.state.conn_id = getattr(ws.state, "conn_id", None) or uuid.uuid4().hex[:12]
+        ws.state.remote_code = None
+        if self.enabled:
+            self._local_conns[ws.state.conn_id] = ws
+
+    async def detach(self, ws: Any) -> None:
+        """Forget a closed client connection, here and on the owning shard."""
+        self._local_conns.pop(ws.state.conn_id, None)
+        if getattr(ws.state, "remote_code", None):
+            await self._release_remote(ws)
+        elif ws.state.code:
+            self.store.unregister_socket(ws.state.code, ws)
+
+    async def _release_remote(self, ws: Any) -> None:
+        await self._publish_quiet(self.owner(ws.state.remote_code), {
+            "kind": "detach", "origin": self.shard_id, "conn": ws.state.conn_id,
+        })
+        ws.state.remote_code = None
+
+    async def route(self, ws: Any, raw: Dict[str, Any]) -> None:
+        """Handle `raw` locally or forward it to the shard owning the game."""
+        if not self.enabled:
+            await self._handler(ws, raw)
+            return
+
+        t = raw.get("type")
+        payload = raw.get("payload") or {}
+        if t in ("join_game", "resume_game", "spectate_game"):
+            code: Optional[str] = str(payload.get("code", "")).strip().upper()
+            target = self.owner(code)
+        elif t == "create_table":
+            code = None
+            target = self.shard_id
+            if self.shard_id in self.draining:
+                # Place new tables on a live shard; the owner picks a code it owns.
+                target = self.owner(ws.state.conn_id)
+        else:
+            code = ws.state.remote_code or ws.state.code
+            target = self.owner(code) if code else self.shard_id
+
+        if target == self.shard_id:
+            if ws.state.remote_code:
+                await self._release_remote(ws)
+            await self._handler(ws, raw)
+            return
+
+        if ws.state.code:
+            # Leaving a locally held game for one owned elsewhere.
+            self.store.unregister_socket(ws.state.code, ws)
+            ws.state.code = None
+        ws.state.remote_code = code or ws.state.remote_code
+        await self._publish(target, {
+            "kind": "cmd", "origin": self.shard_id, "conn": ws.state.conn_id, "code": code, "raw": raw,
+        })
+
+    # ---------------------------
+    # Drain / migration
+    # ---------------------------
+    async def drain(self) -> int:
+        """
+        Hand every resident game to its new owner and stop owning codes.
+        Client sockets held here keep working: they are proxied to the new owner.
+        Returns the number of migrated games.
+        """
+        if not self.enabled:
+            return 0
+        self._set_draining(self.shard_id, True)
+        self.store.wake_all()
+        moved = 0
+        for code in list(self.store.games_by_code):
+            moved += await self._migrate(code)
+        await self._publish_all({"kind": "drain", "shard": self.shard_id})
+        return moved
+
+    async def _hand_back(self) -> int:
+        """Migrate resident games (dormant ones too) that another shard owns again, e.g. after its restart."""
+        moved = 0
+        for code in list(self.store.games_by_code) + list(self.store.dormant_by_code):
+            if not self.owns(code):
+                moved += await self._migrate(code)
+        return moved
+
+    async def _migrate(self, code: str) -> bool:
+        """Send one game and its connections to its owner; False (and kept here) if that shard is gone."""
+        target = self.owner(code)
+        sockets = list(self.store.sockets(code)) + list(self.store.spectators(code))
+        conns = []
+        for s in sockets:
+            origin = s.origin if isinstance(s, RemoteSocket) else self.shard_id
+            conns.append({
+                "origin": origin, "conn": s.state.conn_id, "playerId": s.state.player_id,
+                "spectator": getattr(s.state, "spectator", False), "table": getattr(s.state, "is_table", False),
+            })
+        # Remove before publishing so no command mutates the engine after the snapshot.
+        engine = self.store.remove_game(code)
+        for s in sockets:
+            if isinstance(s, RemoteSocket):
+                self._proxies.pop((s.origin, s.state.conn_id), None)
+            else:
+                s.state.code = None
+                s.state.remote_code = code
+        try:
+            await self._publish(target, {
+                "kind": "migrate",
+                "code": code,
+                "engine": base64.b64encode(marshal.dumps(engine.to_snapshot())).decode("ascii"),
+                "conns": conns,
+            })
+        except ConnectionError:
+            self._restore(engine, sockets)
+            return False
+        return True
+
+    def _restore(self, engine: Any, sockets: List[Any]) -> None:
+        code = engine.game.code
+        self.store.adopt_game(engine)
+        for s in sockets:
+            if isinstance(s, RemoteSocket):
+                self._proxies[(s.origin, s.state.conn_id)] = s
+            else:
+                s.state.code = code
+                s.state.remote_code = None
+            if getattr(s.state, "spectator", False):
+                self.store.add_spectator(code, s)
+                continue
+            self.store.register_socket(code, s)
+            if s.state.player_id:
+                self.store.bind_player(code, s.state.player_id, s)
+
+    # ---------------------------
+    # Transport
+    # ---------------------------
+    def _channel(self, shard_id: int) -> str:
+        return f"shard:{shard_id}"
+
+    async def _publish(self, shard_id: int, message: Dict[str, Any]) -> None:
+        if shard_id == self.shard_id:
+            await self._on_message(json.loads(json.dumps(message)))
+            return
+        await self.pubsub.publish(self._channel(shard_id), message)
+
+    async def _publish_quiet(self, shard_id: int, message: Dict[str, Any]) -> None:
+        try:
+            await self._publish(shard_id, message)
+        except ConnectionError:
+            pass
+
+    async def _publish_all(self, message: Dict[str, Any]) -> None:
+        for s in range(self.shard_count):
+            if s != self.shard_id:
+                await self._publish_quiet(s, message)
+
+    def _proxy(self, origin: int, conn_id: str) -> RemoteSocket:
+        key = (origin, conn_id)
+        proxy = self._proxies.get(key)
+        if proxy is None:
+            proxy = self._proxies[key] = RemoteSocket(self, origin, conn_id)
+        return proxy
+
+    async def _on_message(self, msg: Dict[str, Any]) -> None:
+        kind = msg.get("kind")
+
+        if kind == "cmd":
+            code = msg.get("code")
+            if code and not self.store.has_game(code) and not self.owns(code):
+                # Sent before the sender learned about a drain: pass it on.
+                await self._publish(self.owner(code), msg)
+                return
+            if code is None and msg["raw"].get("type") != "create_table":
+                proxy = self._proxies.get((msg["origin"], msg["conn"]))
+                bound = proxy.state.code if proxy else None
+                if bound and not self.store.has_game(bound) and not self.owns(bound):
+                    await self._publish(self.owner(bound), msg)
+                    return
+            await self._handler(self._proxy(msg["origin"], msg["conn"]), msg["raw"])
+            return
+
+        if kind == "frame":
+            ws = self._local_conns.get(msg["conn"])
+            if ws is None:
+                return
+            if msg.get("code"):
+                ws.state.remote_code = msg["code"]
+            if msg.get("playerId"):
+                ws.state.player_id = msg["playerId"]
+            try:
+                if "text" in msg:
+                    await ws.send_text(msg["text"])
+                else:
+                    await ws.send_json(msg["data"])
+            except Exception:
+                # The endpoint loop notices the disconnect and detaches.
+                pass
+            return
+
+        if kind == "detach":
+            proxy = self._proxies.pop((msg["origin"], msg["conn"]), None)
+            if proxy is not None and proxy.state.code:
+                self.store.unregister_socket(proxy.state.code, proxy)
+            return
+
+        if kind == "migrate":
+            code = msg["code"]
+            engine = GameEngine.from_snapshot(marshal.loads(base64.b64decode(msg["engine"])))
+            self.store.adopt_game(engine)
+            for c in msg["conns"]:
+                if c["origin"] == self.shard_id:
+                    ws = self._local_conns.get(c["conn"])
+                    if ws is None:
+                        continue
+                    ws.state.remote_code = None
+                else:
+                    ws = self._proxy(c["origin"], c["conn"])
+                ws.state.code = code
+                ws.state.player_id = c.get("playerId")
+                ws.state.spectator = c.get("spectator", False)
+                ws.state.is_table = c.get("table", False)
+                if ws.state.spectator:
+                    self.store.add_spectator(code, ws)
+                    continue
+                self.store.register_socket(code, ws)
+                if ws.state.player_id:
+                    self.store.bind_player(code, ws.state.player_id, ws)
+            return
+
+        if kind == "drain":
+            self._set_draining(msg["shard"], True)
+            return
+
+        if kind == "hello":
+            # Games migrated off that shard (or created while it was draining) belong to it again.
+            self._set_draining(msg["shard"], False)
+            await self._hand_back()
+            return
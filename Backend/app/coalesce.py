@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+
+class Coalescer:
+    """
+    Per-game debounce for cosmetic updates.
+
+    The first request for a game opens a window of `window_s` seconds; further
+    requests inside that window are absorbed. When the window closes `flush(code)`
+    runs once and sees whatever state is current at that moment, so a burst of
+    taps produces one broadcast with the final selection.
+    """
+
+    def __init__(self, window_s: float, flush: Callable[[str], Awaitable[None]]):
+        self.window_s = window_s
+        self._flush = flush
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    async def request(self, code: str) -> None:
+        if self.window_s <= 0:
+            await self._flush(code)
+            return
+        if code in self._pending:
+            return
+        self._pending[code] = asyncio.create_task(self._flush_later(code))
+
+    def cancel(self, code: str) -> None:
+        """Drop a pending flush, e.g. because a full broadcast already went out."""
+        task = self._pending.pop(code, None)
+        if task is not None:
+            task.cancel()
+
+    def pending(self, code: str) -> bool:
+        return code in self._pending
+
+    async def _flush_later(self, code: str) -> None:
+        await asyncio.sleep(self.window_s)
+        # Unregister before flushing so a request arriving mid-flush opens a new window.
+        self._pending.pop(code, None)
+        await self._flush(code)
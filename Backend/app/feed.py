@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import secrets
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+# Latest public state per game, encoded once and served to every read-only
+# consumer: spectator sockets, `GET /games/{code}/state` and the SSE stream of
+# `GET /games/{code}/events`. _broadcast already encodes the game_public_state
+# frame for the players; the feed keeps that exact text, slices the payload
+# out of it for HTTP and builds the SSE event from it once, so a hundred
+# scoreboards polling or streaming cost no extra json.dumps.
+#
+# Every distinct payload gets the next version; re-broadcasting an identical
+# state keeps the version, so an ETag only changes when the view does. The
+# random epoch keeps ETags from a previous process from matching after a
+# restart resets the counters.
+
+_FRAME_PREFIX = '{"type":"game_public_state","payload":'
+
+
+@dataclass(frozen=True)
+class PublicFrame:
+    version: int
+    tag: str    # "<epoch>.<version>": ETag value and SSE event id
+    text: str   # WebSocket frame, as sent to the players
+    body: str   # payload JSON only (HTTP)
+    sse: bytes  # complete SSE event
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.tag}"'
+
+
+class PublicFeed:
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self._frames: Dict[str, PublicFrame] = {}
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+
+    def publish(self, code: str, text: str) -> PublicFrame:
+        """Store an encoded game_public_state frame; wakes the streams if it changed."""
+        if not (text.startswith(_FRAME_PREFIX) and text.endswith("}")):
+            raise ValueError("Not an encoded game_public_state frame")
+        body = text[len(_FRAME_PREFIX):-1]
+        current = self._frames.get(code)
+        if current is not None and current.body == body:
+            return current
+        version = current.version + 1 if current is not None else 1
+        tag = f"{self.epoch}.{version}"
+        frame = PublicFrame(
+            version=version,
+            tag=tag,
+            text=text,
+            body=body,
+            sse=f"id: {tag}\nevent: game_public_state\ndata: {body}\n\n".encode(),
+        )
+        self._frames[code] = frame
+        for wake in self._waiters.get(code, ()):
+            wake.set()
+        return frame
+
+    def latest(self, code: str) -> Optional[PublicFrame]:
+        return self._frames.get(code)
+
+    def forget(self, code: str) -> None:
+        """Drop a game that is gone; its streams see no frame and end."""
+        self._frames.pop(code, None)
+        for wake in self._waiters.get(code, ()):
+            wake.set()
+
+    # -------------------------
+    # Streams (SSE)
+    # -------------------------
+    def subscribe(self, code: str) -> asyncio.Event:
+        """An event that is set whenever the game's frame changes."""
+        wake = asyncio.Event()
+        self._waiters.setdefault(code, set()).add(wake)
+        return wake
+
+    def unsubscribe(self, code: str, wake: asyncio.Event) -> None:
+        waiters = self._waiters.get(code)
+        if waiters is not None:
+            waiters.discard(wake)
+            if not waiters:
+                del self._waiters[code]
+
+    def streams(self, code: Optional[str] = None) -> int:
+        if code is not None:
+            return len(self._waiters.get(code, ()))
+        return sum(len(w) for w in self._waiters.values())
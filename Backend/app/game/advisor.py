@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .rules import RuleSet
+
+# Move hints (request_hint): the expected change of the player's grid score
+# for each legal action, from the distribution of the unseen cards. Lower is
+# better; a face-down card counts as the mean unseen value.
+#
+# Scoring and column removal do not care where a column sits or where a card
+# sits inside its column, so a grid is reduced to sorted columns of sorted
+# cells before evaluating: mirrored or shuffled grids share one cache entry,
+# and `order` maps the canonical positions back to grid indices. With row
+# removal the rows must stay lined up, so only whole columns are sorted.
+#
+# evaluate() is pure (plain tuples and the immutable RuleSet in, plain data
+# out) so it can run in a worker thread; the cache itself is only touched on
+# the event loop.
+
+HIDDEN = 1000   # face-down card in a canonical grid (face-up cards are their value)
+REMOVED = 1001
+
+Column = Tuple[int, ...]
+HintKey = Tuple[str, Optional[int], Tuple[Column, ...], Tuple[int, ...], RuleSet]
+
+
+def canonical_grid(
+    values: Sequence[int], face_up: Sequence[bool], removed: Sequence[bool], rules: RuleSet,
+) -> Tuple[Tuple[Column, ...], List[int]]:
+    """Sorted columns (of sorted cells unless rows can be removed), and the grid index of each position."""
+    cols = []
+    for idxs in rules.column_indices:
+        cells = [(REMOVED if removed[i] else values[i] if face_up[i] else HIDDEN, i) for i in idxs]
+        cols.append(cells if rules.remove_rows else sorted(cells))
+    cols.sort(key=lambda cells: [c for c, _ in cells])
+    grid = tuple(tuple(c for c, _ in cells) for cells in cols)
+    order = [i for cells in cols for _, i in cells]
+    return grid, order
+
+
+def _mean(values: Sequence[int], counts: Sequence[int]) -> float:
+    total = sum(counts)
+    return sum(v * c for v, c in zip(values, counts)) / total if total else 0.0
+
+
+def _placed(grid, c: int, r: int, value: int, mean: float, rules: RuleSet) -> float:
+    """Score change once `value` lies face up at column c, row r (a completed line scores 0)."""
+    old = grid[c][r]
+    gone = set()
+    if rules.remove_columns and all(x == value for i, x in enumerate(grid[c]) if i != r):
+        gone.update((c, i) for i in range(len(grid[c])))
+    if rules.remove_rows and all(col[r] == value for i, col in enumerate(grid) if i != c):
+        gone.update((i, r) for i in range(len(grid)))
+    return value - (mean if old == HIDDEN else old) - value * len(gone)
+
+
+def _resolve(grid, card: int, counts: Sequence[int], rules: RuleSet):
+    """Expected score change per canonical position: (swap card in, discard it and reveal)."""
+    values = rules.card_values
+    total = sum(counts)
+    mean = _mean(values, counts)
+    swaps: List[Optional[float]] = []
+    reveals: List[Optional[float]] = []
+    for c, col in enumerate(grid):
+        for r, cell in enumerate(col):
+            if cell == REMOVED:
+                swaps.append(None)
+                reveals.append(None)
+                continue
+            swaps.append(_placed(grid, c, r, card, mean, rules))
+            if cell == HIDDEN and total:
+                after = sum(n * _placed(grid, c, r, v, mean, rules) for v, n in zip(values, counts) if n)
+                reveals.append(after / total)
+            else:
+                reveals.append(None)
+    return swaps, reveals
+
+
+def _best(values: Sequence[Optional[float]], floor: Optional[float] = None) -> Optional[float]:
+    options = [x for x in values if x is not None]
+    if floor is not None:
+        options.append(floor)
+    return min(options) if options else None
+
+
+def evaluate(key: HintKey) -> Dict[str, Any]:
+    """Expected score changes for a hint key (see GameEngine.hint_key)."""
+    kind, card, grid, counts, rules = key
+    if kind == "resolve":
+        swaps, reveals = _resolve(grid, card, counts, rules)
+        return {"swap": swaps, "reveal": reveals}
+
+    # Choosing a source: the discard top has to be swapped in; a deck card
+    # can be any unseen value, after which the best of swap / reveal /
+    # plain discard (0) is played.
+    take = _best(_resolve(grid, card, counts, rules)[0]) if card is not None else None
+    total = sum(counts)
+    draw = None
+    if total:
+        draw = 0.0
+        for i, n in enumerate(counts):
+            if not n:
+                continue
+            rest = counts[:i] + (n - 1,) + counts[i + 1:]
+            swaps, reveals = _resolve(grid, rules.card_values[i], rest, rules)
+            draw += n * _best(swaps + reveals, floor=0.0)
+        draw /= total
+    return {"take": take, "draw": draw}
+
+
+def hint_payload(key: HintKey, result: Dict[str, Any], order: Sequence[int]) -> dict:
+    """The `hint` message for one player: canonical positions mapped back to grid indices."""
+    kind, card = key[0], key[1]
+    actions: List[dict] = []
+    if kind == "resolve":
+        for name, deltas in (("swap_into_grid", result["swap"]), ("discard_drawn_and_reveal", result["reveal"])):
+            actions.extend(sorted(
+                ({"action": name, "index": order[pos], "expectedDelta": round(d, 3)}
+                 for pos, d in enumerate(deltas) if d is not None),
+                key=lambda a: a["index"],
+            ))
+        actions.append({"action": "discard_drawn", "expectedDelta": 0.0})
+    else:
+        if result["take"] is not None:
+            actions.append({"action": "take_discard", "card": card, "expectedDelta": round(result["take"], 3)})
+        if result["draw"] is not None:
+            actions.append({"action": "draw_from_deck", "expectedDelta": round(result["draw"], 3)})
+    best = min(actions, key=lambda a: a["expectedDelta"]) if actions else None
+    return {
+        "phase": "TURN_RESOLVE" if kind == "resolve" else "TURN_CHOOSE_SOURCE",
+        "card": card,
+        "actions": actions,
+        "best": best,
+    }
+
+
+class HintCache:
+    """Bounded LRU of evaluate() results by hint key (maxsize 0 = no caching)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[HintKey, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: HintKey) -> Optional[Dict[str, Any]]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: HintKey, result: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models import Game
+
+# The classic Skyjo deck: 15 values, 5 copies each (rule variants may differ,
+# see rules.py). Card values index a plain list (value - lowest value), so
+# every counter update is O(1).
+CARD_VALUES = (-2, -1, 0) + tuple(range(1, 13))
+COPIES_PER_VALUE = 5
+
+
+def build_deck(rng: random.Random, cards: Optional[Sequence[int]] = None) -> List[int]:
+    """A shuffled deck of `cards` (default: the classic deck)."""
+    if cards is None:
+        deck = [v for v in CARD_VALUES for _ in range(COPIES_PER_VALUE)]
+    else:
+        deck = list(cards)
+    rng.shuffle(deck)
+    return deck
+
+
+class UnseenCards:
+    """
+    Live per-value counts of the cards nobody can see: the draw pile plus every
+    face-down card on the grids. Hidden information in Skyjo is symmetric (the
+    owner does not know a face-down card either, a drawn card is on the table),
+    so these counts are every player's perspective at once.
+
+    The engine reports each card that becomes visible (drawn from the deck,
+    revealed, swapped out face-down) and each one that goes back into hiding
+    (a reshuffle of the discard pile); recount() rebuilds from scratch after
+    a deal, an undo or a restore.
+    """
+
+    __slots__ = ("values", "_low", "_counts", "total")
+
+    def __init__(self, values: Sequence[int] = CARD_VALUES):
+        self.values = tuple(values)
+        self._low = min(self.values)
+        self._counts = [0] * (max(self.values) - self._low + 1)
+        self.total = 0
+
+    def seen(self, value: int) -> None:
+        self._counts[value - self._low] -= 1
+        self.total -= 1
+
+    def hidden(self, value: int) -> None:
+        self._counts[value - self._low] += 1
+        self.total += 1
+
+    def recount(self, game: Game) -> None:
+        low = self._low
+        counts = [0] * len(self._counts)
+        for v in game.deck:
+            counts[v - low] += 1
+        for p in game.players:
+            for v, up, removed in zip(p.grid_values, p.grid_face_up, p.grid_removed):
+                if not up and not removed:
+                    counts[v - low] += 1
+        self._counts = counts
+        self.total = sum(counts)
+
+    def count(self, value: int) -> int:
+        if value not in self.values:
+            raise ValueError(f"Not a card value: {value}")
+        return self._counts[value - self._low]
+
+    def as_tuple(self) -> Tuple[int, ...]:
+        """Counts in `values` order."""
+        low = self._low
+        return tuple(self._counts[v - low] for v in self.values)
+
+    def as_dict(self) -> Dict[int, int]:
+        low = self._low
+        return {v: self._counts[v - low] for v in self.values}
@@ -2,10 +2,21 @@ from __future__ import annotations
 
 import random
 import secrets
-import uuid
-from typing import Dict, Optional, Tuple, List
-
+from collections import deque
+from dataclasses import MISSING, fields
+from typing import Any, Dict, Optional, Set, Tuple, List
+
+from ..metrics import timed
+from .advisor import HintKey, canonical_grid
+from .deck import UnseenCards, build_deck
+from .frozen import SCALARS, FrozenGame, FrozenPlayer, freeze_mapping
 from .models import Game, Player, Phase
+from .rules import CLASSIC, RuleSet
+from .zobrist import StateHash
+
+ROUND_HISTORY_PAGE_MAX = 50
+UNDO_CHECKPOINTS_MAX = 8
+SNAPSHOT_VERSION = 1
 
 
 def _make_join_code(n: int = 4) -> str:
@@ -13,24 +24,101 @@ def _make_join_code(n: int = 4) -> str:
     return "".join(secrets.choice(alphabet) for _ in range(n))
 
 
-def _build_skyjo_deck() -> List[int]:
-    values = [-2, -1, 0] + list(range(1, 13))
-    deck: List[int] = []
-    for v in values:
-        deck.extend([v] * 5)
-    random.shuffle(deck)
-    return deck
+def _dataclass_from_dict(cls, values: Dict[str, Any]):
+    """Rebuild a dataclass without running __init__; fields missing from `values` get their default."""
+    obj = cls.__new__(cls)
+    for f in fields(cls):
+        if f.name in values:
+            setattr(obj, f.name, values[f.name])
+        elif f.default is not MISSING:
+            setattr(obj, f.name, f.default)
+        elif f.default_factory is not MISSING:
+            setattr(obj, f.name, f.default_factory())
+    return obj
+
+
+def _new_seed() -> int:
+    return secrets.randbits(64)
 
 
 class GameEngine:
-    def __init__(self, code: Optional[str] = None):
+    def __init__(self, code: Optional[str] = None, seed: Optional[int] = None, rules: RuleSet = CLASSIC):
+        # Every random choice of this game (ids, shuffles) comes from one seeded
+        # RNG, so the seed plus the client messages reproduce the game exactly.
+        # Tokens stay on `secrets`: they are credentials.
+        self.seed = _new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.rules = rules
         self.game = Game(
-            id=uuid.uuid4().hex,
+            id=f"{self.rng.getrandbits(128):032x}",
             code=code or _make_join_code(),
+            grid_size=rules.grid_size,
+            setup_reveals_per_player=rules.setup_reveals,
         )
         self.tokens: Dict[str, str] = {}
         self._events: List[dict] = []
+        self._dirty_players: Set[str] = set()
         self._setup_done_counter = 0
+        # (winner_id, rankedTotals); rebuilt only when total_scores change
+        self._ranking: Optional[Tuple[Optional[str], List[dict]]] = None
+        # Copy-on-write snapshots, see commit(). Players and the discard pile are
+        # marked when they change; the deck list is only ever popped in place
+        # (a shuffle assigns a new list), so its identity says whether to share.
+        self.frozen: Optional[FrozenGame] = None
+        self._changed_players: Set[str] = set()
+        self._discard_changed = False
+        self._frozen_deck: Optional[List[int]] = None
+        self.commit()
+        # Undo: [snapshot, rng state or None] taken before each turn command.
+        # Not part of to_snapshot(): a restart or migration starts a fresh stack.
+        self._undo: deque = deque(maxlen=UNDO_CHECKPOINTS_MAX)
+        # Per-value counts of the unseen cards, kept up to date move by move.
+        self.unseen = UnseenCards(rules.card_values)
+        # 64-bit state fingerprint, XOR-updated on every change (see zobrist.py).
+        self.zobrist = StateHash()
+        self.zobrist.rehash(self.game)
+
+    # ---------------------------
+    # Snapshot (warm restart / shard migration)
+    # ---------------------------
+    def to_snapshot(self) -> Dict[str, Any]:
+        """
+        Plain-data copy of everything needed to continue the game (incl. tokens),
+        made only of builtins so it can be marshal-ed. Derived caches are not kept.
+        The returned lists are shared with the live engine: serialize right away.
+        """
+        g = dict(self.game.__dict__)
+        g["phase"] = self.game.phase.value
+        g["players"] = [dict(p.__dict__) for p in self.game.players]
+        return {
+            "v": SNAPSHOT_VERSION,
+            "game": g,
+            "tokens": self.tokens,
+            "setupDoneCounter": self._setup_done_counter,
+            "seed": self.seed,
+            "rng": self.rng.getstate(),
+            "rules": None if self.rules == CLASSIC else self.rules.to_dict(),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snap: Dict[str, Any]) -> "GameEngine":
+        if snap.get("v") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {snap.get('v')}")
+        g = dict(snap["game"])
+        g["phase"] = Phase(g["phase"])
+        g["players"] = [_dataclass_from_dict(Player, p) for p in g["players"]]
+
+        engine = cls(code=g["code"], seed=snap.get("seed"), rules=RuleSet.from_payload(snap.get("rules")))
+        if "rng" in snap:
+            engine.rng.setstate(snap["rng"])
+        engine.game = _dataclass_from_dict(Game, g)
+        engine.tokens = dict(snap["tokens"])
+        engine._setup_done_counter = snap.get("setupDoneCounter", 0)
+        engine.frozen = None
+        engine.commit()
+        engine.unseen.recount(engine.game)
+        engine.zobrist.rehash(engine.game)
+        return engine
 
     # ---------------------------
     # Event buffer
@@ -40,14 +128,119 @@ class GameEngine:
         self._events.clear()
         return ev
 
+    # ---------------------------
+    # Dirty tracking (private views)
+    # ---------------------------
+    def consume_dirty_players(self) -> List[str]:
+        """
+        Player ids whose private_state changed since the last call, in seat order.
+        Shared meta (phase, currentPlayerId, ...) does not mark anyone dirty:
+        it travels through game_public_state.
+        """
+        if not self._dirty_players:
+            return []
+        dirty = [p.id for p in self.game.players if p.id in self._dirty_players]
+        self._dirty_players.clear()
+        return dirty
+
+    def mark_player_dirty(self, player_id: str) -> None:
+        self._dirty_players.add(player_id)
+        self._changed_players.add(player_id)
+
+    def _mark_all_dirty(self) -> None:
+        self._dirty_players.update(p.id for p in self.game.players)
+        self._changed_players.update(p.id for p in self.game.players)
+
+    # ---------------------------
+    # Copy-on-write snapshots (concurrent readers)
+    # ---------------------------
+    def commit(self) -> FrozenGame:
+        """
+        Publish the current state as `self.frozen` (call after each command).
+        Cost is O(changed parts): untouched players, the deck tuple, the discard
+        pile and the score maps are shared with the previous snapshot, which is
+        returned unchanged when the command changed nothing.
+        """
+        g = self.game
+        prev = self.frozen
+
+        old = prev.players if prev is not None else ()
+        players = tuple(
+            old[i] if i < len(old) and old[i].id == p.id and p.id not in self._changed_players
+            else FrozenPlayer.of(p)
+            for i, p in enumerate(g.players)
+        )
+        self._changed_players.clear()
+
+        if prev is not None and g.deck is self._frozen_deck and len(g.deck) <= prev.deck_count:
+            deck_cards = prev.deck_cards
+        else:
+            deck_cards = tuple(g.deck)
+            self._frozen_deck = g.deck
+
+        if prev is not None and not self._discard_changed:
+            discard = prev.discard
+        else:
+            discard = tuple(g.discard)
+        self._discard_changed = False
+
+        if prev is not None and g.round_scores == prev.round_scores:
+            round_scores = prev.round_scores
+        else:
+            round_scores = freeze_mapping(g.round_scores)
+        if prev is not None and g.total_scores == prev.total_scores:
+            total_scores = prev.total_scores
+        else:
+            total_scores = freeze_mapping(g.total_scores)
+        # round_history is append-only: extend the previous tuple.
+        done = len(prev.round_history) if prev is not None else 0
+        if done == len(g.round_history):
+            round_history = prev.round_history if prev is not None else ()
+        elif done < len(g.round_history):
+            round_history = (prev.round_history if prev is not None else ()) + tuple(
+                freeze_mapping(h) for h in g.round_history[done:]
+            )
+        else:
+            round_history = tuple(freeze_mapping(h) for h in g.round_history)
+
+        scalars = {name: getattr(g, name) for name in SCALARS}
+        if (
+            prev is not None
+            and len(players) == len(old)
+            and all(a is b for a, b in zip(players, old))
+            and deck_cards is prev.deck_cards
+            and len(g.deck) == prev.deck_count
+            and discard is prev.discard
+            and round_scores is prev.round_scores
+            and total_scores is prev.total_scores
+            and round_history is prev.round_history
+            and all(getattr(prev, name) == value for name, value in scalars.items())
+        ):
+            return prev
+
+        self.frozen = FrozenGame(
+            version=prev.version + 1 if prev is not None else 0,
+            players=players,
+            deck_cards=deck_cards,
+            deck_count=len(g.deck),
+            discard=discard,
+            round_scores=round_scores,
+            total_scores=total_scores,
+            round_history=round_history,
+            **scalars,
+        )
+        return self.frozen
+
     # ---------------------------
     # Lobby
     # ---------------------------
     def add_player(self, name: str) -> Tuple[str, str]:
         if self.game.phase != Phase.LOBBY:
             raise ValueError("Cannot join: game already started")
+        if not self._deck_deals(len(self.game.players) + 1):
+            raise ValueError("Cannot join: not enough cards for another player")
 
-        player_id = self.game.new_player_id()
+        player_id = self.game.new_player_id(self.rng)
         token = secrets.token_urlsafe(16)
 
         p = Player(id=player_id, name=name)
@@ -55,10 +248,15 @@ class GameEngine:
         self.tokens[token] = player_id
         return player_id, token
 
+    def _deck_deals(self, players: int) -> bool:
+        # Every grid, the first discard and one card to draw (as RuleSet checks for two players).
+        return players * self.game.grid_size + 2 <= len(self.rules.deck_cards)
+
     def set_ready(self, player_id: str, ready: bool = True) -> None:
         if self.game.phase != Phase.LOBBY:
             raise ValueError("Cannot change ready state after game start")
         self._get_player(player_id).ready = ready
+        self._changed_players.add(player_id)
 
     def start_game_if_ready(self) -> bool:
         g = self.game
@@ -68,11 +266,15 @@ class GameEngine:
             return False
         if not all(p.ready for p in g.players):
             return False
+        if not self._deck_deals(len(g.players)):
+            raise ValueError(f"Not enough cards for {len(g.players)} players")
 
         # init totals if first round
         if not g.total_scores:
             g.total_scores = {p.id: 0 for p in g.players}
+            self._ranking = None
 
+        self._undo.clear()
         # reset round meta
         g.final_round = False
         g.finisher_id = None
@@ -81,8 +283,10 @@ class GameEngine:
         g.finisher_doubled = False
         g.round_histrory = []
 
-        g.deck = _build_skyjo_deck()
+        g.deck = build_deck(self.rng, self.rules.deck_cards)
         g.discard = []
+        self._discard_changed = True
+        self.zobrist.rehash(g)  # the deal draws from the new deck; rehashed again once dealt
         g.table_drawn_card = None
         self._reset_table_selection()
         self._setup_done_counter = 0
@@ -98,9 +302,12 @@ class GameEngine:
             p.setup_done_order = None
 
         g.discard.append(self._draw())
+        self.unseen.recount(g)
         g.table_drawn_card = None
         g.current_player_idx = 0
         g.phase = Phase.SETUP_REVEAL
+        self.zobrist.rehash(g)
+        self._mark_all_dirty()
         return True
 
     # ---------------------------
@@ -122,8 +329,9 @@ class GameEngine:
         if p.setup_reveals_done >= g.setup_reveals_per_player:
             raise ValueError("You already revealed enough cards")
 
-        p.grid_face_up[index] = True
+        self._reveal(p, index)
         p.setup_reveals_done += 1
+        self.mark_player_dirty(p.id)
         p.setup_revealed_indices.append(index)
         if p.setup_reveals_done == g.setup_reveals_per_player and p.setup_done_order is None:
             self._setup_done_counter += 1
@@ -132,8 +340,8 @@ class GameEngine:
         removed_events = self._check_and_remove_columns(p)
 
         if self._all_setup_done():
-            g.current_player_idx = self._select_starting_player_after_setup()
-            g.phase = Phase.TURN_CHOOSE_SOURCE
+            self._set_turn(self._select_starting_player_after_setup())
+            self._set_phase(Phase.TURN_CHOOSE_SOURCE)
             self._reset_table_selection()
 
         return removed_events
@@ -173,6 +381,7 @@ class GameEngine:
     # ---------------------------
     # State
     # ---------------------------
+    @timed("public_state")
     def public_state(self) -> dict:
         g = self.game
 
@@ -220,7 +429,10 @@ class GameEngine:
                 "finisherDoubled": g.finisher_doubled if g.phase == Phase.ROUND_OVER else None,
 
                 "roundIndex": g.round_index,
-                "roundHistory": g.round_history,
+                "rules": self.rules.public,
+                # Full history is fetched on demand (get_round_history); only a rolling summary here.
+                "roundHistoryCount": len(g.round_history),
+                "lastRoundScores": g.round_history[-1] if g.round_history else None,
 
                 # ✅ altijd totals meegeven
                 "totalScores": g.total_scores,
@@ -242,6 +454,69 @@ class GameEngine:
             }
         }
 
+    def round_history_page(self, offset: int = 0, limit: int = 20) -> dict:
+        """One page of finished-round scores, oldest first. roundIndex is 1-based."""
+        history = self.game.round_history
+        offset = max(0, int(offset))
+        limit = max(1, min(int(limit), ROUND_HISTORY_PAGE_MAX))
+        items = [
+            {"roundIndex": i + 1, "scores": history[i]}
+            for i in range(offset, min(offset + limit, len(history)))
+        ]
+        return {"total": len(history), "offset": offset, "items": items}
+
+    def card_counts(self) -> dict:
+        """Cards nobody can see yet (deck + face-down grid cards), per value."""
+        return {
+            "unseen": {str(v): n for v, n in self.unseen.as_dict().items()},
+            "unseenTotal": self.unseen.total,
+            "deckCount": len(self.game.deck),
+        }
+
+    def hint_key(self, player_id: str) -> Tuple[HintKey, List[int]]:
+        """
+        What a move hint for the current player depends on, canonicalized for
+        the hint cache (see advisor.py), plus the grid index of each canonical
+        position.
+        """
+        g = self.game
+        if g.phase not in (Phase.TURN_CHOOSE_SOURCE, Phase.TURN_RESOLVE):
+            raise ValueError("Hints are only available during a turn")
+        self._require_current_player(player_id)
+        p = self._get_player(player_id)
+        grid, order = canonical_grid(p.grid_values, p.grid_face_up, p.grid_removed, self.rules)
+        if g.phase == Phase.TURN_RESOLVE:
+            key = ("resolve", p.drawn_card, grid, self.unseen.as_tuple(), self.rules)
+        else:
+            key = ("choose", g.discard[-1] if g.discard else None, grid, self.unseen.as_tuple(), self.rules)
+        return key, order
+
+    def state_hash(self) -> int:
+        """
+        64-bit fingerprint of grids, discard top, deck composition, phase and
+        current player; equal states hash equal. Covers face-down cards, so it
+        is for server-side use (caches, dedup, replay checks), not for clients.
+        """
+        return self.zobrist.value
+
+    def round_reveal(self) -> dict:
+        """Every player's grid with all values, once the round is over (for spectators)."""
+        g = self.game
+        if g.phase not in (Phase.ROUND_OVER, Phase.GAME_OVER):
+            raise ValueError("Round is not over")
+        return {
+            "roundIndex": g.round_index,
+            "scores": g.round_scores,
+            "grids": [
+                {
+                    "playerId": p.id,
+                    "values": [None if p.grid_removed[i] else p.grid_values[i] for i in range(g.grid_size)],
+                }
+                for p in g.players
+            ],
+        }
+
+    @timed("private_state")
     def private_state(self, player_id: str) -> dict:
         g = self.game
         p = self._get_player(player_id)
@@ -346,9 +621,12 @@ class GameEngine:
         if p.drawn_card is not None:
             raise ValueError("You already have a drawn card")
 
+        self._checkpoint()
         p.drawn_card = self._draw()
+        self.unseen.seen(p.drawn_card)
+        self.mark_player_dirty(p.id)
         self.game.table_drawn_card = p.drawn_card
-        self.game.phase = Phase.TURN_RESOLVE
+        self._set_phase(Phase.TURN_RESOLVE)
         return p.drawn_card
 
     def take_discard(self, player_id: str) -> int:
@@ -363,9 +641,11 @@ class GameEngine:
         if p.drawn_card is not None:
             raise ValueError("You already have a drawn card")
 
-        p.drawn_card = self.game.discard.pop()
+        self._checkpoint()
+        p.drawn_card = self._pop_discard()
+        self.mark_player_dirty(p.id)
         self.game.table_drawn_card = None
-        self.game.phase = Phase.TURN_RESOLVE
+        self._set_phase(Phase.TURN_RESOLVE)
         return p.drawn_card
 
     def discard_drawn(self, player_id: str) -> None:
@@ -377,9 +657,11 @@ class GameEngine:
         if p.drawn_card is None:
             raise ValueError("No drawn card to discard")
 
-        self.game.discard.append(p.drawn_card)
+        self._checkpoint()
+        self._push_discard(p.drawn_card)
         self.game.table_drawn_card = None
         p.drawn_card = None
+        self.mark_player_dirty(p.id)
 
         self._after_turn_completed(actor_id=player_id)
         if self.game.phase != Phase.ROUND_OVER:
@@ -402,10 +684,12 @@ class GameEngine:
         if p.grid_face_up[index]:
             raise ValueError("Card is already face up")
 
-        g.discard.append(p.drawn_card)
+        self._checkpoint()
+        self._push_discard(p.drawn_card)
         g.table_drawn_card = None
         p.drawn_card = None
-        p.grid_face_up[index] = True
+        self._reveal(p, index)
+        self.mark_player_dirty(p.id)
 
         removed_events = self._check_and_remove_columns(p)
 
@@ -430,13 +714,20 @@ class GameEngine:
         if p.grid_removed[index]:
             raise ValueError("Cannot place into a removed slot")
 
+        self._checkpoint()
         old = p.grid_values[index]
+        if not p.grid_face_up[index]:
+            self.unseen.seen(old)
+        seat = self._seat(p)
+        self.zobrist.cell(seat, index, p)
         p.grid_values[index] = p.drawn_card
+        p.grid_face_up[index] = True
+        self.zobrist.cell(seat, index, p)
         g.table_drawn_card = None
         p.drawn_card = None
 
-        p.grid_face_up[index] = True
-        g.discard.append(old)
+        self._push_discard(old)
+        self.mark_player_dirty(p.id)
 
         removed_events = self._check_and_remove_columns(p)
 
@@ -446,6 +737,142 @@ class GameEngine:
 
         return removed_events
 
+    # ---------------------------
+    # Undo (host: misclick)
+    # ---------------------------
+    # A checkpoint is the published FrozenGame from before a turn command, i.e.
+    # a reference: taking one costs nothing beyond the commit that runs anyway.
+    # The RNG state (625 words) is only copied by the checkpointed command that
+    # actually shuffles (a reshuffle in _draw); None means "unchanged until the
+    # next checkpoint". Commands that use the RNG otherwise (start, new round)
+    # clear the stack, so an undo never crosses a round boundary.
+    def _checkpoint(self) -> None:
+        self._undo.append([self.commit(), None])
+
+    def _save_rng_for_undo(self) -> None:
+        if self._undo and self._undo[-1][1] is None:
+            self._undo[-1][1] = self.rng.getstate()
+
+    def _join_last_checkpoints(self) -> None:
+        """Make the last two checkpointed commands one undo step (keeps the earlier state)."""
+        _, rng_state = self._undo.pop()
+        if self._undo[-1][1] is None:
+            self._undo[-1][1] = rng_state
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def undo(self) -> List[str]:
+        """
+        Roll back the last turn command. Only players whose snapshot differs
+        from the checkpoint are rebuilt (and marked dirty); returns their ids.
+        """
+        if not self._undo:
+            raise ValueError("Nothing to undo")
+        current = self.commit()
+        target, rng_state = self._undo.pop()
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
+        g = self.game
+        for name in SCALARS:
+            setattr(g, name, getattr(target, name))
+        live = {p.id: p for p in g.players}
+        was = {p.id: p for p in current.players}
+        changed: List[str] = []
+        players: List[Player] = []
+        for fp in target.players:
+            p = live.get(fp.id)
+            if p is None or was.get(fp.id) is not fp:
+                p = Player(id=fp.id, name=fp.name)
+                p.ready = fp.ready
+                p.has_finished_round = fp.has_finished_round
+                p.grid_values = list(fp.grid_values)
+                p.grid_face_up = list(fp.grid_face_up)
+                p.grid_removed = list(fp.grid_removed)
+                p.drawn_card = fp.drawn_card
+                p.setup_reveals_done = fp.setup_reveals_done
+                p.setup_revealed_indices = list(fp.setup_revealed_indices)
+                p.setup_done_order = fp.setup_done_order
+                changed.append(fp.id)
+            players.append(p)
+        g.players = players
+
+        if target.deck_cards is not current.deck_cards or target.deck_count != current.deck_count:
+            g.deck = list(target.deck)
+        if target.discard is not current.discard:
+            g.discard = list(target.discard)
+            self._discard_changed = True
+        if target.round_scores is not current.round_scores:
+            g.round_scores = dict(target.round_scores)
+        if target.total_scores is not current.total_scores:
+            g.total_scores = dict(target.total_scores)
+            self._ranking = None
+        if target.round_history is not current.round_history:
+            g.round_history = [dict(h) for h in target.round_history]
+
+        for pid in changed:
+            self.mark_player_dirty(pid)
+        self.unseen.recount(g)
+        self.zobrist.rehash(g)
+        return changed
+
+    # ---------------------------
+    # Turn timeout (AFK fallback)
+    # ---------------------------
+    def auto_play(self) -> List[dict]:
+        """
+        Play the neutral fallback for whoever the current phase is waiting on:
+        in SETUP_REVEAL every unfinished player reveals their first face-down
+        cards; otherwise the current player draws from the deck (unless they
+        already hold a card), discards it and reveals their first face-down
+        card. Returns one entry per player acted for (empty in other phases).
+        """
+        g = self.game
+        acted: List[dict] = []
+
+        if g.phase == Phase.SETUP_REVEAL:
+            for p in g.players:
+                indices: List[int] = []
+                removed: List[dict] = []
+                while g.phase == Phase.SETUP_REVEAL and p.setup_reveals_done < g.setup_reveals_per_player:
+                    index = self._first_face_down(p)
+                    if index is None:
+                        break
+                    removed.extend(self.reveal_setup_card(p.id, index))
+                    indices.append(index)
+                if indices:
+                    acted.append({"playerId": p.id, "phase": "SETUP_REVEAL", "action": "setup_reveal",
+                                  "indices": indices, "removed": removed})
+            return acted
+
+        if g.phase in (Phase.TURN_CHOOSE_SOURCE, Phase.TURN_RESOLVE):
+            phase = g.phase.value
+            p = self._current_player()
+            drew = p.drawn_card is None
+            if drew:
+                self.draw_from_deck(p.id)
+            index = self._first_face_down(p)
+            if index is None:
+                self.discard_drawn(p.id)
+                removed = []
+                action = "discard"
+            else:
+                removed = self.discard_drawn_and_reveal(p.id, index)
+                action = "discard_and_reveal"
+            if drew:
+                # One automatic move: a host undo takes back the draw too.
+                self._join_last_checkpoints()
+            acted.append({"playerId": p.id, "phase": phase, "action": action,
+                          "indices": [] if index is None else [index], "removed": removed})
+        return acted
+
+    def _first_face_down(self, p: Player) -> Optional[int]:
+        for i in range(self.game.grid_size):
+            if not p.grid_face_up[i] and not p.grid_removed[i]:
+                return i
+        return None
+
     # ---------------------------
     # Final round + scoring
     # ---------------------------
@@ -490,7 +917,7 @@ class GameEngine:
         if g.finisher_id and g.finisher_id in scores:
             finisher_score = scores[g.finisher_id]
             min_score = min(scores.values())
-            if finisher_score > min_score:
+            if self.rules.finisher_doubling and finisher_score > min_score:
                 scores[g.finisher_id] = finisher_score * 2
                 finisher_doubled = True
 
@@ -500,7 +927,9 @@ class GameEngine:
         g.round_history.append(scores)
         g.table_drawn_card = None
         self._reset_table_selection()
-        g.phase = Phase.ROUND_OVER
+        self._set_phase(Phase.ROUND_OVER)
+        # ROUND_OVER reveals every grid in private_state
+        self._mark_all_dirty()
 
         self._events.append({
             "type": "round_ended",
@@ -531,14 +960,16 @@ class GameEngine:
         p.setup_done_order = None
         p.has_finished_round = False
 
-    def _game_over_threshold(self) -> int:
-        return 100
-
     def _compute_winner_and_ranking(self) -> tuple[str | None, list[dict]]:
         """
         Winner = laagste totalScore (klassiek Skyjo: laagste wint zodra iemand >= threshold).
         Returns: (winner_id, rankedTotals)
+
+        Cached until total_scores change, so GAME_OVER state calls don't re-sort.
         """
+        if self._ranking is not None:
+            return self._ranking
+
         g = self.game
         totals = g.total_scores or {}
         if not totals:
@@ -547,23 +978,26 @@ class GameEngine:
         ranked = sorted(totals.items(), key=lambda kv: (kv[1], kv[0]))
         ranked_totals = [{"playerId": pid, "total": score} for pid, score in ranked]
         winner_id = ranked[0][0] if ranked else None
-        return winner_id, ranked_totals
+        self._ranking = (winner_id, ranked_totals)
+        return self._ranking
 
     def start_new_round(self, requester_player_id: str) -> None:
         g = self.game
         if g.phase != Phase.ROUND_OVER:
             raise ValueError("Cannot start new round: round not over")
+        self._undo.clear()
 
         # add last round to totals
         if not g.total_scores:
             g.total_scores = {p.id: 0 for p in g.players}
         for pid, s in g.round_scores.items():
             g.total_scores[pid] = g.total_scores.get(pid, 0) + int(s)
+        self._ranking = None
 
         # ✅ GAME OVER check (Optie A)
-        threshold = self._game_over_threshold()
+        threshold = self.rules.game_over_threshold
         if any(score >= threshold for score in g.total_scores.values()):
-            g.phase = Phase.GAME_OVER
+            self._set_phase(Phase.GAME_OVER)
             g.table_drawn_card = None
             self._reset_table_selection()
             winner_id, ranked_totals = self._compute_winner_and_ranking()
@@ -572,8 +1006,9 @@ class GameEngine:
                 "type": "game_over",
                 "threshold": threshold,
                 "winnerId": winner_id,
-                "rankedTotals": ranked_totals,
-                "totalScores": g.total_scores,
+                # Copies: the ranking is cached, and events outlive this call.
+                "rankedTotals": [dict(r) for r in ranked_totals],
+                "totalScores": dict(g.total_scores),
             })
             return
 
@@ -586,8 +1021,10 @@ class GameEngine:
         g.finisher_doubled = False
 
         # new deck/discard
-        g.deck = _build_skyjo_deck()
+        g.deck = build_deck(self.rng, self.rules.deck_cards)
         g.discard = []
+        self._discard_changed = True
+        self.zobrist.rehash(g)  # the deal draws from the new deck; rehashed again once dealt
         g.table_drawn_card = None
         self._reset_table_selection()
         self._setup_done_counter = 0
@@ -596,6 +1033,7 @@ class GameEngine:
             self._reset_player_for_new_round(p)
 
         g.discard.append(self._draw())
+        self.unseen.recount(g)
 
         # starting player = last finisher, else 0
         if g.last_round_finisher_id:
@@ -605,6 +1043,8 @@ class GameEngine:
             g.current_player_idx = 0
 
         g.phase = Phase.SETUP_REVEAL
+        self.zobrist.rehash(g)
+        self._mark_all_dirty()
 
         self._events.append({
             "type": "new_round_started",
@@ -615,26 +1055,36 @@ class GameEngine:
 
 
     # ---------------------------
-    # Column removal
+    # Column removal (and rows, if the rule set says so)
     # ---------------------------
-    def _column_indices(self) -> List[List[int]]:
-        return [[0, 4, 8], [1, 5, 9], [2, 6, 10], [3, 7, 11]]
-
+    @timed("_check_and_remove_columns")
     def _check_and_remove_columns(self, player: Player) -> List[dict]:
-        removed_events: List[dict] = []
-        for col, idxs in enumerate(self._column_indices()):
+        done = []
+        for kind, n, idxs in self.rules.lines:
             if any(player.grid_removed[i] for i in idxs):
                 continue
             if not all(player.grid_face_up[i] for i in idxs):
                 continue
 
             v0 = player.grid_values[idxs[0]]
-            if player.grid_values[idxs[1]] == v0 and player.grid_values[idxs[2]] == v0:
-                for i in idxs:
-                    player.grid_removed[i] = True
-                    player.grid_face_up[i] = False
-                    self.game.discard.append(player.grid_values[i])
-                removed_events.append({"col": col, "value": v0, "indices": idxs})
+            if all(player.grid_values[i] == v0 for i in idxs[1:]):
+                done.append((kind, n, idxs, v0))
+
+        removed_events: List[dict] = []
+        if not done:
+            return removed_events
+        # A row and a column completed together share a card: collect first, then remove.
+        seat = self._seat(player)
+        for kind, n, idxs, v0 in done:
+            for i in idxs:
+                if player.grid_removed[i]:
+                    continue
+                self.zobrist.cell(seat, i, player)
+                player.grid_removed[i] = True
+                player.grid_face_up[i] = False
+                self.zobrist.cell(seat, i, player)
+                self._push_discard(player.grid_values[i])
+            removed_events.append({kind: n, "value": v0, "indices": list(idxs)})
         return removed_events
 
     # ---------------------------
@@ -662,8 +1112,8 @@ class GameEngine:
             raise ValueError("Not your turn")
 
     def _advance_turn(self) -> None:
-        self.game.current_player_idx = (self.game.current_player_idx + 1) % len(self.game.players)
-        self.game.phase = Phase.TURN_CHOOSE_SOURCE
+        self._set_turn((self.game.current_player_idx + 1) % len(self.game.players))
+        self._set_phase(Phase.TURN_CHOOSE_SOURCE)
         self._reset_table_selection()
 
     def _get_player(self, player_id: str) -> Player:
@@ -672,6 +1122,38 @@ class GameEngine:
                 return p
         raise ValueError("Player not found")
 
+    def _seat(self, p: Player) -> int:
+        return self.game.players.index(p)
+
+    # State changes that also move the fingerprint (and the unseen counts).
+    def _set_phase(self, phase: Phase) -> None:
+        self.zobrist.phase(self.game.phase, phase)
+        self.game.phase = phase
+
+    def _set_turn(self, idx: int) -> None:
+        self.zobrist.turn(self.game.current_player_idx, idx)
+        self.game.current_player_idx = idx
+
+    def _reveal(self, p: Player, index: int) -> None:
+        seat = self._seat(p)
+        self.zobrist.cell(seat, index, p)
+        p.grid_face_up[index] = True
+        self.zobrist.cell(seat, index, p)
+        self.unseen.seen(p.grid_values[index])
+
+    def _push_discard(self, card: int) -> None:
+        discard = self.game.discard
+        self.zobrist.discard_top(discard[-1] if discard else None, card)
+        discard.append(card)
+        self._discard_changed = True
+
+    def _pop_discard(self) -> int:
+        discard = self.game.discard
+        card = discard.pop()
+        self.zobrist.discard_top(card, discard[-1] if discard else None)
+        self._discard_changed = True
+        return card
+
     def _draw(self) -> int:
         """
         Draw one card from deck. If deck empty, reshuffle discard except top.
@@ -679,9 +1161,16 @@ class GameEngine:
         if not self.game.deck:
             if len(self.game.discard) <= 1:
                 raise ValueError("No cards left to draw")
+            self._save_rng_for_undo()
             top = self.game.discard.pop()
             self.game.deck = self.game.discard
             self.game.discard = [top]
-            random.shuffle(self.game.deck)
-
-        return self.game.deck.pop()
+            self._discard_changed = True
+            self.rng.shuffle(self.game.deck)
+            for v in self.game.deck:
+                self.unseen.hidden(v)
+                self.zobrist.deck_in(v)
+
+        card = self.game.deck.pop()
+        self.zobrist.deck_out(card)
+        return card
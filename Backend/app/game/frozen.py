@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from .models import Phase
+
+# Immutable, copy-on-write views of a Game, published by GameEngine.commit()
+# after every command. The engine keeps mutating its Game/Player objects in
+# place on the event loop; readers elsewhere (the metrics scrape thread,
+# persistence, analytics) take `engine.frozen` once and get a state that never
+# changes under them, without locks on the mutation path.
+#
+# A commit only rebuilds what changed: players the command touched get a new
+# FrozenPlayer, everyone else is the previous object; the same goes for the
+# discard pile and the score mappings. The deck only shrinks between shuffles,
+# so every snapshot of one shuffle shares a single tuple and keeps a count.
+
+
+@dataclass(frozen=True)
+class FrozenPlayer:
+    id: str
+    name: str
+    ready: bool
+    has_finished_round: bool
+    grid_values: Tuple[int, ...]
+    grid_face_up: Tuple[bool, ...]
+    grid_removed: Tuple[bool, ...]
+    drawn_card: Optional[int]
+    setup_reveals_done: int
+    setup_revealed_indices: Tuple[int, ...]
+    setup_done_order: Optional[int]
+
+    @classmethod
+    def of(cls, p) -> "FrozenPlayer":
+        return cls(
+            id=p.id,
+            name=p.name,
+            ready=p.ready,
+            has_finished_round=p.has_finished_round,
+            grid_values=tuple(p.grid_values),
+            grid_face_up=tuple(p.grid_face_up),
+            grid_removed=tuple(p.grid_removed),
+            drawn_card=p.drawn_card,
+            setup_reveals_done=p.setup_reveals_done,
+            setup_revealed_indices=tuple(p.setup_revealed_indices),
+            setup_done_order=p.setup_done_order,
+        )
+
+
+@dataclass(frozen=True)
+class FrozenGame:
+    version: int  # +1 per commit that changed anything
+    id: str
+    code: str
+    phase: Phase
+    players: Tuple[FrozenPlayer, ...]
+    deck_cards: Tuple[int, ...]  # shared by every snapshot since the last shuffle
+    deck_count: int
+    discard: Tuple[int, ...]
+    table_drawn_card: Optional[int]
+    table_selected_source: Optional[str]
+    table_deck_mode: str
+    current_player_idx: int
+    grid_size: int
+    setup_reveals_per_player: int
+    final_round: bool
+    finisher_id: Optional[str]
+    last_turns_remaining: int
+    round_scores: Mapping[str, int]
+    finisher_doubled: bool
+    round_index: int
+    total_scores: Mapping[str, int]
+    last_round_finisher_id: Optional[str]
+    round_history: Tuple[Mapping[str, int], ...]
+
+    @property
+    def deck(self) -> Tuple[int, ...]:
+        """The draw pile, top card last (copies; use deck_count for the size)."""
+        return self.deck_cards[:self.deck_count]
+
+    @property
+    def current_player_id(self) -> Optional[str]:
+        if not self.players or self.phase == Phase.LOBBY:
+            return None
+        return self.players[self.current_player_idx].id
+
+    def player(self, player_id: str) -> FrozenPlayer:
+        for p in self.players:
+            if p.id == player_id:
+                return p
+        raise ValueError("Player not found")
+
+
+# Plain fields copied as-is on every commit (cheap; compared to detect no-ops).
+SCALARS = (
+    "id", "code", "phase", "table_drawn_card", "table_selected_source", "table_deck_mode",
+    "current_player_idx", "grid_size", "setup_reveals_per_player", "final_round", "finisher_id",
+    "last_turns_remaining", "finisher_doubled", "round_index", "last_round_finisher_id",
+)
+
+
+def freeze_mapping(d) -> Mapping[str, int]:
+    return MappingProxyType(dict(d))
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+import random
 from typing import List, Optional, Dict
-import uuid
 
 
 class Phase(str, Enum):
@@ -64,5 +64,5 @@ class Game:
     last_round_finisher_id: Optional[str] = None
     round_history: List[Dict[str, int]] = field(default_factory=list)
 
-    def new_player_id(self) -> str:
-        return uuid.uuid4().hex[:12]
+    def new_player_id(self, rng: random.Random) -> str:
+        return f"{rng.getrandbits(48):012x}"
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from .deck import CARD_VALUES, COPIES_PER_VALUE
+
+# Rule variants, chosen per game at create_table. A RuleSet is immutable and
+# builds every table the engine needs once (grid lines that can be removed,
+# the flat deck, the card values, the public description), so the engine
+# reads attributes on the hot path and never branches on a variant name.
+
+CLASSIC_DECK: Tuple[Tuple[int, int], ...] = tuple((v, COPIES_PER_VALUE) for v in CARD_VALUES)
+
+# Rules come from clients: bound what a create_table may make the server build.
+MAX_GRID_SIDE = 6
+MAX_DECK_CARDS = 500
+
+# create_table payload key -> RuleSet field
+_PAYLOAD_FIELDS = {
+    "name": "name",
+    "gameOverThreshold": "game_over_threshold",
+    "deck": "deck",
+    "rows": "rows",
+    "cols": "cols",
+    "setupReveals": "setup_reveals",
+    "removeColumns": "remove_columns",
+    "removeRows": "remove_rows",
+    "finisherDoubling": "finisher_doubling",
+}
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    name: str = "classic"
+    game_over_threshold: int = 100
+    deck: Tuple[Tuple[int, int], ...] = CLASSIC_DECK  # (value, copies)
+    rows: int = 3
+    cols: int = 4
+    setup_reveals: int = 2
+    remove_columns: bool = True  # a face-up column of equal values goes to the discard pile
+    remove_rows: bool = False    # same for a face-up row
+    finisher_doubling: bool = True  # finisher without the lowest round score scores double
+
+    # Derived tables (not compared or hashed: they follow from the fields).
+    grid_size: int = field(init=False, compare=False, repr=False)
+    column_indices: Tuple[Tuple[int, ...], ...] = field(init=False, compare=False, repr=False)
+    lines: Tuple[Tuple[str, int, Tuple[int, ...]], ...] = field(init=False, compare=False, repr=False)
+    card_values: Tuple[int, ...] = field(init=False, compare=False, repr=False)
+    deck_cards: Tuple[int, ...] = field(init=False, compare=False, repr=False)
+    public: Dict[str, Any] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.rows < 1 or self.cols < 1:
+            raise ValueError("Grid needs at least one row and one column")
+        if self.rows > MAX_GRID_SIDE or self.cols > MAX_GRID_SIDE:
+            raise ValueError(f"Grid can have at most {MAX_GRID_SIDE} rows and {MAX_GRID_SIDE} columns")
+        if self.remove_columns and self.rows < 2:
+            raise ValueError("Column removal needs at least two rows")
+        if self.remove_rows and self.cols < 2:
+            raise ValueError("Row removal needs at least two columns")
+        if self.game_over_threshold < 1:
+            raise ValueError("gameOverThreshold must be positive")
+        values = [v for v, _ in self.deck]
+        if len(set(values)) != len(values) or any(n < 0 for _, n in self.deck):
+            raise ValueError("Deck needs distinct values with non-negative copies")
+        if any(abs(v) > 999 for v in values):
+            raise ValueError("Card values must be between -999 and 999")
+        grid_size = self.rows * self.cols
+        # At least one: SETUP_REVEAL ends once every player has revealed this many.
+        if not 1 <= self.setup_reveals <= grid_size:
+            raise ValueError("setupReveals must be between 1 and the grid size")
+        deck_size = sum(n for _, n in self.deck)
+        if deck_size > MAX_DECK_CARDS:
+            raise ValueError(f"Deck can have at most {MAX_DECK_CARDS} cards")
+        # Two full grids, the first discard and one card to draw.
+        if deck_size < 2 * grid_size + 2:
+            raise ValueError("Deck too small for two players")
+        deck_cards = tuple(v for v, n in self.deck for _ in range(n))
+
+        columns = tuple(tuple(c + self.cols * r for r in range(self.rows)) for c in range(self.cols))
+        rows = tuple(tuple(r * self.cols + c for c in range(self.cols)) for r in range(self.rows))
+        lines: List[Tuple[str, int, Tuple[int, ...]]] = []
+        if self.remove_columns:
+            lines.extend(("col", c, idxs) for c, idxs in enumerate(columns))
+        if self.remove_rows:
+            lines.extend(("row", r, idxs) for r, idxs in enumerate(rows))
+
+        derived = {
+            "grid_size": grid_size,
+            "column_indices": columns,
+            "lines": tuple(lines),
+            "card_values": tuple(sorted(v for v, n in self.deck if n)),
+            "deck_cards": deck_cards,
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "public", self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form (create_table payload keys), for snapshots and public state."""
+        out: Dict[str, Any] = {}
+        for key, name in _PAYLOAD_FIELDS.items():
+            value = getattr(self, name)
+            out[key] = [list(pair) for pair in value] if name == "deck" else value
+        return out
+
+    @classmethod
+    def from_payload(cls, raw: Any) -> "RuleSet":
+        """
+        None or a preset name, or an object: optional "preset" plus any
+        to_dict() keys overriding it. Raises ValueError on anything else.
+        """
+        if raw is None:
+            return CLASSIC
+        if isinstance(raw, str):
+            return _preset(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("rules must be a preset name or an object")
+        base = _preset(str(raw.get("preset", "classic")))
+        overrides: Dict[str, Any] = {}
+        for key, value in raw.items():
+            if key == "preset":
+                continue
+            name = _PAYLOAD_FIELDS.get(key)
+            if name is None:
+                raise ValueError(f"Unknown rule: {key}")
+            overrides[name] = _coerce(key, name, value)
+        if overrides and "name" not in overrides:
+            overrides["name"] = "custom"
+        return cls(**{f.name: getattr(base, f.name) for f in fields(cls) if f.init} | overrides)
+
+
+def _coerce(key: str, name: str, value: Any) -> Any:
+    default = getattr(CLASSIC, name)
+    if name == "deck":
+        if isinstance(value, dict):
+            value = list(value.items())
+        try:
+            return tuple((int(v), int(n)) for v, n in value)
+        except (TypeError, ValueError):
+            raise ValueError("deck must be a list of [value, copies] pairs") from None
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{key} must be true or false")
+        return value
+    if isinstance(default, int):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{key} must be an integer")
+        return value
+    return str(value)[:24]
+
+
+CLASSIC = RuleSet()
+
+RULESETS: Dict[str, RuleSet] = {
+    "classic": CLASSIC,
+    "quick": RuleSet(name="quick", game_over_threshold=50),
+    "rows_and_columns": RuleSet(name="rows_and_columns", remove_rows=True),
+    "no_doubling": RuleSet(name="no_doubling", finisher_doubling=False),
+}
+
+
+def _preset(name: str) -> RuleSet:
+    rules: Optional[RuleSet] = RULESETS.get(name)
+    if rules is None:
+        raise ValueError(f"Unknown rule set: {name}")
+    return rules
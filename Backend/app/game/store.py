@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import marshal
 from dataclasses import dataclass, field
-from typing import Dict, Set
+from typing import Callable, Dict, Optional, Set
 from fastapi import WebSocket
 
-from .engine import GameEngine
+from .engine import GameEngine, _make_join_code, _new_seed
+from .rules import CLASSIC, RuleSet
 
 
 @dataclass
@@ -12,22 +14,109 @@ class GameStore:
     """Stores active games and their associated WebSocket connections."""
     games_by_code: Dict[str, GameEngine] = field(default_factory=dict)
     sockets_by_code: Dict[str, Set[WebSocket]] = field(default_factory=dict)
+    # code -> player_id -> sockets bound to that player (subset of sockets_by_code)
+    player_sockets_by_code: Dict[str, Dict[str, Set[WebSocket]]] = field(default_factory=dict)
+    # code -> read-only spectator sockets. Deliberately not in sockets_by_code:
+    # player broadcasts never iterate them (see ws._flush_spectators).
+    spectators_by_code: Dict[str, Set[WebSocket]] = field(default_factory=dict)
+    # Restored but not yet touched games: code -> marshal-ed GameEngine.to_snapshot().
+    # Decoded lazily on first access so a warm restart costs one file read.
+    dormant_by_code: Dict[str, bytes] = field(default_factory=dict)
+    # Source of per-game RNG seeds; tests pass a seeded one for reproducible decks.
+    seeds: Callable[[], int] = _new_seed
 
-    def create_game(self) -> GameEngine:
-        engine = GameEngine()
+    def create_game(
+        self,
+        accept_code: Optional[Callable[[str], bool]] = None,
+        code: Optional[str] = None,
+        seed: Optional[int] = None,
+        rules: RuleSet = CLASSIC,
+    ) -> GameEngine:
+        """
+        Create a game under a fresh join code. `accept_code` can restrict which
+        codes are acceptable (e.g. only codes owned by this shard). `code` and
+        `seed` pin both, to re-create a recorded game.
+        """
+        while code is None:
+            code = _make_join_code()
+            if self.has_game(code) or (accept_code is not None and not accept_code(code)):
+                code = None
+        engine = GameEngine(code=code, seed=self.seeds() if seed is None else seed, rules=rules)
         self.games_by_code[engine.game.code] = engine
         self.sockets_by_code.setdefault(engine.game.code, set())
         return engine
 
+    def adopt_game(self, engine: GameEngine) -> None:
+        """Take ownership of an engine created elsewhere (shard migration, restore)."""
+        self.games_by_code[engine.game.code] = engine
+        self.sockets_by_code.setdefault(engine.game.code, set())
+
+    def remove_game(self, code: str) -> Optional[GameEngine]:
+        if code in self.dormant_by_code:
+            self._wake(code)
+        self.sockets_by_code.pop(code, None)
+        self.player_sockets_by_code.pop(code, None)
+        self.spectators_by_code.pop(code, None)
+        return self.games_by_code.pop(code, None)
+
     def get_game(self, code: str) -> GameEngine:
-        if code not in self.games_by_code:
-            raise ValueError("Game not found")
-        return self.games_by_code[code]
+        engine = self.games_by_code.get(code)
+        if engine is not None:
+            return engine
+        if code in self.dormant_by_code:
+            return self._wake(code)
+        raise ValueError("Game not found")
+
+    def has_game(self, code: str) -> bool:
+        return code in self.games_by_code or code in self.dormant_by_code
+
+    def game_count(self) -> int:
+        return len(self.games_by_code) + len(self.dormant_by_code)
+
+    def add_dormant(self, blobs: Dict[str, bytes]) -> None:
+        for code, blob in blobs.items():
+            if code not in self.games_by_code:
+                self.dormant_by_code[code] = blob
+
+    def wake_all(self) -> None:
+        for code in list(self.dormant_by_code):
+            self._wake(code)
+
+    def _wake(self, code: str) -> GameEngine:
+        engine = GameEngine.from_snapshot(marshal.loads(self.dormant_by_code.pop(code)))
+        self.adopt_game(engine)
+        return engine
 
     def register_socket(self, code: str, ws: WebSocket) -> None:
         self.sockets_by_code.setdefault(code, set()).add(ws)
 
+    def bind_player(self, code: str, player_id: str, ws: WebSocket) -> None:
+        self.player_sockets_by_code.setdefault(code, {}).setdefault(player_id, set()).add(ws)
+
+    def player_sockets(self, code: str, player_id: str) -> Set[WebSocket]:
+        return self.player_sockets_by_code.get(code, {}).get(player_id, set())
+
+    def add_spectator(self, code: str, ws: WebSocket) -> None:
+        self.spectators_by_code.setdefault(code, set()).add(ws)
+
+    def spectators(self, code: str) -> Set[WebSocket]:
+        return self.spectators_by_code.get(code, set())
+
     def unregister_socket(self, code: str, ws: WebSocket) -> None:
+        watchers = self.spectators_by_code.get(code)
+        if watchers is not None and ws in watchers:
+            watchers.discard(ws)
+            if not watchers:
+                self.spectators_by_code.pop(code, None)
+            return
+        player_id = getattr(ws.state, "player_id", None)
+        by_player = self.player_sockets_by_code.get(code)
+        if by_player is not None and player_id in by_player:
+            by_player[player_id].discard(ws)
+            if not by_player[player_id]:
+                by_player.pop(player_id, None)
+            if not by_player:
+                self.player_sockets_by_code.pop(code, None)
         if code in self.sockets_by_code:
             self.sockets_by_code[code].discard(ws)
             if not self.sockets_by_code[code]:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+from typing import Dict, Optional
+
+from .models import Game, Phase, Player
+
+# Zobrist-style fingerprint of a game: a 64-bit XOR of one random key per
+# feature that is present: every grid cell (seat, index, value, face up /
+# removed), the discard top, the number of deck cards of each value, the phase
+# and the current seat. Changing a feature XORs its old key out and its new key
+# in, so the engine keeps the fingerprint current in O(1) per mutation; equal
+# states have equal fingerprints no matter how they were reached. A value
+# missing from the deck has no key.
+#
+# Keys are derived from a fixed seed with blake2b (memoized), so
+# fingerprints agree across processes and restarts (replays, shards). The
+# fingerprint covers face-down cards: keep it server-side, a client that knows
+# the rest of the state could search the few hidden values that match it.
+
+_KEY_SEED = b"skyjo-zobrist-1"
+
+
+@functools.lru_cache(maxsize=None)
+def zkey(*parts) -> int:
+    return int.from_bytes(hashlib.blake2b(repr(parts).encode(), digest_size=8, key=_KEY_SEED).digest(), "little")
+
+
+def cell_key(seat: int, index: int, p: Player) -> int:
+    if p.grid_removed[index]:
+        return zkey("cell", seat, index, None, False)
+    return zkey("cell", seat, index, p.grid_values[index], p.grid_face_up[index])
+
+
+def full_hash(game: Game) -> int:
+    """The fingerprint computed from scratch."""
+    h = zkey("phase", game.phase.value) ^ zkey("turn", game.current_player_idx)
+    h ^= zkey("top", game.discard[-1] if game.discard else None)
+    for seat, p in enumerate(game.players):
+        for i in range(len(p.grid_values)):
+            h ^= cell_key(seat, i, p)
+    for v, n in _deck_counts(game).items():
+        h ^= zkey("deck", v, n)
+    return h
+
+
+def _deck_counts(game: Game) -> Dict[int, int]:
+    counts: Dict[int, int] = {}
+    for v in game.deck:
+        counts[v] = counts.get(v, 0) + 1
+    return counts
+
+
+class StateHash:
+    """The running fingerprint; the engine reports every change (see module comment)."""
+
+    __slots__ = ("value", "_deck")
+
+    def __init__(self):
+        self.value = 0
+        self._deck: Dict[int, int] = {}
+
+    def rehash(self, game: Game) -> None:
+        """Start over from the current state (deal, undo, restore)."""
+        self.value = full_hash(game)
+        self._deck = _deck_counts(game)
+
+    def cell(self, seat: int, index: int, p: Player) -> None:
+        """XOR the cell's current state in or out: call before and after changing it."""
+        self.value ^= cell_key(seat, index, p)
+
+    def deck_out(self, card: int) -> None:
+        n = self._deck[card]
+        self.value ^= zkey("deck", card, n)
+        if n == 1:
+            del self._deck[card]
+        else:
+            self.value ^= zkey("deck", card, n - 1)
+            self._deck[card] = n - 1
+
+    def deck_in(self, card: int) -> None:
+        n = self._deck.get(card, 0)
+        if n:
+            self.value ^= zkey("deck", card, n)
+        self.value ^= zkey("deck", card, n + 1)
+        self._deck[card] = n + 1
+
+    def discard_top(self, old: Optional[int], new: Optional[int]) -> None:
+        if old != new:
+            self.value ^= zkey("top", old) ^ zkey("top", new)
+
+    def phase(self, old: Phase, new: Phase) -> None:
+        if old != new:
+            self.value ^= zkey("phase", old.value) ^ zkey("phase", new.value)
+
+    def turn(self, old: int, new: int) -> None:
+        if old != new:
+            self.value ^= zkey("turn", old) ^ zkey("turn", new)
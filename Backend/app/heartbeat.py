@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Application-level heartbeats. A phone that leaves wifi or goes to sleep does
+# not close its WebSocket; without a FIN the server keeps the socket (and keeps
+# broadcasting every state to it) until TCP gives up, minutes later. One shared
+# task pings every tracked connection each interval, reaps the ones that have
+# been silent for longer than the timeout and measures the round trip of every
+# answered ping.
+#
+#   server -> {"type": "ping", "payload": {"id": n}}
+#   client -> {"type": "pong", "payload": {"id": n}}
+#
+# Any inbound message counts as a sign of life, so busy players are never
+# reaped; the pong only adds the RTT sample.
+
+# Application close code (4000-4999 range) for a reaped connection.
+CLOSE_HEARTBEAT_TIMEOUT = 4408
+
+
+class Heartbeat:
+    """
+    Pings all tracked connections every `interval_s` and hands every
+    connection silent for more than `timeout_s` to `reap`. 0 disables.
+    `after_sweep` runs once per interval, after the pings went out.
+    """
+
+    # A ping that cannot be written within this many seconds counts as lost.
+    SEND_TIMEOUT_S = 5.0
+
+    def __init__(
+        self,
+        interval_s: float,
+        timeout_s: float,
+        ping: Callable[[Any, int], Awaitable[None]],
+        reap: Callable[[Any], Awaitable[None]],
+        after_sweep: Optional[Callable[[], Awaitable[None]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.ping = ping
+        self.reap = reap
+        self.after_sweep = after_sweep
+        self.clock = clock
+        self.conns: Dict[str, Any] = {}
+        self._next_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_s > 0
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.sweep()
+
+    # -------------------------
+    # Connections (websocket_endpoint)
+    # -------------------------
+    def track(self, ws: Any) -> None:
+        ws.state.last_seen = self.clock()
+        ws.state.rtt_ms = None
+        ws.state.ping_id = None
+        ws.state.ping_at = 0.0
+        self.conns[ws.state.conn_id] = ws
+
+    def untrack(self, ws: Any) -> None:
+        self.conns.pop(ws.state.conn_id, None)
+
+    def seen(self, ws: Any) -> None:
+        ws.state.last_seen = self.clock()
+
+    def pong(self, ws: Any, payload: Dict[str, Any]) -> Optional[float]:
+        """RTT in ms for an answer to the outstanding ping, else None (late or bogus)."""
+        if ws.state.ping_id is None or payload.get("id") != ws.state.ping_id:
+            return None
+        ws.state.ping_id = None
+        ws.state.rtt_ms = round((self.clock() - ws.state.ping_at) * 1000, 1)
+        return ws.state.rtt_ms
+
+    # -------------------------
+    # Sweep
+    # -------------------------
+    async def sweep(self) -> int:
+        """One heartbeat round; returns the number of reaped connections."""
+        now = self.clock()
+        dead = []
+        alive = []
+        for ws in list(self.conns.values()):
+            if self.timeout_s and now - ws.state.last_seen > self.timeout_s:
+                dead.append(ws)
+            else:
+                alive.append(ws)
+        for ws in dead:
+            self.untrack(ws)
+            await self.reap(ws)
+
+        for ws in alive:
+            # An unanswered ping is simply superseded; its pong no longer counts.
+            self._next_id += 1
+            ws.state.ping_id = self._next_id
+            ws.state.ping_at = now
+        if alive:
+            await asyncio.gather(*(self._ping(ws) for ws in alive))
+
+        if self.after_sweep is not None:
+            await self.after_sweep()
+        return len(dead)
+
+    async def _ping(self, ws: Any) -> None:
+        try:
+            await asyncio.wait_for(self.ping(ws, ws.state.ping_id), self.SEND_TIMEOUT_S)
+        except Exception:
+            # A dead socket stays silent and is reaped on a later sweep.
+            pass
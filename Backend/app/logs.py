@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Dict, Optional
+
+# Structured logging for the server. Records are put on a queue by the event
+# loop and written to stderr by a QueueListener thread, so a slow stdout/stderr
+# pipe never stalls a game. Context travels as record attributes (extra=...).
+
+FIELDS = ("code", "playerId", "type")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"skyjo.{name}")
+
+
+def ctx(ws: Any = None, type_: Optional[str] = None, **more: Any) -> Dict[str, Any]:
+    """extra= dict with the game code / player id of a socket and a message type."""
+    out: Dict[str, Any] = {}
+    state = getattr(ws, "state", None)
+    if state is not None:
+        code = getattr(state, "code", None) or getattr(state, "remote_code", None)
+        if code:
+            out["code"] = code
+        pid = getattr(state, "player_id", None)
+        if pid:
+            out["playerId"] = pid
+    if type_:
+        out["type"] = type_
+    out.update(more)
+    return out
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        doc: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                doc[key] = value
+        sampled = getattr(record, "sampled", None)
+        if sampled is not None:
+            doc["sampled"] = sampled
+        if record.exc_info:
+            doc["exc"] = self.formatException(record.exc_info)
+        return json.dumps(doc, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = [f"{k}={getattr(record, k)}" for k in FIELDS if getattr(record, k, None) is not None]
+        return f"{line} [{' '.join(extras)}]" if extras else line
+
+
+class Sampler:
+    """
+    Lets 1 in `every` events per key through. The emitted record carries how many
+    events it stands for, so volumes can still be reconstructed from the logs.
+    """
+
+    def __init__(self, every: int):
+        self.every = max(1, every)
+        self._seen: Dict[str, int] = {}
+
+    def log(self, logger: logging.Logger, level: int, key: str, msg: str, *args: Any, **extra: Any) -> None:
+        if not logger.isEnabledFor(level):
+            return
+        n = self._seen.get(key, 0) + 1
+        if n < self.every:
+            self._seen[key] = n
+            return
+        self._seen[key] = 0
+        extra["sampled"] = self.every
+        logger.log(level, msg, *args, extra=extra)
+
+
+def configure_logging(level: str = "INFO", fmt: str = "json", levels: str = "") -> None:
+    """
+    Route the `skyjo` logger tree through a queue to stderr. Idempotent.
+    `levels` overrides single loggers, e.g. "debug_sets=DEBUG,cluster=WARNING".
+    """
+    global _listener
+    root = logging.getLogger("skyjo")
+    root.setLevel(level.upper())
+    for item in filter(None, (part.strip() for part in levels.split(","))):
+        name, _, lvl = item.partition("=")
+        get_logger(name.strip()).setLevel(lvl.strip().upper())
+    if _listener is not None:
+        return
+
+    sink = logging.StreamHandler(sys.stderr)
+    sink.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(q))
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(q, sink, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records (called at exit)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence
+
+# Everything (all games) shares one event loop, so the delay between "this
+# callback should run now" and "it runs" is the latency every client pays on
+# top of its own work.
+
+
+class LoopLagMonitor:
+    """
+    Sleeps `interval_s` in a loop and records how late each wake-up was.
+    Keeps the last `window` samples for percentiles.
+    """
+
+    def __init__(self, interval_s: float = 0.1, window: int = 600):
+        self.interval_s = interval_s
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        interval = self.interval_s
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.record(max(0.0, time.perf_counter() - t0 - interval))
+
+    def record(self, lag_s: float) -> None:
+        self._samples.append(lag_s)
+
+    def percentiles(self, qs: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[float, float]:
+        if not self._samples:
+            return {q: 0.0 for q in qs}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in qs}
+
+    def max(self) -> float:
+        return max(self._samples, default=0.0)
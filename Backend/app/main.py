@@ -1,11 +1,100 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import secrets
+import signal
+import threading
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from .cluster import RemoteSocket
+from .logs import configure_logging, get_logger
+from .loopmon import LoopLagMonitor
+from .metrics import REGISTRY, Gauge
+from .profiler import MAX_CAPTURE_S, ProfileBusy, profiler
+from .recorder import recording_path
+from .settings import settings
+from .snapshot import restore_games, save_games, snapshot_path
+from .ws import cluster, heartbeat, public_feed, recorder, router as ws_router, store, turn_timeouts, turn_timers  # Importing WebSocket router
+
+configure_logging(settings.log_level, settings.log_format, settings.log_levels)
+log = get_logger("main")
+
+
+def _games_by_phase() -> dict:
+    # Runs on the scrape thread: read the published snapshots, not the live games.
+    counts = {"DORMANT": float(len(store.dormant_by_code))}
+    for engine in list(store.games_by_code.values()):
+        phase = engine.frozen.phase.value
+        counts[phase] = counts.get(phase, 0.0) + 1
+    return counts
+
+
+def _sockets_by_role() -> dict:
+    # Runs on the scrape thread too: copy the live dict and sets before iterating.
+    counts = {"player": 0.0, "table": 0.0, "remote": 0.0, "spectator": 0.0}
+    for sockets in list(store.sockets_by_code.values()):
+        for s in list(sockets):
+            if isinstance(s, RemoteSocket):
+                counts["remote"] += 1
+            elif getattr(s.state, "player_id", None):
+                counts["player"] += 1
+            else:
+                counts["table"] += 1
+    for watchers in list(store.spectators_by_code.values()):
+        counts["spectator"] += len(watchers)
+    counts["sse"] = float(public_feed.streams())
+    return counts
+
+
+loop_lag = LoopLagMonitor(interval_s=settings.loop_lag_interval_ms / 1000)
+
+
+def _loop_lag_quantiles() -> dict:
+    return {str(q): v for q, v in loop_lag.percentiles().items()}
+
+
+REGISTRY.register(Gauge("skyjo_games", "Resident games by phase (DORMANT = restored, not yet woken).", "phase", _games_by_phase))
+REGISTRY.register(Gauge("skyjo_sockets", "Sockets registered to a game, by role.", "role", _sockets_by_role))
+REGISTRY.register(Gauge("skyjo_event_loop_lag_seconds", "Event-loop scheduling lag over the recent window.", "quantile", _loop_lag_quantiles))
 
-from .ws import router as ws_router  # Importing WebSocket router
 
-app = FastAPI()  # Creating an instance of the FastAPI application
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_lag.start()
+    heartbeat.start()
+    if turn_timeouts:
+        turn_timers.start()
+    await cluster.start()
+    if settings.snapshot_dir:
+        # Warm restart: games come back dormant and wake up on resume_game.
+        restored = restore_games(store, snapshot_path(settings.snapshot_dir, cluster.shard_id))
+        if restored:
+            log.info("restored %d games from snapshot", restored)
+    if settings.record_dir:
+        path = recording_path(settings.record_dir, cluster.shard_id)
+        recorder.start(path, settings.record_max_bytes, settings.record_backups)
+        log.info("recording sessions to %s", path)
+    if cluster.enabled:
+        # `kill -USR1 <worker pid>` hands this worker's games to the other shards
+        # before it is restarted.
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGUSR1, lambda: asyncio.ensure_future(cluster.drain()))
+    yield
+    await loop_lag.stop()
+    await heartbeat.stop()
+    await turn_timers.stop()
+    await cluster.stop()
+    recorder.stop()
+    if settings.snapshot_dir and store.game_count():
+        saved = save_games(store, snapshot_path(settings.snapshot_dir, cluster.shard_id))
+        log.info("saved %d games to snapshot", saved)
+
+
+app = FastAPI(lifespan=lifespan)  # Creating an instance of the FastAPI application
 
 # Middleware configuration for CORS (Cross-Origin Resource Sharing)
 app.add_middleware(
@@ -21,3 +110,66 @@ app.include_router(ws_router)  # Include the WebSocket router in the application
 @app.get("/health")  # Health check endpoint
 def health():
     return {"ok": True}  # Returns a simple JSON response indicating the service is running
+
+
+@app.get("/ready")  # Load balancer readiness: stop sending new tables to a hot worker
+def ready():
+    p99 = loop_lag.percentiles((0.99,))[0.99]
+    games = store.game_count()
+    reasons = []
+    if settings.ready_max_lag_ms > 0 and p99 * 1000 > settings.ready_max_lag_ms:
+        reasons.append("event_loop_lag")
+    if settings.ready_max_games > 0 and games >= settings.ready_max_games:
+        reasons.append("too_many_games")
+    body = {"ready": not reasons, "reasons": reasons, "loopLagP99Ms": round(p99 * 1000, 3), "games": games}
+    return JSONResponse(body, status_code=503 if reasons else 200)
+
+
+@app.get("/metrics")  # Prometheus scrape endpoint
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def _require_admin(authorization: str | None) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404)
+    expected = f"Bearer {settings.admin_token}"
+    if authorization is None or not secrets.compare_digest(authorization, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.post("/admin/profile")  # Time-boxed sampling profile of the live event loop
+async def admin_profile(
+    seconds: float = 5.0,
+    interval_ms: float = 5.0,
+    format: str = "collapsed",
+    authorization: str | None = Header(default=None),
+):
+    _require_admin(authorization)
+    if format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail="format must be collapsed or speedscope")
+    if not 0 < seconds <= MAX_CAPTURE_S:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_CAPTURE_S:g}]")
+    if not 0.5 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="interval_ms must be in [0.5, 1000]")
+
+    # This handler runs on the loop thread; sample that thread while we sleep
+    # so real traffic keeps flowing through the loop during the capture.
+    try:
+        cap = profiler.begin(threading.get_ident(), interval_ms / 1000)
+    except ProfileBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.end(cap)
+
+    if format == "speedscope":
+        return JSONResponse(
+            cap.speedscope(),
+            headers={"Content-Disposition": 'attachment; filename="skyjo.speedscope.json"'},
+        )
+    return PlainTextResponse(
+        cap.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="skyjo.collapsed.txt"'},
+    )
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import functools
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Everything runs on the event loop thread, so plain ints/floats are enough:
+# recording a sample is a dict lookup, a bisect and a few in-place adds.
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+# Bound label cardinality: anything a client invents is reported as "other".
+KNOWN_MESSAGE_TYPES = frozenset({
+    "create_table", "join_game", "resume_game", "set_ready", "setup_reveal",
+    "table_set_selection", "table_set_deck_mode", "draw_from_deck", "take_discard",
+    "discard_drawn", "discard_drawn_and_reveal", "swap_into_grid", "start_new_round",
+    "get_round_history", "get_card_counts", "debug_set_player_grid", "spectate_game",
+    "undo_turn", "request_hint",
+})
+
+
+def message_label(type_: Optional[str]) -> str:
+    return type_ if type_ in KNOWN_MESSAGE_TYPES else "other"
+
+
+def _fmt_labels(name: str, value: str, extra: str = "") -> str:
+    parts = []
+    if name:
+        parts.append(f'{name}="{value}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+# Every metric here has at most one label; the label value itself is the dict
+# key, so recording does not even build a tuple.
+
+class Counter:
+    def __init__(self, name: str, help_: str, labelname: str = ""):
+        self.name = name
+        self.help = help_
+        self.labelname = labelname
+        self._values: Dict[str, List[float]] = {}
+
+    def inc(self, label: str = "", amount: float = 1.0) -> None:
+        cell = self._values.get(label)
+        if cell is None:
+            cell = self._values[label] = [0.0]
+        cell[0] += amount
+
+    def value(self, label: str = "") -> float:
+        cell = self._values.get(label)
+        return cell[0] if cell else 0.0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for label, cell in sorted(self._values.items()):
+            yield f"{self.name}{_fmt_labels(self.labelname, label)} {_fmt_value(cell[0])}"
+
+
+class _HistogramCell:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * (n_buckets + 1)  # last slot = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        labelname: str = "",
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_
+        self.labelname = labelname
+        self.buckets = buckets
+        self._cells: Dict[str, _HistogramCell] = {}
+
+    def observe(self, value: float, label: str = "") -> None:
+        cell = self._cells.get(label)
+        if cell is None:
+            cell = self._cells[label] = _HistogramCell(len(self.buckets))
+        cell.counts[bisect_left(self.buckets, value)] += 1
+        cell.sum += value
+        cell.count += 1
+
+    def count(self, label: str = "") -> int:
+        cell = self._cells.get(label)
+        return cell.count if cell else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for label, cell in sorted(self._cells.items()):
+            running = 0
+            bounds = [repr(b) for b in self.buckets] + ["+Inf"]
+            for le, n in zip(bounds, cell.counts):
+                running += n
+                le_label = 'le="' + le + '"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labelname, label, le_label)} {running}"
+            yield f"{self.name}_sum{_fmt_labels(self.labelname, label)} {repr(cell.sum)}"
+            yield f"{self.name}_count{_fmt_labels(self.labelname, label)} {cell.count}"
+
+
+class Gauge:
+    """Gauge whose samples are produced at scrape time by a callback."""
+
+    def __init__(self, name: str, help_: str, labelname: str, collect: Callable[[], Dict[str, float]]):
+        self.name = name
+        self.help = help_
+        self.labelname = labelname
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for label, value in sorted(self.collect().items()):
+            yield f"{self.name}{_fmt_labels(self.labelname, label)} {_fmt_value(value)}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[object] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+MESSAGE_SECONDS = REGISTRY.register(Histogram(
+    "skyjo_ws_message_seconds",
+    "Time to handle one inbound WebSocket message, by message type.",
+    "type",
+))
+BROADCAST_SECONDS = REGISTRY.register(Histogram(
+    "skyjo_broadcast_seconds",
+    "Time to fan one frame out to all sockets of a game, by message type.",
+    "type",
+))
+FRAME_BYTES = REGISTRY.register(Counter(
+    "skyjo_ws_frame_bytes_total",
+    "Bytes of outbound WebSocket frames, by message type.",
+    "type",
+))
+FRAMES = REGISTRY.register(Counter(
+    "skyjo_ws_frames_total",
+    "Outbound WebSocket frames, by message type.",
+    "type",
+))
+THROTTLED = REGISTRY.register(Counter(
+    "skyjo_ws_throttled_total",
+    "Messages dropped or connections refused by admission control, by limit.",
+    "limit",
+))
+HEARTBEAT_TIMEOUTS = REGISTRY.register(Counter(
+    "skyjo_ws_heartbeat_timeouts_total",
+    "Connections closed because they stayed silent past the heartbeat timeout.",
+))
+RTT_SECONDS = REGISTRY.register(Histogram(
+    "skyjo_ws_rtt_seconds",
+    "Heartbeat round-trip time of client connections.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+TURN_TIMEOUTS = REGISTRY.register(Counter(
+    "skyjo_turn_timeouts_total",
+    "Phase deadlines that passed and were auto-played, by phase.",
+    "phase",
+))
+HTTP_STATE = REGISTRY.register(Counter(
+    "skyjo_http_state_total",
+    "GET /games/{code}/state answers, by result (full or not_modified).",
+    "result",
+))
+HINTS = REGISTRY.register(Counter(
+    "skyjo_hints_total",
+    "request_hint answers, by result (hit = served from the hint cache, miss = evaluated).",
+    "result",
+))
+ENGINE_SECONDS = REGISTRY.register(Histogram(
+    "skyjo_engine_seconds",
+    "Time spent in hot GameEngine methods.",
+    "method",
+))
+
+
+def timed(method: str):
+    """Record the wall time of every call into skyjo_engine_seconds{method=...}."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                ENGINE_SECONDS.observe(time.perf_counter() - t0, method)
+        return wrapper
+    return decorate
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Sampling profiler for the live server. Nothing is installed while idle: a
+# capture starts a sampler thread that peeks at the event-loop thread's stack
+# via sys._current_frames(), and the thread exits when the capture ends.
+
+Stack = Tuple[Tuple[str, str, int], ...]  # root -> leaf of (function, file, line)
+
+MAX_CAPTURE_S = 60.0
+
+
+class ProfileBusy(RuntimeError):
+    pass
+
+
+def _walk(frame) -> Stack:
+    out = []
+    while frame is not None:
+        code = frame.f_code
+        out.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    out.reverse()
+    return tuple(out)
+
+
+class Capture:
+    def __init__(self, target_thread: int, interval_s: float):
+        self.target_thread = target_thread
+        self.interval_s = interval_s
+        self.samples: Counter = Counter()
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._switch_interval = sys.getswitchinterval()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="skyjo-profiler", daemon=True)
+
+    def start(self) -> None:
+        # The sampler needs the GIL to look at the loop thread. With the default
+        # 5ms switch interval it mostly gets it when the loop blocks in select(),
+        # which hides CPU-bound handlers; hand the GIL over more often while
+        # capturing.
+        sys.setswitchinterval(min(self._switch_interval, 0.0005))
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        target = self.target_thread
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                self.samples[_walk(frame)] += 1
+
+    # -------------------------
+    # Output formats
+    # -------------------------
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format (flamegraph.pl, speedscope, inferno)."""
+        lines = []
+        for stack, count in self.samples.most_common():
+            names = ";".join(f"{fn} ({_short(file)}:{line})" for fn, file, line in stack)
+            lines.append(f"{names} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "skyjo") -> dict:
+        frame_index: Dict[Tuple[str, str, int], int] = {}
+        frames: List[dict] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.samples.items():
+            ids = []
+            for fr in stack:
+                idx = frame_index.get(fr)
+                if idx is None:
+                    idx = frame_index[fr] = len(frames)
+                    frames.append({"name": fr[0], "file": fr[1], "line": fr[2]})
+                ids.append(idx)
+            samples.append(ids)
+            weights.append(count * self.interval_s)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "exporter": "skyjo-profiler",
+        }
+
+
+def _short(path: str) -> str:
+    marker = "/app/"
+    i = path.rfind(marker)
+    return path[i + 1:] if i >= 0 else path.rsplit("/", 1)[-1]
+
+
+class Profiler:
+    """At most one capture at a time; begin() refuses while one is running."""
+
+    def __init__(self) -> None:
+        self._active: Optional[Capture] = None
+
+    @property
+    def running(self) -> bool:
+        return self._active is not None
+
+    def begin(self, target_thread: int, interval_s: float = 0.005) -> Capture:
+        if self._active is not None:
+            raise ProfileBusy("A capture is already running")
+        cap = Capture(target_thread, interval_s)
+        self._active = cap
+        cap.start()
+        return cap
+
+    def end(self, cap: Capture) -> Capture:
+        try:
+            cap.stop()
+        finally:
+            if self._active is cap:
+                self._active = None
+        return cap
+
+
+profiler = Profiler()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Optional
+
+# Admission control for the WebSocket endpoint. One client spamming
+# table_set_selection or resume_game costs a full broadcast per message for
+# everybody at that table, all on the one event loop; these limits keep that
+# cost bounded. Every limit is off when its setting is 0.
+
+# WebSocket close codes (RFC 6455 / IANA registry).
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`. Starts full."""
+
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def take(self, now: float, cost: float = 1.0) -> bool:
+        tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if tokens < cost:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - cost
+        return True
+
+    def full_at(self, now: float) -> bool:
+        return self.tokens + (now - self.stamp) * self.rate >= self.burst
+
+
+class Admission:
+    """
+    Per-connection and per-game token buckets plus global caps on open
+    connections and resident games. Lives on the worker holding the sockets.
+    """
+
+    # Idle game buckets are dropped every this many checks.
+    PRUNE_EVERY = 4096
+
+    def __init__(
+        self,
+        conn_rate: float = 0.0,
+        conn_burst: float = 0.0,
+        game_rate: float = 0.0,
+        game_burst: float = 0.0,
+        max_connections: int = 0,
+        max_games: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.conn_rate = conn_rate
+        self.conn_burst = conn_burst or conn_rate
+        self.game_rate = game_rate
+        self.game_burst = game_burst or game_rate
+        self.max_connections = max_connections
+        self.max_games = max_games
+        self.clock = clock
+        self.connections = 0
+        self._games: Dict[str, TokenBucket] = {}
+        self._checks = 0
+
+    # -------------------------
+    # Global caps
+    # -------------------------
+    def connect(self) -> bool:
+        """Count a new connection; False (and not counted) when the cap is reached."""
+        if self.max_connections and self.connections >= self.max_connections:
+            return False
+        self.connections += 1
+        return True
+
+    def disconnect(self) -> None:
+        self.connections -= 1
+
+    def games_full(self, game_count: int) -> bool:
+        return bool(self.max_games) and game_count >= self.max_games
+
+    # -------------------------
+    # Rates
+    # -------------------------
+    def connection_bucket(self) -> Optional[TokenBucket]:
+        if not self.conn_rate:
+            return None
+        return TokenBucket(self.conn_rate, self.conn_burst, self.clock())
+
+    def abusive(self, streak: int) -> bool:
+        """A connection that kept sending through a whole burst while throttled gets closed."""
+        return bool(self.conn_rate) and streak > self.conn_burst
+
+    def check(self, bucket: Optional[TokenBucket], code: Optional[str]) -> Optional[str]:
+        """None if the message may pass, else the limit it hit ("conn_rate" / "game_rate")."""
+        now = self.clock()
+        if bucket is not None and not bucket.take(now):
+            return "conn_rate"
+        if self.game_rate and code:
+            self._checks += 1
+            if self._checks % self.PRUNE_EVERY == 0:
+                self._prune(now)
+            game = self._games.get(code)
+            if game is None:
+                game = self._games[code] = TokenBucket(self.game_rate, self.game_burst, now)
+            if not game.take(now):
+                return "game_rate"
+        return None
+
+    def _prune(self, now: float) -> None:
+        # A bucket that has refilled is the same as a new one.
+        for code in [c for c, b in self._games.items() if b.full_at(now)]:
+            del self._games[code]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+# Session recorder: every inbound client message (with connection id and
+# timestamp), the RNG seed of every new game, the moments coalesced table
+# updates were flushed or turn deadlines fired, and a checksum of every
+# game_public_state broadcast, as JSON lines in a rotating file. Together with the per-game seed this is enough
+# for Backend/tools/replay.py to play a production session back and check it
+# produces the same states.
+#
+# Records ("k" is the kind):
+#   {"t": ts, "k": "in",   "c": conn, "m": raw client message}
+#   {"t": ts, "k": "game", "g": code, "s": seed}
+#   {"t": ts, "k": "join", "c": conn, "g": code, "p": playerId, "tok": token}
+#   {"t": ts, "k": "flush", "g": code}            (table_ui coalescer fired)
+#   {"t": ts, "k": "timeout", "g": code}          (turn deadline auto-played)
+#   {"t": ts, "k": "out",  "g": code, "h": crc32 of the game_public_state frame}
+#   {"t": ts, "k": "bye",  "c": conn}
+#
+# Writing goes through a queue to a listener thread, like the logs, so disk I/O
+# never runs on the event loop. The log holds player tokens (inbound messages
+# carry them anyway): treat it as a secret.
+
+
+def recording_path(directory: str, shard_id: int) -> str:
+    return os.path.join(directory, f"sessions-{shard_id}.jsonl")
+
+
+def recording_files(path: str) -> List[str]:
+    """`path` and its rotated backups, oldest first."""
+    backups = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        backups.append(f"{path}.{i}")
+        i += 1
+    files = backups[::-1]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+class SessionRecorder:
+    """Disabled until start(); every hook is a single attribute check when off."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self, path: str, max_bytes: int, backups: int) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        sink = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        sink.setFormatter(logging.Formatter("%(message)s"))
+        q: queue.SimpleQueue = queue.SimpleQueue()
+        # Not part of the skyjo.* logger tree: recordings never reach stderr.
+        self._logger = logging.Logger("skyjo.recorder", logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(logging.handlers.QueueHandler(q))
+        self._listener = logging.handlers.QueueListener(q, sink)
+        self._listener.start()
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for h in listener.handlers:
+                h.close()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._logger.info(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+
+    # -------------------------
+    # Hooks (ws.py)
+    # -------------------------
+    def inbound(self, conn: str, raw: Any) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "in", "c": conn, "m": raw})
+
+    def game_created(self, code: str, seed: int) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "game", "g": code, "s": seed})
+
+    def joined(self, conn: str, code: str, player_id: str, token: str) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "join", "c": conn, "g": code, "p": player_id, "tok": token})
+
+    def table_flush(self, code: str) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "flush", "g": code})
+
+    def turn_timeout(self, code: str) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "timeout", "g": code})
+
+    def public_state(self, code: str, text: str) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "out", "g": code, "h": zlib.crc32(text.encode())})
+
+    def disconnect(self, conn: str) -> None:
+        if self.enabled:
+            self._write({"t": round(time.time(), 4), "k": "bye", "c": conn})
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return int(raw)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_str(name: str, default: str) -> str:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return raw.strip()
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return float(raw)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration, read once from SKYJO_* environment variables."""
+    # Window in which cosmetic table updates (selection / deck mode) are merged
+    # into a single game_public_state broadcast. 0 = broadcast immediately.
+    table_ui_coalesce_ms: float = 40.0
+
+    # Sharding: run `uvicorn --workers N` with SKYJO_SHARDS=N. Workers claim shard
+    # ids and talk over unix sockets in shard_dir (created 0700, must be ours).
+    shards: int = 1
+    shard_dir: str = "/tmp/skyjo-shards"
+    drain_on_shutdown: bool = False
+
+    # Warm restart: live games are written here on shutdown and restored on boot.
+    # Empty string (the default) disables snapshots. Snapshots hold player
+    # tokens: use a private directory (created 0700, files written 0600).
+    snapshot_dir: str = ""
+
+    # Readiness: /ready returns 503 once event-loop lag (p99 over the recent
+    # window) or the number of resident games passes these limits. 0 = no limit.
+    loop_lag_interval_ms: float = 100.0
+    ready_max_lag_ms: float = 250.0
+    ready_max_games: int = 0
+
+    # Admin endpoints (/admin/*) require `Authorization: Bearer <token>`.
+    # Empty token = admin endpoints disabled.
+    admin_token: str = ""
+
+    # Logging: level for the skyjo.* loggers, "json" or "text", per-logger
+    # overrides ("debug_sets=DEBUG" turns on the set-detection dumps) and the
+    # 1-in-N rate for high-volume events (connects, dead-socket errors).
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_levels: str = ""
+    log_sample_every: int = 100
+
+    # Admission control (0 = off): token buckets per connection and per game
+    # (messages/sec and burst; a connection that keeps sending a whole burst
+    # while throttled is closed with 1008) and caps on open connections and
+    # resident games (refused with close code 1013).
+    conn_rate: float = 0.0
+    conn_burst: float = 0.0
+    game_rate: float = 0.0
+    game_burst: float = 0.0
+    max_connections: int = 0
+    max_games: int = 0
+
+    # Spectators (spectate_game): each gets at most spectator_max_rate state
+    # updates per second (0 = unthrottled), all sharing one encoded frame per game;
+    # max_spectators caps viewers per game (0 = no limit).
+    spectator_max_rate: float = 4.0
+    max_spectators: int = 0
+    # GET /games/{code}/events: comment line sent on an idle SSE stream so
+    # proxies keep it open and a vanished game ends it.
+    sse_keepalive_s: float = 15.0
+
+    # request_hint: evaluations kept in an LRU keyed by the canonical grid,
+    # card and unseen-card counts (0 = evaluate every request).
+    hint_cache_size: int = 4096
+
+    # Heartbeats: the server pings every connection each interval; one that
+    # sends nothing (not even a pong) for timeout seconds is closed (4408) and
+    # unregistered. 0 disables pings / reaping.
+    heartbeat_interval_s: float = 15.0
+    heartbeat_timeout_s: float = 45.0
+
+    # Turn deadlines in seconds per phase (0 = wait forever). When one passes
+    # the server plays a neutral move for the player(s) it waits on: reveal
+    # the first face-down cards in setup, else draw, discard and reveal.
+    setup_timeout_s: float = 0.0
+    turn_choose_timeout_s: float = 0.0
+    turn_resolve_timeout_s: float = 0.0
+
+    # Session recording for replay (Backend/tools/replay.py): inbound messages,
+    # game seeds and state checksums go to <record_dir>/sessions-<shard>.jsonl,
+    # rotated at record_max_bytes. Empty string disables recording.
+    record_dir: str = ""
+    record_max_bytes: int = 64 * 1024 * 1024
+    record_backups: int = 5
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            table_ui_coalesce_ms=_env_float("SKYJO_TABLE_UI_COALESCE_MS", cls.table_ui_coalesce_ms),
+            shards=_env_int("SKYJO_SHARDS", cls.shards),
+            shard_dir=_env_str("SKYJO_SHARD_DIR", cls.shard_dir),
+            drain_on_shutdown=_env_bool("SKYJO_DRAIN_ON_SHUTDOWN", cls.drain_on_shutdown),
+            snapshot_dir=os.getenv("SKYJO_SNAPSHOT_DIR", cls.snapshot_dir).strip(),
+            loop_lag_interval_ms=_env_float("SKYJO_LOOP_LAG_INTERVAL_MS", cls.loop_lag_interval_ms),
+            ready_max_lag_ms=_env_float("SKYJO_READY_MAX_LAG_MS", cls.ready_max_lag_ms),
+            ready_max_games=_env_int("SKYJO_READY_MAX_GAMES", cls.ready_max_games),
+            admin_token=_env_str("SKYJO_ADMIN_TOKEN", cls.admin_token),
+            log_level=_env_str("SKYJO_LOG_LEVEL", cls.log_level),
+            log_format=_env_str("SKYJO_LOG_FORMAT", cls.log_format),
+            log_levels=_env_str("SKYJO_LOG_LEVELS", cls.log_levels),
+            log_sample_every=_env_int("SKYJO_LOG_SAMPLE_EVERY", cls.log_sample_every),
+            conn_rate=_env_float("SKYJO_CONN_RATE", cls.conn_rate),
+            conn_burst=_env_float("SKYJO_CONN_BURST", cls.conn_burst),
+            game_rate=_env_float("SKYJO_GAME_RATE", cls.game_rate),
+            game_burst=_env_float("SKYJO_GAME_BURST", cls.game_burst),
+            max_connections=_env_int("SKYJO_MAX_CONNECTIONS", cls.max_connections),
+            max_games=_env_int("SKYJO_MAX_GAMES", cls.max_games),
+            spectator_max_rate=_env_float("SKYJO_SPECTATOR_MAX_RATE", cls.spectator_max_rate),
+            max_spectators=_env_int("SKYJO_MAX_SPECTATORS", cls.max_spectators),
+            sse_keepalive_s=_env_float("SKYJO_SSE_KEEPALIVE_S", cls.sse_keepalive_s),
+            hint_cache_size=_env_int("SKYJO_HINT_CACHE_SIZE", cls.hint_cache_size),
+            heartbeat_interval_s=_env_float("SKYJO_HEARTBEAT_INTERVAL_S", cls.heartbeat_interval_s),
+            heartbeat_timeout_s=_env_float("SKYJO_HEARTBEAT_TIMEOUT_S", cls.heartbeat_timeout_s),
+            setup_timeout_s=_env_float("SKYJO_SETUP_TIMEOUT_S", cls.setup_timeout_s),
+            turn_choose_timeout_s=_env_float("SKYJO_TURN_CHOOSE_TIMEOUT_S", cls.turn_choose_timeout_s),
+            turn_resolve_timeout_s=_env_float("SKYJO_TURN_RESOLVE_TIMEOUT_S", cls.turn_resolve_timeout_s),
+            record_dir=_env_str("SKYJO_RECORD_DIR", cls.record_dir),
+            record_max_bytes=_env_int("SKYJO_RECORD_MAX_BYTES", cls.record_max_bytes),
+            record_backups=_env_int("SKYJO_RECORD_BACKUPS", cls.record_backups),
+        )
+
+
+settings = Settings.from_env()
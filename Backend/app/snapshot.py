@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import marshal
+import os
+import time
+from typing import Dict
+
+from .game.store import GameStore
+from .logs import get_logger
+
+log = get_logger("snapshot")
+
+SNAPSHOT_FORMAT = 1
+
+
+def snapshot_path(directory: str, shard_id: int) -> str:
+    return os.path.join(directory, f"games-{shard_id}.snap")
+
+
+def save_games(store: GameStore, path: str) -> int:
+    """
+    Write every resident game (including still-dormant ones) to `path` in one
+    bulk write. Each game is a separate marshal blob so restore can stay lazy.
+    Returns the number of games written.
+    """
+    blobs: Dict[str, bytes] = dict(store.dormant_by_code)
+    for code, engine in store.games_by_code.items():
+        blobs[code] = marshal.dumps(engine.to_snapshot())
+
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    tmp = f"{path}.tmp"
+    # Owner-only: the blobs include player tokens.
+    with open(tmp, "wb", opener=lambda p, flags: os.open(p, flags, 0o600)) as f:
+        os.fchmod(f.fileno(), 0o600)
+        f.write(marshal.dumps((SNAPSHOT_FORMAT, time.time(), blobs)))
+    os.replace(tmp, path)  # atomic: a crash mid-write never leaves a torn snapshot
+    return len(blobs)
+
+
+def restore_games(store: GameStore, path: str) -> int:
+    """
+    Load a snapshot written by save_games into `store` as dormant games; engines
+    are rebuilt on first access (resume_game / join). The file is renamed so a
+    later crash does not resurrect stale state. Returns the number of games.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_uid != os.getuid():
+                log.warning("snapshot %s: owned by another user, ignored", path)
+                return 0
+            data = f.read()
+    except FileNotFoundError:
+        return 0
+
+    os.replace(path, f"{path}.restored")
+    try:
+        fmt, _written_at, blobs = marshal.loads(data)
+    except (EOFError, ValueError, TypeError) as e:
+        log.warning("snapshot %s: unreadable (%r), ignored", path, e)
+        return 0
+    if fmt != SNAPSHOT_FORMAT:
+        log.warning("snapshot %s: unsupported format %s, ignored", path, fmt)
+        return 0
+    store.add_dormant(blobs)
+    return len(blobs)
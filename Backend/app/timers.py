@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .logs import get_logger
+
+log = get_logger("timers")
+
+# One hashed timing wheel per worker for every game's turn deadline, instead of
+# an asyncio task (or a loop.call_later handle) per game. A deadline lives in
+# the slot of the tick it expires in; arm, re-arm and cancel are a dict insert
+# and a dict delete, so re-arming after every move costs the same with 10 or
+# 50 000 armed games. The single task only looks at the slot(s) whose tick has
+# come, and a deadline further away than one revolution simply stays in its
+# slot until the wheel comes round often enough.
+
+
+class TimerWheel:
+    """
+    `slots` buckets of `tick_s` seconds each, keyed by an arbitrary string
+    (the game code). `fire(key)` runs on the wheel's task once a deadline has
+    passed; precision is one tick.
+    """
+
+    def __init__(
+        self,
+        fire: Callable[[str], Awaitable[None]],
+        tick_s: float = 0.25,
+        slots: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fire = fire
+        self.tick_s = tick_s
+        self.clock = clock
+        self._slots: List[Dict[str, float]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[str, int] = {}
+        self._tick = int(clock() / tick_s)  # last tick processed
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_s)
+            await self.advance()
+
+    # -------------------------
+    # Arm / cancel (O(1))
+    # -------------------------
+    def arm(self, key: str, delay_s: float) -> None:
+        """(Re)set the deadline of `key` to `delay_s` from now."""
+        self.cancel(key)
+        deadline = self.clock() + delay_s
+        # Never into a tick that was already processed: it would wait a revolution.
+        tick = max(math.ceil(deadline / self.tick_s), self._tick + 1)
+        slot = tick % len(self._slots)
+        self._slots[slot][key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> None:
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def deadline(self, key: str) -> Optional[float]:
+        slot = self._slot_of.get(key)
+        return None if slot is None else self._slots[slot][key]
+
+    # -------------------------
+    # Expiry
+    # -------------------------
+    async def advance(self) -> int:
+        """Fire everything due by now; returns the number fired."""
+        now = self.clock()
+        current = int(now / self.tick_s)
+        n = len(self._slots)
+        # After a stall longer than a revolution every slot is due once.
+        ticks = range(max(self._tick + 1, current - n + 1), current + 1)
+        self._tick = current
+
+        due: List[str] = []
+        for tick in ticks:
+            bucket = self._slots[tick % n]
+            if not bucket:
+                continue
+            expired = [key for key, deadline in bucket.items() if deadline <= now]
+            for key in expired:
+                del bucket[key]
+                del self._slot_of[key]
+            due.extend(expired)
+
+        for key in due:
+            try:
+                await self.fire(key)
+            except Exception:
+                log.exception("timer callback failed", extra={"code": key})
+        return len(due)
@@ -1,19 +1,61 @@
 from __future__ import annotations
 
-from typing import Any, Dict
-
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-
+import asyncio
+import json
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from .cluster import Cluster, UnixSocketPubSub
+from .coalesce import Coalescer
+from .feed import PublicFeed
+from .game.advisor import HintCache, evaluate, hint_payload
+from .game.rules import RuleSet
 from .game.store import GameStore
 from .game.events import ClientMessage
-
-print("ws.py loaded")
+from .heartbeat import CLOSE_HEARTBEAT_TIMEOUT, Heartbeat
+from .metrics import (
+    BROADCAST_SECONDS, FRAME_BYTES, FRAMES, HEARTBEAT_TIMEOUTS, HINTS, HTTP_STATE, MESSAGE_SECONDS,
+    RTT_SECONDS, THROTTLED, TURN_TIMEOUTS, message_label,
+)
+from .logs import Sampler, ctx, get_logger
+from .ratelimit import CLOSE_POLICY_VIOLATION, CLOSE_TRY_AGAIN_LATER, Admission
+from .recorder import SessionRecorder
+from .settings import settings
+from .timers import TimerWheel
+
+log = get_logger("ws")
+sets_log = get_logger("debug_sets")
+sampled = Sampler(settings.log_sample_every)
 
 router = APIRouter()
 store = GameStore()
+cluster = Cluster(
+    store,
+    shard_count=settings.shards,
+    pubsub=UnixSocketPubSub(settings.shard_dir) if settings.shards > 1 else None,
+    lock_dir=settings.shard_dir,
+    drain_on_stop=settings.drain_on_shutdown,
+)
+# Started by main's lifespan when SKYJO_RECORD_DIR is set.
+recorder = SessionRecorder()
+# Encoded public state per game, shared by spectators and the HTTP views.
+public_feed = PublicFeed()
+# request_hint evaluations, shared by all games (keys carry everything they depend on).
+hints = HintCache(settings.hint_cache_size)
+admission = Admission(
+    conn_rate=settings.conn_rate,
+    conn_burst=settings.conn_burst,
+    game_rate=settings.game_rate,
+    game_burst=settings.game_burst,
+    max_connections=settings.max_connections,
+    max_games=settings.max_games,
+)
 
-# Toggle debug printing for set-detection
-DEBUG_SETS = False
 
 
 # -------------------------
@@ -21,10 +63,11 @@ DEBUG_SETS = False
 # -------------------------
 def find_sets(obj: Any, path: str = "root") -> None:
     """
-    Recursively prints the path of any `set` found inside obj.
+    Recursively logs the path of any `set` found inside obj.
+    Only called when skyjo.debug_sets is at DEBUG (SKYJO_LOG_LEVELS=debug_sets=DEBUG).
     """
     if isinstance(obj, set):
-        print(f"❌ FOUND SET at {path}: {obj}")
+        sets_log.debug("❌ FOUND SET at %s: %r", path, obj)
         return
     if isinstance(obj, dict):
         for k, v in obj.items():
@@ -40,12 +83,28 @@ def find_sets(obj: Any, path: str = "root") -> None:
 # -------------------------
 # Helpers
 # -------------------------
-async def _send(ws: WebSocket, type_: str, payload: Dict[str, Any]) -> None:
-    # 🔍 DEBUG: check for sets before sending
-    if DEBUG_SETS:
-        print(f"\n--- DEBUG _send(type={type_}) ---")
+def _debug_sets(what: str, detail: str, payload: Any) -> None:
+    # 🔍 DEBUG: check for sets before sending; one cached level check when off.
+    if sets_log.isEnabledFor(logging.DEBUG):
+        sets_log.debug("--- DEBUG %s (%s) ---", what, detail)
         find_sets(payload)
-    await ws.send_json({"type": type_, "payload": payload})
+
+
+def _encode(type_: str, payload: Dict[str, Any]) -> str:
+    _debug_sets("_send", type_, payload)
+    # Same encoding Starlette's send_json uses; done here so a frame is encoded once.
+    return json.dumps({"type": type_, "payload": payload}, separators=(",", ":"), ensure_ascii=False)
+
+
+async def _send_text(ws: WebSocket, type_: str, text: str, nbytes: int) -> None:
+    await ws.send_text(text)
+    FRAMES.inc(type_)
+    FRAME_BYTES.inc(type_, nbytes)
+
+
+async def _send(ws: WebSocket, type_: str, payload: Dict[str, Any]) -> None:
+    text = _encode(type_, payload)
+    await _send_text(ws, type_, text, len(text.encode()))
 
 
 async def _broadcast(code: str, type_: str, payload: Dict[str, Any]) -> None:
@@ -53,45 +112,65 @@ async def _broadcast(code: str, type_: str, payload: Dict[str, Any]) -> None:
     Broadcast safely: do NOT unregister sockets on arbitrary exceptions.
     Only unregister on disconnect-like failures.
     """
+    if type_ == "game_public_state":
+        # A full public state supersedes any pending cosmetic table update.
+        table_ui.cancel(code)
+    t0 = time.perf_counter()
+    text = _encode(type_, payload)
+    nbytes = len(text.encode())
+    if type_ == "game_public_state":
+        recorder.public_state(code, text)
     dead = []
     for s in list(store.sockets(code)):
         try:
-            await _send(s, type_, payload)
+            await _send_text(s, type_, text, nbytes)
         except WebSocketDisconnect:
             dead.append(s)
         except RuntimeError:
             dead.append(s)
         except Exception as e:
-            print("broadcast error (ignored):", repr(e))
+            sampled.log(log, logging.WARNING, "broadcast_error", "broadcast error (ignored): %r", e,
+                        code=code, type=type_)
     for s in dead:
         store.unregister_socket(code, s)
+    if type_ == "game_public_state":
+        public_feed.publish(code, text)
+        if code in store.spectators_by_code:
+            # Spectators get the same frame later, from their own task.
+            await spectator_feed.request(code)
+    BROADCAST_SECONDS.observe(time.perf_counter() - t0, type_)
 
 
 async def _send_private(code: str, engine, player_id: str) -> None:
+    await _send_private_many(code, engine, (player_id,))
+
+
+async def _send_private_many(code: str, engine, player_ids: Iterable[str]) -> None:
+    """
+    Send player_private_state to the sockets bound to the given players.
+    Cost scales with the number of players passed in, not with the table size.
+    """
     dead = []
-    for s in list(store.sockets(code)):
-        try:
-            if getattr(s.state, "player_id", None) == player_id:
-                state = engine.private_state(player_id)
-                if DEBUG_SETS:
-                    print(f"\n--- DEBUG private_state for player {player_id} ---")
-                    find_sets(state)
+    for pid in player_ids:
+        sockets = list(store.player_sockets(code, pid))
+        if not sockets:
+            continue
+        state = engine.private_state(pid)
+        _debug_sets("private_state", pid, state)
+        for s in sockets:
+            try:
                 await _send(s, "player_private_state", state)
-        except WebSocketDisconnect:
-            dead.append(s)
-        except RuntimeError:
-            dead.append(s)
-        except Exception as e:
-            print("send_private error (ignored):", repr(e))
+            except WebSocketDisconnect:
+                dead.append(s)
+            except RuntimeError:
+                dead.append(s)
+            except Exception as e:
+                sampled.log(log, logging.WARNING, "send_private_error", "send_private error (ignored): %r", e,
+                            code=code, playerId=pid, type="player_private_state")
     for s in dead:
         store.unregister_socket(code, s)
 
 
-async def _send_private_all(code: str, engine) -> None:
-    for pl in engine.game.players:
-        await _send_private(code, engine, pl.id)
-
-
 async def _broadcast_engine_events(code: str, engine) -> None:
     for ev in engine.consume_events():
         et = ev.get("type")
@@ -129,367 +208,932 @@ async def _broadcast_engine_events(code: str, engine) -> None:
 
 
 async def _refresh_all(code: str, engine) -> None:
+    """
+    Shared state (incl. phase / currentPlayerId / finalRound) goes out once via
+    game_public_state; private_state only to players whose own view changed.
+    """
     public = engine.public_state()
-    if DEBUG_SETS:
-        print("\n--- DEBUG public_state ---")
-        find_sets(public)
+    _debug_sets("public_state", code, public)
     await _broadcast(code, "game_public_state", public)
-    await _send_private_all(code, engine)
+    await _send_private_many(code, engine, engine.consume_dirty_players())
+    _arm_turn_deadline(code, engine)
+
+
+async def _flush_table_ui(code: str) -> None:
+    try:
+        engine = store.get_game(code)
+    except ValueError:
+        return
+    recorder.table_flush(code)
+    engine.commit()
+    await _broadcast(code, "game_public_state", engine.public_state())
+
+
+# Cosmetic table updates (selection / deck mode) are coalesced per game;
+# authoritative actions broadcast immediately and cancel the pending flush.
+table_ui = Coalescer(settings.table_ui_coalesce_ms / 1000.0, _flush_table_ui)
+
+
+# -------------------------
+# Spectators
+# -------------------------
+# Version of the public frame last sent to the spectators of a game.
+_spectator_sent: Dict[str, int] = {}
+# Last round whose round_reveal went to the spectators of a game.
+_spectator_revealed: Dict[str, int] = {}
+# A slow viewer is dropped rather than waited for.
+SPECTATOR_SEND_TIMEOUT_S = 5.0
+
+
+async def _send_spectator(s: WebSocket, frames) -> bool:
+    try:
+        for type_, text in frames:
+            await asyncio.wait_for(_send_text(s, type_, text, len(text.encode())), SPECTATOR_SEND_TIMEOUT_S)
+    except Exception:
+        return False
+    return True
+
+
+async def _flush_spectators(code: str) -> None:
+    """
+    Send the latest state to every spectator of a game, concurrently, from the
+    feed's own task: however many viewers there are, _broadcast to the players
+    only pays for publishing the frame it already encoded. Frames superseded
+    within the window are never sent, which is what caps the per-spectator rate.
+    """
+    frame = public_feed.latest(code)
+    watchers = list(store.spectators(code))
+    if frame is None or not watchers:
+        _spectator_sent.pop(code, None)
+        _spectator_revealed.pop(code, None)
+        return
+    if _spectator_sent.get(code) == frame.version:
+        return
+    _spectator_sent[code] = frame.version
+    frames = [("game_public_state", frame.text)]
+    engine = store.games_by_code.get(code)
+    if engine is not None and engine.game.phase.value in ("ROUND_OVER", "GAME_OVER") \
+            and _spectator_revealed.get(code) != engine.game.round_index:
+        _spectator_revealed[code] = engine.game.round_index
+        frames.append(("round_reveal", _encode("round_reveal", engine.round_reveal())))
+    results = await asyncio.gather(*(_send_spectator(s, frames) for s in watchers))
+    for s, ok in zip(watchers, results):
+        if not ok:
+            store.unregister_socket(code, s)
+
+
+# spectator_max_rate <= 0: unthrottled (window 0 flushes on every update).
+spectator_feed = Coalescer(
+    1.0 / settings.spectator_max_rate if settings.spectator_max_rate > 0 else 0.0, _flush_spectators,
+)
+
+
+# -------------------------
+# Heartbeats
+# -------------------------
+async def _ping(ws: WebSocket, ping_id: int) -> None:
+    await _send(ws, "ping", {"id": ping_id})
+
+
+async def _reap(ws: WebSocket) -> None:
+    """Drop a connection that stopped answering: unregister first, then close."""
+    HEARTBEAT_TIMEOUTS.inc()
+    log.info("WS HEARTBEAT TIMEOUT", extra=ctx(ws))
+    await cluster.detach(ws)
+    try:
+        await ws.close(code=CLOSE_HEARTBEAT_TIMEOUT, reason="Heartbeat timeout")
+    except Exception:
+        pass
+
+
+async def _push_connection_stats() -> None:
+    """
+    connection_stats (per-player connected flag and RTT) to the table view of
+    every resident game that has one. Separate from game_public_state: RTTs
+    change on every ping and must not cost a full state broadcast.
+    """
+    for code, sockets in list(store.sockets_by_code.items()):
+        tables = [s for s in sockets if not s.state.player_id]
+        engine = store.games_by_code.get(code)
+        if not tables or engine is None:
+            continue
+        players = []
+        for pl in engine.game.players:
+            bound = store.player_sockets(code, pl.id)
+            rtts = [s.state.rtt_ms for s in bound if getattr(s.state, "rtt_ms", None) is not None]
+            players.append({"playerId": pl.id, "connected": bool(bound), "rttMs": min(rtts) if rtts else None})
+        text = _encode("connection_stats", {"players": players})
+        nbytes = len(text.encode())
+        for s in tables:
+            try:
+                await _send_text(s, "connection_stats", text, nbytes)
+            except Exception:
+                # Dead table sockets are left to the endpoint / the next sweep.
+                pass
+
+
+heartbeat = Heartbeat(
+    settings.heartbeat_interval_s,
+    settings.heartbeat_timeout_s,
+    ping=_ping,
+    reap=_reap,
+    after_sweep=_push_connection_stats,
+)
+
+
+# -------------------------
+# Turn deadlines
+# -------------------------
+# Seconds the server waits in a phase before playing for the AFK player(s);
+# phases not listed wait forever. Every state change goes through
+# _refresh_all, which re-arms (or cancels) the game's single timer.
+turn_timeouts: Dict[str, float] = {
+    phase: seconds
+    for phase, seconds in (
+        ("SETUP_REVEAL", settings.setup_timeout_s),
+        ("TURN_CHOOSE_SOURCE", settings.turn_choose_timeout_s),
+        ("TURN_RESOLVE", settings.turn_resolve_timeout_s),
+    )
+    if seconds > 0
+}
+
+
+def _arm_turn_deadline(code: str, engine) -> None:
+    if not turn_timeouts:
+        return
+    timeout = turn_timeouts.get(engine.game.phase.value)
+    if timeout:
+        turn_timers.arm(code, timeout)
+    else:
+        turn_timers.cancel(code)
+
+
+async def _turn_timeout(code: str) -> None:
+    engine = store.games_by_code.get(code)
+    if engine is None:
+        # Migrated to another shard or gone since the timer was armed.
+        return
+    was_setup = engine.game.phase.value == "SETUP_REVEAL"
+    acted = engine.auto_play()
+    if not acted:
+        return
+    recorder.turn_timeout(code)
+    TURN_TIMEOUTS.inc(acted[0]["phase"])
+    engine.commit()
+
+    await _refresh_all(code, engine)
+    for a in acted:
+        player_name = engine._get_player(a["playerId"]).name
+        await _broadcast(code, "info", {
+            "message": f"{player_name} ran out of time; played automatically.",
+            "event": {"type": "turn_timed_out", "playerId": a["playerId"], "phase": a["phase"],
+                      "action": a["action"], "indices": a["indices"]},
+        })
+        for ev in a["removed"]:
+            await _broadcast(code, "info", {
+                "message": f"Column removed for {player_name} (value {ev['value']})",
+                "event": {"type": "column_removed", "playerId": a["playerId"], **ev}
+            })
+    if was_setup and engine.game.phase.value == "TURN_CHOOSE_SOURCE":
+        await _broadcast(code, "info", {"message": "Setup done. Turns can begin."})
+
+    await _broadcast_engine_events(code, engine)
+
+    if engine.game.phase.value == "ROUND_OVER":
+        await _refresh_all(code, engine)
+
+    # ✅ deterministisch einde
+    await _broadcast(code, "game_public_state", engine.public_state())
+
+
+turn_timers = TimerWheel(_turn_timeout)
+
+
+# -------------------------
+# Message handling
+# -------------------------
+async def handle_message(ws: WebSocket, raw: Dict[str, Any]) -> None:
+    """
+    Handle one client message for `ws`. `ws` may also be a cluster.RemoteSocket
+    standing in for a connection held by another worker.
+    """
+    msg = ClientMessage(**raw)
+    t = msg.type
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("message", extra=ctx(ws, t))
+    p = msg.payload or {}
+
+    # -------------------------
+    # PONG: RTT measured by the shard holding the client socket (cluster only)
+    # -------------------------
+    if t == "pong":
+        rtt = p.get("rttMs")
+        if isinstance(rtt, (int, float)):
+            ws.state.rtt_ms = rtt
+        return
+
+    # -------------------------
+    # Spectators are read-only
+    # -------------------------
+    if getattr(ws.state, "spectator", False) and t not in ("get_round_history", "get_card_counts", "spectate_game"):
+        await _send(ws, "error", {"message": "Spectators cannot play. Open a new connection to join."})
+        return
+
+    # -------------------------
+    # SPECTATE game (read-only viewer)
+    # -------------------------
+    if t == "spectate_game":
+        code = str(p.get("code", "")).strip().upper()
+
+        if ws.state.code:
+            await _send(ws, "error", {"message": "Spectate failed: already in a game"})
+            return
+        try:
+            engine = store.get_game(code)
+        except Exception as e:
+            await _send(ws, "error", {"message": f"Spectate failed: {e}"})
+            return
+        if settings.max_spectators and len(store.spectators(code)) >= settings.max_spectators:
+            await _send(ws, "error", {"message": "Spectate failed: too many spectators"})
+            return
+
+        ws.state.code = code
+        ws.state.spectator = True
+        store.add_spectator(code, ws)
+
+        await _send(ws, "spectating", {"code": code})
+        await _send(ws, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # TABLE creates a game
+    # -------------------------
+    if t == "create_table":
+        try:
+            rules = RuleSet.from_payload(p.get("rules"))
+        except ValueError as e:
+            await _send(ws, "error", {"message": f"Create failed: {e}"})
+            return
+        engine = store.create_game(accept_code=cluster.owns, rules=rules)
+        recorder.game_created(engine.game.code, engine.seed)
+        ws.state.code = engine.game.code
+        ws.state.is_table = True  # the table view; table-only commands check this
+        store.register_socket(engine.game.code, ws)
+
+        await _send(ws, "table_created", {"code": engine.game.code})
+        await _broadcast(engine.game.code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # JOIN game (player)
+    # -------------------------
+    if t == "join_game":
+        code = str(p.get("code", "")).strip().upper()
+        name = str(p.get("name", "Player")).strip()[:24]
+
+        try:
+            engine = store.get_game(code)
+        except Exception as e:
+            await _send(ws, "error", {"message": f"Join failed: {e}"})
+            return
+
+        try:
+            player_id, token = engine.add_player(name)
+        except Exception as e:
+            await _send(ws, "error", {"message": f"Join failed: {e}"})
+            return
+
+        # Bind the socket only once it is a player: a failed join leaves it unattached.
+        ws.state.code = code
+        ws.state.player_id = player_id
+        ws.state.is_table = False
+        store.register_socket(code, ws)
+        store.bind_player(code, player_id, ws)
+        recorder.joined(ws.state.conn_id, code, player_id, token)
+
+        await _send(ws, "joined", {"playerId": player_id, "token": token, "code": code})
+        await _send(ws, "player_private_state", engine.private_state(player_id))
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # RESUME game (player reconnect)
+    # -------------------------
+    if t == "resume_game":
+        code = str(p.get("code", "")).strip().upper()
+        token = str(p.get("token", "")).strip()
+
+        try:
+            engine = store.get_game(code)
+        except Exception as e:
+            await _send(ws, "error", {"message": f"Resume failed: {e}"})
+            return
+
+        try:
+            player_id = engine.player_id_from_token(token)
+        except Exception:
+            await _send(ws, "error", {"message": "Invalid token"})
+            return
+
+        ws.state.code = code
+        ws.state.player_id = player_id
+        ws.state.is_table = False
+        store.register_socket(code, ws)
+        store.bind_player(code, player_id, ws)
+
+        await _send(ws, "player_private_state", engine.private_state(player_id))
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+
+    # -------------------------
+    # Must be bound to a game
+    # -------------------------
+    code = ws.state.code
+    if not code:
+        await _send(ws, "error", {"message": "Not in a game yet. Create or join first."})
+        return
+
+    engine = store.get_game(code)
+
+    # -------------------------
+    # DEBUG (dev only)
+    # -------------------------
+    DEBUG = True # Toggle this to enable debug features
+    if DEBUG and t == "debug_set_player_grid":
+        token = str(p.get("token", ""))
+        values = p.get("values")
+        face_up = p.get("faceUp")
+        removed = p.get("removed")
+
+        try:
+            player_id = engine.player_id_from_token(token)
+            pl = engine._get_player(player_id)
+            if values is not None:
+                pl.grid_values = list(values)
+            if face_up is not None:
+                pl.grid_face_up = list(face_up)
+            if removed is not None:
+                pl.grid_removed = list(removed)
+            engine.mark_player_dirty(player_id)
+            engine.unseen.recount(engine.game)
+            engine.zobrist.rehash(engine.game)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        await _broadcast(code, "info", {"message": "DEBUG: player grid set"})
+        # deterministisch einde
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # READY
+    # -------------------------
+    if t == "set_ready":
+        token = str(p.get("token", ""))
+        ready = bool(p.get("ready", True))
+
+        try:
+            player_id = engine.player_id_from_token(token)
+        except Exception:
+            await _send(ws, "error", {"message": "Invalid token"})
+            return
+
+        try:
+            engine.set_ready(player_id, ready)
+            started = engine.start_game_if_ready()
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        if started:
+            await _broadcast(code, "info", {"message": "Game started. Each player reveal 2 cards."})
+            # ✅ deterministisch: laatste bericht is public_state
+            await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # SETUP REVEAL
+    # -------------------------
+    if t == "setup_reveal":
+        token = str(p.get("token", ""))
+        index = int(p.get("index", -1))
+
+        try:
+            player_id = engine.player_id_from_token(token)
+            removed_events = engine.reveal_setup_card(player_id, index)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+
+        if removed_events:
+            player_name = engine._get_player(player_id).name
+            for ev in removed_events:
+                await _broadcast(code, "info", {
+                    "message": f"Column removed for {player_name} (value {ev['value']})",
+                    "event": {"type": "column_removed", "playerId": player_id, **ev}
+                })
+
+        if engine.game.phase.value == "TURN_CHOOSE_SOURCE":
+            await _broadcast(code, "info", {"message": "Setup done. Turns can begin."})
+            # ✅ deterministisch einde
+            await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # TABLE: set selection
+    # -------------------------
+    if t == "table_set_selection":
+        source = p.get("source", None)
+        if source is not None:
+            source = str(source)
+
+        try:
+            engine.set_table_selection(source)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await table_ui.request(code)
+        return
+
+    # -------------------------
+    # TABLE: set deck mode
+    # -------------------------
+    if t == "table_set_deck_mode":
+        mode = str(p.get("mode", ""))
+
+        try:
+            engine.set_table_deck_mode(mode)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await table_ui.request(code)
+        return
+
+    # -------------------------
+    # TABLE: undo the last turn command (host)
+    # -------------------------
+    if t == "undo_turn":
+        if not ws.state.is_table:
+            await _send(ws, "error", {"message": "Only the table can undo."})
+            return
+
+        try:
+            changed = engine.undo()
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        # Public state plus private state for the players the undo touched only.
+        await _refresh_all(code, engine)
+        await _broadcast(code, "info", {
+            "message": "Last move undone.",
+            "event": {"type": "turn_undone", "playerIds": changed, "canUndo": engine.can_undo()},
+        })
+        # ✅ deterministisch einde
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # TURN: draw from deck
+    # -------------------------
+    if t == "draw_from_deck":
+        token = str(p.get("token", ""))
+        try:
+            player_id = engine.player_id_from_token(token)
+            engine.draw_from_deck(player_id)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        return
+
+    # -------------------------
+    # TURN: take discard
+    # -------------------------
+    if t == "take_discard":
+        token = str(p.get("token", ""))
+        try:
+            player_id = engine.player_id_from_token(token)
+            engine.take_discard(player_id)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        return
+
+    # -------------------------
+    # TURN: discard drawn card
+    # -------------------------
+    if t == "discard_drawn":
+        token = str(p.get("token", ""))
+        try:
+            player_id = engine.player_id_from_token(token)
+            engine.discard_drawn(player_id)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        await _broadcast_engine_events(code, engine)
+
+        if engine.game.phase.value == "ROUND_OVER":
+            await _refresh_all(code, engine)
+
+        # ✅ deterministisch einde
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # TURN: discard drawn card and reveal
+    # -------------------------
+    if t == "discard_drawn_and_reveal":
+        token = str(p.get("token", ""))
+        index = int(p.get("index", -1))
+
+        try:
+            player_id = engine.player_id_from_token(token)
+            removed_events = engine.discard_drawn_and_reveal(player_id, index)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+
+        if removed_events:
+            player_name = engine._get_player(player_id).name
+            for ev in removed_events:
+                await _broadcast(code, "info", {
+                    "message": f"Column removed for {player_name} (value {ev['value']})",
+                    "event": {"type": "column_removed", "playerId": player_id, **ev}
+                })
+
+        await _broadcast_engine_events(code, engine)
+
+        if engine.game.phase.value == "ROUND_OVER":
+            await _refresh_all(code, engine)
+
+        # ✅ deterministisch einde
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # TURN: swap into grid
+    # -------------------------
+    if t == "swap_into_grid":
+        token = str(p.get("token", ""))
+        index = int(p.get("index", -1))
+
+        try:
+            player_id = engine.player_id_from_token(token)
+            removed_events = engine.swap_into_grid(player_id, index)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+
+        if removed_events:
+            player_name = engine._get_player(player_id).name
+            for ev in removed_events:
+                await _broadcast(code, "info", {
+                    "message": f"Column removed for {player_name} (value {ev['value']})",
+                    "event": {"type": "column_removed", "playerId": player_id, **ev}
+                })
+
+        await _broadcast_engine_events(code, engine)
+
+        if engine.game.phase.value == "ROUND_OVER":
+            await _refresh_all(code, engine)
+
+        # ✅ deterministisch einde
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # ROUND: start new round
+    # -------------------------
+    if t == "start_new_round":
+        token = str(p.get("token", ""))
+        try:
+            player_id = engine.player_id_from_token(token)
+            engine.start_new_round(player_id)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _refresh_all(code, engine)
+        await _broadcast_engine_events(code, engine)
+        await _broadcast(code, "info", {"message": "New round: each player reveal 2 cards."})
+
+        # ✅ CRUCIAAL: laatste bericht is game_public_state met SETUP_REVEAL
+        await _broadcast(code, "game_public_state", engine.public_state())
+        return
+
+    # -------------------------
+    # HISTORY: paginated round scores (on demand)
+    # -------------------------
+    if t == "get_round_history":
+        try:
+            page = engine.round_history_page(
+                offset=int(p.get("offset", 0)),
+                limit=int(p.get("limit", 20)),
+            )
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        await _send(ws, "round_history", page)
+        return
+
+    # -------------------------
+    # CARD COUNTS: unseen cards per value (on demand)
+    # -------------------------
+    if t == "get_card_counts":
+        await _send(ws, "card_counts", engine.card_counts())
+        return
+
+    # -------------------------
+    # HINT: expected score change per legal action (current player only)
+    # -------------------------
+    if t == "request_hint":
+        token = str(p.get("token", ""))
+        try:
+            player_id = engine.player_id_from_token(token)
+            key, order = engine.hint_key(player_id)
+        except Exception as e:
+            await _send(ws, "error", {"message": str(e)})
+            return
+
+        result = hints.get(key)
+        if result is None:
+            HINTS.inc("miss")
+            # A few thousand float ops on a cold key: keep them off the event loop.
+            result = await asyncio.to_thread(evaluate, key)
+            hints.put(key, result)
+        else:
+            HINTS.inc("hit")
+        await _send(ws, "hint", hint_payload(key, result, order))
+        return
+
+    await _send(ws, "error", {"message": f"Unknown event type: {t}"})
 
 
 # -------------------------
 # WebSocket endpoint
 # -------------------------
+def _target_code(ws: WebSocket, raw: Any) -> Optional[str]:
+    """Game a message will act on, for the per-game rate limit."""
+    if isinstance(raw, dict) and raw.get("type") in ("join_game", "resume_game", "spectate_game"):
+        return str((raw.get("payload") or {}).get("code", "")).strip().upper() or None
+    return ws.state.code or getattr(ws.state, "remote_code", None)
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
-    print("WS CONNECT")
     await ws.accept()
+    if not admission.connect():
+        THROTTLED.inc("max_connections")
+        await ws.close(code=CLOSE_TRY_AGAIN_LATER, reason="Server full")
+        return
 
     ws.state.code = None
     ws.state.player_id = None
+    ws.state.is_table = False
+    cluster.attach(ws)
+    heartbeat.track(ws)
+    sampled.log(log, logging.INFO, "ws_connect", "WS CONNECT")
+    bucket = admission.connection_bucket()
+    streak = 0  # consecutive throttled messages
 
     try:
         while True:
             raw = await ws.receive_json()
-            msg = ClientMessage(**raw)
-            t = msg.type
-            p = msg.payload or {}
-
-            # -------------------------
-            # TABLE creates a game
-            # -------------------------
-            if t == "create_table":
-                engine = store.create_game()
-                ws.state.code = engine.game.code
-                store.register_socket(engine.game.code, ws)
-
-                await _send(ws, "table_created", {"code": engine.game.code})
-                await _broadcast(engine.game.code, "game_public_state", engine.public_state())
+            heartbeat.seen(ws)
+
+            if isinstance(raw, dict) and raw.get("type") == "pong":
+                # Not admission-limited (the server asked for it) and not
+                # recorded (no game state depends on it). A shard owning the
+                # game elsewhere gets the measured RTT, never a client-supplied one.
+                rtt = heartbeat.pong(ws, raw.get("payload") or {})
+                if rtt is not None:
+                    RTT_SECONDS.observe(rtt / 1000)
+                    if ws.state.remote_code:
+                        await cluster.route(ws, {"type": "pong", "payload": {"rttMs": rtt}})
                 continue
 
-            # -------------------------
-            # JOIN game (player)
-            # -------------------------
-            if t == "join_game":
-                code = str(p.get("code", "")).strip().upper()
-                name = str(p.get("name", "Player")).strip()[:24]
-
-                try:
-                    engine = store.get_game(code)
-                except Exception as e:
-                    await _send(ws, "error", {"message": f"Join failed: {e}"})
-                    continue
-
-                ws.state.code = code
-                store.register_socket(code, ws)
-
-                try:
-                    player_id, token = engine.add_player(name)
-                except Exception as e:
-                    await _send(ws, "error", {"message": f"Join failed: {e}"})
-                    continue
-
-                ws.state.player_id = player_id
-
-                await _send(ws, "joined", {"playerId": player_id, "token": token, "code": code})
-                await _send(ws, "player_private_state", engine.private_state(player_id))
-                await _broadcast(code, "game_public_state", engine.public_state())
+            limit = admission.check(bucket, _target_code(ws, raw))
+            if limit is None and isinstance(raw, dict) and raw.get("type") == "create_table" \
+                    and admission.games_full(store.game_count()):
+                limit = "max_games"
+            if limit is not None:
+                THROTTLED.inc(limit)
+                if limit == "max_games":
+                    await _send(ws, "error", {"message": "Server is full, try again later."})
+                    await ws.close(code=CLOSE_TRY_AGAIN_LATER, reason="Too many games")
+                    break
+                streak += 1
+                if limit == "conn_rate" and admission.abusive(streak):
+                    THROTTLED.inc("closed")
+                    await ws.close(code=CLOSE_POLICY_VIOLATION, reason="Rate limit exceeded")
+                    break
+                if streak == 1:
+                    # One error per throttled streak: replying to every dropped
+                    # message would hand the flood straight back.
+                    await _send(ws, "error", {"message": "Too many messages, slow down.", "throttled": limit})
                 continue
+            streak = 0
 
-            # -------------------------
-            # RESUME game (player reconnect)
-            # -------------------------
-            if t == "resume_game":
-                code = str(p.get("code", "")).strip().upper()
-                token = str(p.get("token", "")).strip()
-
-                try:
-                    engine = store.get_game(code)
-                except Exception as e:
-                    await _send(ws, "error", {"message": f"Resume failed: {e}"})
-                    continue
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                except Exception:
-                    await _send(ws, "error", {"message": "Invalid token"})
-                    continue
-
-                ws.state.code = code
-                ws.state.player_id = player_id
-                store.register_socket(code, ws)
-
-                await _send(ws, "player_private_state", engine.private_state(player_id))
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+            recorder.inbound(ws.state.conn_id, raw)
+            t0 = time.perf_counter()
+            await cluster.route(ws, raw)
+            MESSAGE_SECONDS.observe(
+                time.perf_counter() - t0,
+                message_label(raw.get("type") if isinstance(raw, dict) else None),
+            )
 
+    except WebSocketDisconnect:
+        pass
+    finally:
+        heartbeat.untrack(ws)
+        admission.disconnect()
+        recorder.disconnect(ws.state.conn_id)
+        await cluster.detach(ws)
 
-            # -------------------------
-            # Must be bound to a game
-            # -------------------------
-            code = ws.state.code
-            if not code:
-                await _send(ws, "error", {"message": "Not in a game yet. Create or join first."})
-                continue
 
-            engine = store.get_game(code)
+async def _handle_and_commit(ws: WebSocket, raw: Any) -> None:
+    """Every handled command ends by publishing the game's frozen snapshot."""
+    try:
+        await handle_message(ws, raw)
+    finally:
+        engine = store.games_by_code.get(ws.state.code) if ws.state.code else None
+        if engine is not None:
+            engine.commit()
 
-            # -------------------------
-            # DEBUG (dev only)
-            # -------------------------
-            DEBUG = True # Toggle this to enable debug features
-            if DEBUG and t == "debug_set_player_grid":
-                token = str(p.get("token", ""))
-                values = p.get("values")
-                face_up = p.get("faceUp")
-                removed = p.get("removed")
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    pl = engine._get_player(player_id)
-                    if values is not None:
-                        pl.grid_values = list(values)
-                    if face_up is not None:
-                        pl.grid_face_up = list(face_up)
-                    if removed is not None:
-                        pl.grid_removed = list(removed)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-                await _broadcast(code, "info", {"message": "DEBUG: player grid set"})
-                # deterministisch einde
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
 
-            # -------------------------
-            # READY
-            # -------------------------
-            if t == "set_ready":
-                token = str(p.get("token", ""))
-                ready = bool(p.get("ready", True))
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                except Exception:
-                    await _send(ws, "error", {"message": "Invalid token"})
-                    continue
-
-                engine.set_ready(player_id, ready)
-                started = engine.start_game_if_ready()
-
-                await _refresh_all(code, engine)
-                if started:
-                    await _broadcast(code, "info", {"message": "Game started. Each player reveal 2 cards."})
-                    # ✅ deterministisch: laatste bericht is public_state
-                    await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+cluster.bind_handler(_handle_and_commit)
 
-            # -------------------------
-            # SETUP REVEAL
-            # -------------------------
-            if t == "setup_reveal":
-                token = str(p.get("token", ""))
-                index = int(p.get("index", -1))
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    removed_events = engine.reveal_setup_card(player_id, index)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-
-                if removed_events:
-                    player_name = engine._get_player(player_id).name
-                    for ev in removed_events:
-                        await _broadcast(code, "info", {
-                            "message": f"Column removed for {player_name} (value {ev['value']})",
-                            "event": {"type": "column_removed", "playerId": player_id, **ev}
-                        })
-
-                if engine.game.phase.value == "TURN_CHOOSE_SOURCE":
-                    await _broadcast(code, "info", {"message": "Setup done. Turns can begin."})
-                    # ✅ deterministisch einde
-                    await _broadcast(code, "game_public_state", engine.public_state())
-                continue
 
-            # -------------------------
-            # TABLE: set selection
-            # -------------------------
-            if t == "table_set_selection":
-                source = p.get("source", None)
-                if source is not None:
-                    source = str(source)
-
-                try:
-                    engine.set_table_selection(source)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+# -------------------------
+# Read-only HTTP views (scoreboards, TV table display)
+# -------------------------
+# Served from public_feed: the frame the players got, never re-encoded here.
+# With several shards, a worker that does not own the game mirrors it: it
+# spectates the game on the owner through the cluster (like any proxied
+# client socket) and publishes the frames it receives into its own feed.
+MIRROR_WAIT_S = 2.0   # first frame from the owner
+MIRROR_IDLE_S = 30.0  # a mirror without streams or requests for this long is dropped
 
-            # -------------------------
-            # TABLE: set deck mode
-            # -------------------------
-            if t == "table_set_deck_mode":
-                mode = str(p.get("mode", ""))
+_GAME_STATE_PREFIX = '{"type":"game_public_state",'
+_ERROR_PREFIX = '{"type":"error",'
 
-                try:
-                    engine.set_table_deck_mode(mode)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
 
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+class _OwnerMirror:
+    """Spectator connection to the shard owning `code`; frames land in public_feed."""
 
-            # -------------------------
-            # TURN: draw from deck
-            # -------------------------
-            if t == "draw_from_deck":
-                token = str(p.get("token", ""))
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    engine.draw_from_deck(player_id)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _broadcast(code, "game_public_state", engine.public_state())
-                await _send_private(code, engine, player_id)
-                continue
+    def __init__(self, code: str):
+        self.code = code
+        self.state = SimpleNamespace(code=None, player_id=None, is_table=False)
+        self.answered = asyncio.Event()
+        self.error: Optional[str] = None
+        self.streams = 0
+        self.used = time.monotonic()
+        self.reaper: Optional[asyncio.Task] = None
 
-            # -------------------------
-            # TURN: take discard
-            # -------------------------
-            if t == "take_discard":
-                token = str(p.get("token", ""))
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    engine.take_discard(player_id)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _broadcast(code, "game_public_state", engine.public_state())
-                await _send_private(code, engine, player_id)
-                continue
+    async def send_text(self, text: str) -> None:
+        if text.startswith(_GAME_STATE_PREFIX):
+            public_feed.publish(self.code, text)
+            self.answered.set()
+        elif text.startswith(_ERROR_PREFIX) and not self.answered.is_set():
+            self.error = json.loads(text)["payload"]["message"]
+            self.answered.set()
 
-            # -------------------------
-            # TURN: discard drawn card
-            # -------------------------
-            if t == "discard_drawn":
-                token = str(p.get("token", ""))
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    engine.discard_drawn(player_id)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-                await _broadcast_engine_events(code, engine)
-
-                if engine.game.phase.value == "ROUND_OVER":
-                    await _refresh_all(code, engine)
-
-                # ✅ deterministisch einde
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+    async def send_json(self, data: Any) -> None:
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
 
-            # -------------------------
-            # TURN: discard drawn card and reveal
-            # -------------------------
-            if t == "discard_drawn_and_reveal":
-                token = str(p.get("token", ""))
-                index = int(p.get("index", -1))
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    removed_events = engine.discard_drawn_and_reveal(player_id, index)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-
-                if removed_events:
-                    player_name = engine._get_player(player_id).name
-                    for ev in removed_events:
-                        await _broadcast(code, "info", {
-                            "message": f"Column removed for {player_name} (value {ev['value']})",
-                            "event": {"type": "column_removed", "playerId": player_id, **ev}
-                        })
-
-                await _broadcast_engine_events(code, engine)
-
-                if engine.game.phase.value == "ROUND_OVER":
-                    await _refresh_all(code, engine)
-
-                # ✅ deterministisch einde
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
 
-            # -------------------------
-            # TURN: swap into grid
-            # -------------------------
-            if t == "swap_into_grid":
-                token = str(p.get("token", ""))
-                index = int(p.get("index", -1))
-
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    removed_events = engine.swap_into_grid(player_id, index)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-
-                if removed_events:
-                    player_name = engine._get_player(player_id).name
-                    for ev in removed_events:
-                        await _broadcast(code, "info", {
-                            "message": f"Column removed for {player_name} (value {ev['value']})",
-                            "event": {"type": "column_removed", "playerId": player_id, **ev}
-                        })
-
-                await _broadcast_engine_events(code, engine)
-
-                if engine.game.phase.value == "ROUND_OVER":
-                    await _refresh_all(code, engine)
-
-                # ✅ deterministisch einde
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
+_mirrors: Dict[str, _OwnerMirror] = {}
 
-            # -------------------------
-            # ROUND: start new round
-            # -------------------------
-            if t == "start_new_round":
-                token = str(p.get("token", ""))
-                try:
-                    player_id = engine.player_id_from_token(token)
-                    engine.start_new_round(player_id)
-                except Exception as e:
-                    await _send(ws, "error", {"message": str(e)})
-                    continue
-
-                await _refresh_all(code, engine)
-                await _broadcast_engine_events(code, engine)
-                await _broadcast(code, "info", {"message": "New round: each player reveal 2 cards."})
-
-                # ✅ CRUCIAAL: laatste bericht is game_public_state met SETUP_REVEAL
-                await _broadcast(code, "game_public_state", engine.public_state())
-                continue
 
-            await _send(ws, "error", {"message": f"Unknown event type: {t}"})
+async def _drop_mirror(m: _OwnerMirror) -> None:
+    if _mirrors.get(m.code) is m:
+        del _mirrors[m.code]
+        public_feed.forget(m.code)
+    await cluster.detach(m)
 
-    except WebSocketDisconnect:
-        if ws.state.code:
-            store.unregister_socket(ws.state.code, ws)
+
+async def _reap_mirror(m: _OwnerMirror) -> None:
+    while m.streams or time.monotonic() - m.used < MIRROR_IDLE_S:
+        await asyncio.sleep(MIRROR_IDLE_S)
+    await _drop_mirror(m)
+
+
+async def _mirror(code: str) -> _OwnerMirror:
+    m = _mirrors.get(code)
+    if m is None:
+        m = _mirrors[code] = _OwnerMirror(code)
+        cluster.attach(m)
+        try:
+            await cluster.route(m, {"type": "spectate_game", "payload": {"code": code}})
+        except ConnectionError:
+            m.error = "Owner shard unavailable"
+            m.answered.set()
+        else:
+            m.reaper = asyncio.create_task(_reap_mirror(m))
+    m.used = time.monotonic()
+    try:
+        await asyncio.wait_for(m.answered.wait(), MIRROR_WAIT_S)
+    except asyncio.TimeoutError:
+        m.error = "Owner shard did not answer"
+    if m.error is not None:
+        if m.reaper is not None:
+            m.reaper.cancel()
+        await _drop_mirror(m)
+        if "not found" in m.error.lower():
+            raise HTTPException(status_code=404, detail="Game not found")
+        raise HTTPException(status_code=503, detail=m.error)
+    return m
+
+
+async def _public_frame(code: str):
+    code = code.strip().upper()
+    try:
+        engine = store.get_game(code)
+    except ValueError:
+        if cluster.enabled and not cluster.owns(code):
+            await _mirror(code)
+            return code, public_feed.latest(code)
+        public_feed.forget(code)
+        raise HTTPException(status_code=404, detail="Game not found")
+    frame = public_feed.latest(code)
+    if frame is None:
+        # Nothing broadcast since this worker got the game (e.g. still dormant).
+        frame = public_feed.publish(code, _encode("game_public_state", engine.public_state()))
+    return code, frame
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+@router.get("/games/{code}/state")
+async def game_state(code: str, if_none_match: Optional[str] = Header(default=None)):
+    _, frame = await _public_frame(code)
+    headers = {"ETag": frame.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, frame.etag):
+        HTTP_STATE.inc("not_modified")
+        return Response(status_code=304, headers=headers)
+    HTTP_STATE.inc("full")
+    return Response(content=frame.body, media_type="application/json", headers=headers)
+
+
+async def _sse_events(code: str, last_event_id: Optional[str]):
+    wake = public_feed.subscribe(code)
+    sent = last_event_id
+    mirror = _mirrors.get(code)
+    if mirror is not None:
+        mirror.streams += 1
+    try:
+        while True:
+            # Cleared before reading, so a publish in between is never missed.
+            wake.clear()
+            frame = public_feed.latest(code)
+            if frame is None:
+                return
+            if frame.tag != sent:
+                # A slow reader skips straight to the newest state.
+                sent = frame.tag
+                yield frame.sse
+            try:
+                await asyncio.wait_for(wake.wait(), settings.sse_keepalive_s)
+            except asyncio.TimeoutError:
+                if not store.has_game(code) and code not in _mirrors:
+                    return
+                yield b": keepalive\n\n"
+    finally:
+        public_feed.unsubscribe(code, wake)
+        if mirror is not None:
+            mirror.streams -= 1
+            mirror.used = time.monotonic()
+
+
+@router.get("/games/{code}/events")
+async def game_events(code: str, last_event_id: Optional[str] = Header(default=None)):
+    code, _ = await _public_frame(code)
+    return StreamingResponse(
+        _sse_events(code, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,330 @@
+"""
+Micro-benchmarks for the game engine hot paths, at several player counts.
+
+    python Backend/benchmarks/engine_bench.py              # run + compare to baseline
+    python Backend/benchmarks/engine_bench.py --update     # (re)write the baseline
+    python Backend/benchmarks/engine_bench.py --only public_state,full_game -p 4
+
+Timings are divided by a fixed pure-Python calibration loop measured right
+before each benchmark, so a baseline recorded on one machine is usable on another. A
+benchmark fails when its normalized time exceeds the baseline by more than
+--threshold (default 25%).
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import marshal
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.models import Phase  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "engine.json"
+PLAYER_COUNTS = (2, 4, 6)  # the 75-card deck deals at most 6 grids
+
+# A benchmark returns (op, setup): setup() builds fresh state for one call
+# outside the timed region, op(state) is the timed call.
+Bench = Callable[[int], Tuple[Callable, Callable]]
+BENCHMARKS: Dict[str, Bench] = {}
+
+
+def bench(fn: Bench) -> Bench:
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+# -------------------------
+# State builders
+# -------------------------
+def _clone(engine: GameEngine) -> GameEngine:
+    return GameEngine.from_snapshot(marshal.loads(marshal.dumps(engine.to_snapshot())))
+
+
+def _lobby(n_players: int, seed: int = 1) -> Tuple[GameEngine, List[str]]:
+    engine = GameEngine(code="BNCH", seed=seed)
+    ids = []
+    for i in range(n_players):
+        pid, _ = engine.add_player(f"P{i}")
+        engine.set_ready(pid)
+        ids.append(pid)
+    return engine, ids
+
+
+def in_turns(n_players: int, seed: int = 1) -> GameEngine:
+    engine, ids = _lobby(n_players, seed)
+    engine.start_game_if_ready()
+    for pid in ids:
+        engine.reveal_setup_card(pid, 0)
+        engine.reveal_setup_card(pid, 5)
+    # A few turns in, so grids are a realistic mix of face-up/down cards.
+    for _ in range(2 * n_players):
+        _greedy_turn(engine)
+        if engine.game.phase != Phase.TURN_CHOOSE_SOURCE:
+            break
+    engine.consume_events()
+    engine.consume_dirty_players()
+    return engine
+
+
+def _current_id(engine: GameEngine) -> str:
+    return engine.game.players[engine.game.current_player_idx].id
+
+
+def _greedy_turn(engine: GameEngine) -> None:
+    """One legal turn for the current player: keep low cards, otherwise reveal."""
+    g = engine.game
+    p = g.players[g.current_player_idx]
+    live = [i for i in range(g.grid_size) if not p.grid_removed[i]]
+    down = [i for i in live if not p.grid_face_up[i]]
+    up = [i for i in live if p.grid_face_up[i]]
+    worst = max(up, key=lambda i: p.grid_values[i]) if up else None
+
+    top = g.discard[-1] if g.discard else None
+    if top is not None and top <= 2 and worst is not None and p.grid_values[worst] > top:
+        engine.take_discard(p.id)
+        engine.swap_into_grid(p.id, worst)
+        return
+
+    card = engine.draw_from_deck(p.id)
+    if worst is not None and p.grid_values[worst] > card:
+        engine.swap_into_grid(p.id, worst)
+    elif down and card <= 4:
+        engine.swap_into_grid(p.id, down[0])
+    elif down:
+        engine.discard_drawn_and_reveal(p.id, down[0])
+    else:
+        engine.discard_drawn(p.id)
+
+
+def play_full_game(n_players: int, seed: int = 1) -> int:
+    """Play LOBBY -> GAME_OVER with greedy players. Returns the number of rounds."""
+    engine, ids = _lobby(n_players, seed)
+    engine.start_game_if_ready()
+    while True:
+        for pid in ids:
+            engine.reveal_setup_card(pid, 0)
+            engine.reveal_setup_card(pid, 5)
+        while engine.game.phase == Phase.TURN_CHOOSE_SOURCE:
+            _greedy_turn(engine)
+            engine.public_state()
+            for pid in engine.consume_dirty_players():
+                engine.private_state(pid)
+            engine.consume_events()
+        engine.start_new_round(ids[0])
+        if engine.game.phase == Phase.GAME_OVER:
+            return engine.game.round_index
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+@bench
+def public_state(n):
+    engine = in_turns(n)
+    return (lambda e: e.public_state()), (lambda: engine)
+
+
+@bench
+def private_state(n):
+    engine = in_turns(n)
+    pid = _current_id(engine)
+    return (lambda e: e.private_state(pid)), (lambda: engine)
+
+
+@bench
+def swap_into_grid(n):
+    engine = in_turns(n)
+    engine.draw_from_deck(_current_id(engine))
+    pid = _current_id(engine)
+    return (lambda e: e.swap_into_grid(pid, 1)), (lambda: _clone(engine))
+
+
+@bench
+def discard_drawn_and_reveal(n):
+    engine = in_turns(n)
+    pid = _current_id(engine)
+    engine.draw_from_deck(pid)
+    p = engine._get_player(pid)
+    idx = next(i for i in range(12) if not p.grid_face_up[i] and not p.grid_removed[i])
+    return (lambda e: e.discard_drawn_and_reveal(pid, idx)), (lambda: _clone(engine))
+
+
+@bench
+def check_and_remove_columns(n):
+    # Common case: every column face-up, none removable (full scan, no mutation).
+    engine = in_turns(n)
+    p = engine.game.players[0]
+    p.grid_values = [c % 4 + (c // 4) for c in range(12)]
+    p.grid_face_up = [True] * 12
+    p.grid_removed = [False] * 12
+    return (lambda e: e._check_and_remove_columns(p)), (lambda: engine)
+
+
+@bench
+def end_round(n):
+    engine = in_turns(n)
+    engine.game.final_round = True
+    engine.game.finisher_id = _current_id(engine)
+    return (lambda e: e._end_round()), (lambda: _clone(engine))
+
+
+@bench
+def start_new_round(n):
+    engine = in_turns(n)
+    engine._end_round()
+    engine.consume_events()
+    requester = engine.game.players[0].id
+    return (lambda e: e.start_new_round(requester)), (lambda: _clone(engine))
+
+
+@bench
+def draw_with_reshuffle(n):
+    engine = in_turns(n)
+    g = engine.game
+    g.discard = g.discard + g.deck
+    g.deck = []
+    return (lambda e: e._draw()), (lambda: _clone(engine))
+
+
+@bench
+def full_game(n):
+    seeds = iter(range(1, 1_000_000))
+    return (lambda seed: play_full_game(n, seed)), (lambda: next(seeds))
+
+
+# -------------------------
+# Runner
+# -------------------------
+def _calibrate() -> float:
+    """ns for a fixed amount of interpreter work; the unit all results are expressed in."""
+    def work():
+        acc = 0
+        for i in range(2000):
+            acc += i * i % 7
+        return acc
+
+    return _measure(work, lambda: None, target_s=0.05)
+
+
+def _measure(op: Callable, setup: Callable, target_s: float = 0.2, repeats: int = 5) -> float:
+    """Best of `repeats` rounds of the mean ns per call; setup is not timed.
+
+    The minimum rather than the median: on a shared machine noise only ever
+    adds time, so the fastest round is the most repeatable number.
+    """
+    # Size a round so it takes about target_s / repeats.
+    state = setup()
+    t0 = time.perf_counter()
+    op(state) if state is not None else op()
+    once = max(time.perf_counter() - t0, 1e-7)
+    per_round = max(1, min(20_000, int(target_s / repeats / once)))
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            states = [setup() for _ in range(per_round)]
+            t0 = time.perf_counter()
+            if states[0] is None:
+                for _ in states:
+                    op()
+            else:
+                for s in states:
+                    op(s)
+            samples.append((time.perf_counter() - t0) / per_round * 1e9)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return min(samples)
+
+
+def run(names: List[str], players: List[int], quick: bool = False) -> dict:
+    target = 0.05 if quick else 0.3
+    results = {}
+    calibrations = []
+    for name in names:
+        for n in players:
+            op, setup = BENCHMARKS[name](n)
+            # Calibrate next to every measurement so frequency/load drift hits both.
+            calibration = _calibrate()
+            calibrations.append(calibration)
+            ns = _measure(op, setup, target_s=target, repeats=3 if quick else 7)
+            results[f"{name}[{n}p]"] = {"ns": round(ns, 1), "rel": round(ns / calibration, 4)}
+    calibration_ns = statistics.median(calibrations) if calibrations else _calibrate()
+    return {"calibration_ns": round(calibration_ns, 1), "python": sys.version.split()[0], "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Names whose normalized time grew by more than `threshold` (0.25 = 25%)."""
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        if cur["rel"] > base["rel"] * (1 + threshold):
+            regressions.append(f"{key}: {base['rel']:.4f} -> {cur['rel']:.4f} (+{cur['rel'] / base['rel'] - 1:.0%})")
+    return regressions
+
+
+def _fmt_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:8.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:8.2f} us"
+    return f"{ns:8.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--only", default="", help="comma-separated benchmark names")
+    ap.add_argument("-p", "--players", default=",".join(map(str, PLAYER_COUNTS)))
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.25)
+    ap.add_argument("--update", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--quick", action="store_true", help="shorter runs (noisier)")
+    args = ap.parse_args(argv)
+
+    names = [n for n in args.only.split(",") if n] or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        ap.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    players = [int(x) for x in args.players.split(",")]
+
+    current = run(names, players, quick=args.quick)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+
+    print(f"calibration: {_fmt_ns(current['calibration_ns'])}  (python {current['python']})")
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        delta = f"{cur['rel'] / base['rel'] - 1:+7.1%}" if base else "    new"
+        print(f"  {key:34s} {_fmt_ns(cur['ns'])}  {delta}")
+
+    if args.update:
+        merged = dict(baseline, calibration_ns=current["calibration_ns"], python=current["python"])
+        merged["results"] = {**baseline.get("results", {}), **current["results"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print("✅ no regressions" if baseline["results"] else "(no baseline yet; run with --update)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,333 @@
+"""
+Fan-out benchmark: the ws.py send layer against thousands of in-memory sockets.
+
+    python Backend/benchmarks/fanout_bench.py                        # default grid
+    python Backend/benchmarks/fanout_bench.py --tables 100,1000 --sockets 8 --ops broadcast
+    python Backend/benchmarks/fanout_bench.py --latency-ms 0.2 --fail-rate 0.05 --fail-mode disconnect
+
+Each table is a real GameEngine in TURN_CHOOSE_SOURCE registered in a private
+GameStore, with --sockets fake WebSockets (the first --players bound to a
+player, the rest unbound like the table view). Ops, each run for every table
+concurrently on one event loop, as a single worker would:
+
+    broadcast       _broadcast(game_public_state) with a precomputed payload
+    send_private    _send_private for the current player
+    refresh_all     _refresh_all with every player dirty
+    engine_events   _broadcast_engine_events with two pending events
+
+Reported per grid point: frames/sec, the share of time spent in _encode, and
+p50/p99/max latency of one fan-out call. With --fail-rate a fraction of the
+sockets starts failing before every iteration (churn); _broadcast and
+_send_private must reap them, and they are replaced by fresh connections.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Optional
+
+os.environ.setdefault("SKYJO_SNAPSHOT_DIR", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi import WebSocketDisconnect  # noqa: E402
+
+from Backend.app import ws as ws_module  # noqa: E402
+from Backend.app.game.engine import GameEngine  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+from engine_bench import in_turns  # noqa: E402
+
+FAIL_MODES = ("disconnect", "closed", "error")
+
+
+# -------------------------
+# Fake sockets
+# -------------------------
+class FakeWebSocket:
+    """
+    Stand-in for a Starlette WebSocket: send_text with an optional delay and
+    failure. `fail` is None (healthy) or one of FAIL_MODES:
+
+        disconnect  raises WebSocketDisconnect (peer went away)
+        closed      raises RuntimeError, as Starlette does after close
+        error       raises a generic exception; _broadcast must keep the socket
+    """
+
+    __slots__ = ("state", "latency_s", "fail", "frames", "nbytes")
+
+    def __init__(self, code: str, player_id: Optional[str] = None, latency_s: float = 0.0):
+        self.state = SimpleNamespace(code=code, player_id=player_id)
+        self.latency_s = latency_s
+        self.fail: Optional[str] = None
+        self.frames = 0
+        self.nbytes = 0
+
+    async def send_text(self, text: str) -> None:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if self.fail == "disconnect":
+            raise WebSocketDisconnect(1006)
+        if self.fail == "closed":
+            raise RuntimeError('Cannot call "send" once a close message has been sent.')
+        if self.fail == "error":
+            raise ValueError("injected send failure")
+        self.frames += 1
+        self.nbytes += len(text)
+
+
+# -------------------------
+# Fleet: store + tables + sockets
+# -------------------------
+@dataclass
+class Fleet:
+    tables: int
+    sockets_per_table: int
+    players: int = 4
+    latency_s: float = 0.0
+    seed: int = 1
+    store: GameStore = field(default_factory=GameStore)
+    engines: Dict[str, GameEngine] = field(default_factory=dict)
+    public: Dict[str, dict] = field(default_factory=dict)
+    # Sockets that left the store through the reap path, across the whole run.
+    retired: List[FakeWebSocket] = field(default_factory=list)
+
+    def build(self) -> "Fleet":
+        template = in_turns(self.players, self.seed)
+        snap = template.to_snapshot()
+        for i in range(self.tables):
+            engine = GameEngine.from_snapshot(snap)
+            engine.game.code = f"B{i:05d}"
+            code = engine.game.code
+            self.store.adopt_game(engine)
+            self.engines[code] = engine
+            self.public[code] = engine.public_state()
+            for j in range(self.sockets_per_table):
+                self._connect(code, j)
+        return self
+
+    def _connect(self, code: str, seat: int) -> FakeWebSocket:
+        players = self.engines[code].game.players
+        pid = players[seat].id if seat < len(players) else None
+        s = FakeWebSocket(code, pid, self.latency_s)
+        self.store.register_socket(code, s)
+        if pid is not None:
+            self.store.bind_player(code, pid, s)
+        return s
+
+    def all_sockets(self) -> List[FakeWebSocket]:
+        return [s for code in self.engines for s in self.store.sockets(code)]
+
+    def socket_count(self) -> int:
+        return sum(len(self.store.sockets_by_code.get(code, ())) for code in self.engines)
+
+    def frames(self) -> int:
+        return sum(s.frames for s in self.all_sockets()) + sum(s.frames for s in self.retired)
+
+    def churn(self, rng: random.Random, rate: float, mode: str) -> List[FakeWebSocket]:
+        """Make `rate` of the live sockets fail from now on; returns them."""
+        live = [s for s in self.all_sockets() if s.fail is None]
+        failing = rng.sample(live, int(len(live) * rate))
+        for s in failing:
+            s.fail = mode
+        return failing
+
+    def replace(self, failing: List[FakeWebSocket]) -> int:
+        """
+        Reconnect every failing socket the send layer reaped; the ones it kept
+        (transient errors, or sockets the op never sent to) recover. Returns
+        the reaped count.
+        """
+        reaped = 0
+        for s in failing:
+            code = s.state.code
+            if s in self.store.sockets_by_code.get(code, ()):
+                s.fail = None
+                continue
+            reaped += 1
+            self.retired.append(s)
+            players = self.engines[code].game.players
+            seat = next((i for i, p in enumerate(players) if p.id == s.state.player_id), len(players))
+            self._connect(code, seat)
+        return reaped
+
+
+# -------------------------
+# Ops
+# -------------------------
+Op = Callable[[Fleet, str], Awaitable[None]]
+OPS: Dict[str, Op] = {}
+
+
+def op(fn: Op) -> Op:
+    OPS[fn.__name__] = fn
+    return fn
+
+
+@op
+async def broadcast(fleet: Fleet, code: str) -> None:
+    await ws_module._broadcast(code, "game_public_state", fleet.public[code])
+
+
+@op
+async def send_private(fleet: Fleet, code: str) -> None:
+    engine = fleet.engines[code]
+    await ws_module._send_private(code, engine, engine.game.players[engine.game.current_player_idx].id)
+
+
+@op
+async def refresh_all(fleet: Fleet, code: str) -> None:
+    engine = fleet.engines[code]
+    engine._mark_all_dirty()
+    await ws_module._refresh_all(code, engine)
+
+
+@op
+async def engine_events(fleet: Fleet, code: str) -> None:
+    engine = fleet.engines[code]
+    finisher = engine.game.players[0].id
+    engine._events.append({"type": "final_round_started", "finisherId": finisher, "lastTurnsRemaining": 3})
+    engine._events.append({"type": "last_turn_taken", "playerId": finisher, "lastTurnsRemaining": 2})
+    await ws_module._broadcast_engine_events(code, engine)
+
+
+# -------------------------
+# Runner
+# -------------------------
+class _EncodeTimer:
+    """Wraps ws._encode for the duration of a run to time serialization."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._orig = ws_module._encode
+
+    def __enter__(self) -> "_EncodeTimer":
+        def timed_encode(type_, payload):
+            t0 = time.perf_counter()
+            try:
+                return self._orig(type_, payload)
+            finally:
+                self.seconds += time.perf_counter() - t0
+
+        ws_module._encode = timed_encode
+        return self
+
+    def __exit__(self, *exc) -> None:
+        ws_module._encode = self._orig
+
+
+def _pct(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def measure(
+    op_name: str,
+    fleet: Fleet,
+    iterations: int,
+    fail_rate: float = 0.0,
+    fail_mode: str = "disconnect",
+) -> dict:
+    fn = OPS[op_name]
+    rng = random.Random(fleet.seed)
+    latencies: List[float] = []
+    elapsed = 0.0
+    reaped = 0
+
+    async def timed(code: str) -> None:
+        t0 = time.perf_counter()
+        await fn(fleet, code)
+        latencies.append(time.perf_counter() - t0)
+
+    frames_before = fleet.frames()
+    with _EncodeTimer() as enc:
+        for _ in range(iterations):
+            failing = fleet.churn(rng, fail_rate, fail_mode) if fail_rate else []
+            t0 = time.perf_counter()
+            await asyncio.gather(*(timed(code) for code in fleet.engines))
+            elapsed += time.perf_counter() - t0
+            if failing:
+                reaped += fleet.replace(failing)
+
+    frames = fleet.frames() - frames_before
+    latencies.sort()
+    return {
+        "op": op_name,
+        "tables": fleet.tables,
+        "sockets_per_table": fleet.sockets_per_table,
+        "sockets": fleet.socket_count(),
+        "frames": frames,
+        "frames_per_s": round(frames / elapsed) if elapsed else 0,
+        "encode_share": round(enc.seconds / elapsed, 3) if elapsed else 0.0,
+        "p50_us": round(_pct(latencies, 0.50) * 1e6, 1),
+        "p99_us": round(_pct(latencies, 0.99) * 1e6, 1),
+        "max_us": round(latencies[-1] * 1e6, 1) if latencies else 0.0,
+        "reaped": reaped,
+    }
+
+
+def _fmt_row(r: dict) -> str:
+    return (
+        f"  {r['op']:14s} {r['tables']:6d} x {r['sockets_per_table']:<4d} {r['sockets']:7d}  "
+        f"{r['frames_per_s']:10,d}/s  {r['encode_share']:6.1%}  "
+        f"{r['p50_us']:9.1f} {r['p99_us']:9.1f} {r['max_us']:9.1f}  {r['reaped']:6d}"
+    )
+
+
+async def run(args) -> List[dict]:
+    results = []
+    for tables in args.tables:
+        for per_table in args.sockets:
+            fleet = Fleet(tables, per_table, args.players, args.latency_ms / 1000, args.seed).build()
+            saved = ws_module.store
+            ws_module.store = fleet.store
+            try:
+                for name in args.ops:
+                    r = await measure(name, fleet, args.iterations, args.fail_rate, args.fail_mode)
+                    print(_fmt_row(r), flush=True)
+                    results.append(r)
+            finally:
+                ws_module.store = saved
+    return results
+
+
+def _ints(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--tables", type=_ints, default=[10, 100, 500], help="tables per worker (comma-separated)")
+    ap.add_argument("--sockets", type=_ints, default=[4, 16, 64], help="sockets per table (comma-separated)")
+    ap.add_argument("--players", type=int, default=4, help="seated players per table (2-6)")
+    ap.add_argument("--ops", default=",".join(OPS), help="comma-separated ops")
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="delay inside every send_text")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of sockets failing per iteration")
+    ap.add_argument("--fail-mode", choices=FAIL_MODES, default="disconnect")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", type=Path, default=None, help="also write the results here")
+    args = ap.parse_args(argv)
+    args.ops = [o for o in args.ops.split(",") if o]
+    unknown = set(args.ops) - set(OPS)
+    if unknown:
+        ap.error(f"unknown ops: {', '.join(sorted(unknown))}")
+
+    # Injected failures would otherwise log (sampled) warnings on every iteration.
+    logging.getLogger("skyjo").setLevel(logging.ERROR)
+    print(f"  {'op':14s} {'tables':>6s} x {'per':4s} {'sockets':>7s}  {'frames':>12s}  "
+          f"{'encode':>6s}  {'p50 us':>9s} {'p99 us':>9s} {'max us':>9s}  {'reaped':>6s}")
+    results = asyncio.run(run(args))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+"""
+Load generator: N tables x M bot players playing full legal games concurrently.
+
+Uses only the client messages from frontend/CONTRACTS.md (create_table,
+join_game, set_ready, setup_reveal, draw_from_deck, take_discard,
+swap_into_grid, discard_drawn_and_reveal, start_new_round), so it measures what
+real clients cost.
+
+    python Backend/tools/loadtest.py --tables 200 --players 4 --think-ms 300
+
+Reports command-to-state latency (time from sending a command until the next
+game_public_state on that socket), messages/sec and error rates.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    sent: int = 0
+    received: int = 0
+    errors: int = 0
+    connect_failures: int = 0
+    games_finished: int = 0
+    games_stalled: int = 0
+    rounds: int = 0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Conn:
+    """One WebSocket with JSON helpers and per-socket stats."""
+
+    def __init__(self, ws, stats: Stats):
+        self.ws = ws
+        self.stats = stats
+
+    async def send(self, type_: str, payload: Dict[str, Any]) -> None:
+        await self.ws.send(json.dumps({"type": type_, "payload": payload}))
+        self.stats.sent += 1
+
+    async def recv(self, timeout_s: float) -> Dict[str, Any]:
+        while True:
+            msg = json.loads(await asyncio.wait_for(self.ws.recv(), timeout=timeout_s))
+            self.stats.received += 1
+            if msg.get("type") != "ping":
+                return msg
+            # Answer heartbeats like the browser client, or long games get reaped.
+            await self.send("pong", msg["payload"])
+
+    async def recv_until(self, type_: str, timeout_s: float) -> Dict[str, Any]:
+        while True:
+            msg = await self.recv(timeout_s)
+            if msg.get("type") == type_:
+                return msg
+
+
+class Bot:
+    """
+    A simple greedy Skyjo player. Acts on game_public_state (phase, current
+    player, discard top, drawn card); its own grid comes from player_private_state.
+    """
+
+    def __init__(self, conn: Conn, name: str, seat: int, think_s: float, rng: random.Random):
+        self.conn = conn
+        self.name = name
+        self.seat = seat
+        self.think_s = think_s
+        self.rng = rng
+        self.token = ""
+        self.player_id = ""
+        self.grid: List[Dict[str, Any]] = []
+        self.holding: Optional[int] = None
+        self.sent_at: Optional[float] = None
+        self.setup_round: Optional[int] = None
+        self.last_public: Optional[Dict[str, Any]] = None
+
+    async def join(self, code: str, timeout_s: float) -> None:
+        await self.conn.send("join_game", {"code": code, "name": self.name})
+        joined = await self.conn.recv_until("joined", timeout_s)
+        self.token = joined["payload"]["token"]
+        self.player_id = joined["payload"]["playerId"]
+
+    async def command(self, type_: str, **payload: Any) -> None:
+        if self.think_s:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_s)
+        payload["token"] = self.token
+        self.sent_at = time.perf_counter()
+        await self.conn.send(type_, payload)
+
+    # -------------------------
+    # Strategy
+    # -------------------------
+    def _live(self) -> List[Dict[str, Any]]:
+        return [c for c in self.grid if not c["isRemoved"]]
+
+    def _face_down(self) -> List[int]:
+        return [c["i"] for c in self._live() if not c["isFaceUp"]]
+
+    def _worst_face_up(self) -> Optional[Dict[str, Any]]:
+        up = [c for c in self._live() if c["isFaceUp"]]
+        return max(up, key=lambda c: c["value"]) if up else None
+
+    def _place_target(self, value: int) -> Optional[int]:
+        """Where to put `value`, or None to throw it away."""
+        worst = self._worst_face_up()
+        if worst is not None and worst["value"] > value:
+            return worst["i"]
+        down = self._face_down()
+        if down and value <= 4:
+            return self.rng.choice(down)
+        return None
+
+    async def on_public(self, game: Dict[str, Any]) -> bool:
+        """React to a public state. Returns False once the game is over."""
+        # Handlers end with a repeat of the same public state ("deterministisch
+        # einde"); act once per distinct state.
+        if game == self.last_public:
+            return True
+        self.last_public = game
+        phase = game["phase"]
+        if phase == "GAME_OVER":
+            return False
+
+        if phase == "SETUP_REVEAL":
+            if self.setup_round != game["roundIndex"]:
+                self.setup_round = game["roundIndex"]
+                self.holding = None
+                for idx in self.rng.sample(range(12), 2):
+                    await self.command("setup_reveal", index=idx)
+            return True
+
+        if phase == "ROUND_OVER":
+            if self.seat == 0:
+                await self.command("start_new_round")
+            return True
+
+        if game["currentPlayerId"] != self.player_id:
+            return True
+
+        if phase == "TURN_CHOOSE_SOURCE":
+            top = game["discardTop"]
+            if top is not None and self._place_target(top) is not None and top <= 4:
+                self.holding = top
+                await self.command("take_discard")
+            else:
+                self.holding = None
+                await self.command("draw_from_deck")
+        elif phase == "TURN_RESOLVE":
+            value = self.holding if self.holding is not None else game["tableDrawnCard"]
+            target = self._place_target(value)
+            down = self._face_down()
+            if target is None and down and self.holding is None:
+                await self.command("discard_drawn_and_reveal", index=self.rng.choice(down))
+            else:
+                if target is None:
+                    worst = self._worst_face_up()
+                    target = worst["i"] if worst is not None else self._live()[0]["i"]
+                await self.command("swap_into_grid", index=target)
+            self.holding = None
+        return True
+
+    async def run(self, stall_s: float) -> None:
+        stats = self.conn.stats
+        while True:
+            msg = await self.conn.recv(stall_s)
+            t = msg.get("type")
+            if t == "player_private_state":
+                self.grid = msg["payload"]["me"]["grid"]
+            elif t == "error":
+                # A legal bot should never see one; a lost command shows up as a stall.
+                stats.errors += 1
+                self.sent_at = None
+            elif t == "game_public_state":
+                if self.sent_at is not None:
+                    stats.latencies.append(time.perf_counter() - self.sent_at)
+                    self.sent_at = None
+                if not await self.on_public(msg["payload"]["game"]):
+                    return
+
+
+async def play_table(
+    uri: str,
+    players: int,
+    think_s: float,
+    stall_s: float,
+    stats: Stats,
+    seed: int,
+    ramp: asyncio.Semaphore,
+) -> None:
+    rng = random.Random(seed)
+    sockets = []
+    try:
+        try:
+            await ramp.acquire()
+            table_ws = await websockets.connect(uri, max_size=None)
+            sockets.append(table_ws)
+            table = Conn(table_ws, stats)
+            await table.send("create_table", {})
+            code = (await table.recv_until("table_created", stall_s))["payload"]["code"]
+
+            bots = []
+            for seat in range(players):
+                ws = await websockets.connect(uri, max_size=None)
+                sockets.append(ws)
+                bot = Bot(Conn(ws, stats), f"bot{seat}", seat, think_s, rng)
+                await bot.join(code, stall_s)
+                bots.append(bot)
+        except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+            stats.connect_failures += 1
+            return
+        finally:
+            ramp.release()
+
+        async def drain_table():
+            # The table view receives every broadcast; read it so the server never blocks on it.
+            try:
+                while True:
+                    msg = await table.recv(stall_s * 4)
+                    event = (msg.get("payload") or {}).get("event") or {}
+                    if msg.get("type") == "info" and event.get("type") == "round_ended":
+                        stats.rounds += 1
+            except (asyncio.TimeoutError, websockets.WebSocketException):
+                pass
+
+        drainer = asyncio.create_task(drain_table())
+        for bot in bots:
+            await bot.command("set_ready", ready=True)
+            bot.sent_at = None
+        try:
+            await asyncio.gather(*(bot.run(stall_s) for bot in bots))
+            stats.games_finished += 1
+        except (asyncio.TimeoutError, websockets.WebSocketException):
+            stats.games_stalled += 1
+        finally:
+            drainer.cancel()
+    finally:
+        for ws in sockets:
+            await ws.close()
+
+
+def report(stats: Stats, elapsed: float, tables: int) -> str:
+    msgs = stats.sent + stats.received
+    lines = [
+        f"tables:            {tables} (finished {stats.games_finished}, stalled {stats.games_stalled}, "
+        f"connect failures {stats.connect_failures})",
+        f"rounds played:     {stats.rounds}",
+        f"elapsed:           {elapsed:.1f}s",
+        f"messages:          {msgs} ({msgs / elapsed:.0f}/s; sent {stats.sent}, received {stats.received})",
+        f"error rate:        {stats.errors} errors ({stats.errors / max(1, stats.sent):.3%} of commands)",
+        "command -> state:  "
+        + ", ".join(f"p{int(q * 100)} {stats.percentile(q) * 1000:.1f}ms" for q in (0.5, 0.95, 0.99))
+        + f" (n={len(stats.latencies)})",
+    ]
+    return "\n".join(lines)
+
+
+async def run(args) -> Stats:
+    stats = Stats()
+    started = time.perf_counter()
+    # Connection ramp: at most --ramp tables connecting/joining at once.
+    ramp = asyncio.Semaphore(args.ramp)
+    await asyncio.gather(*(
+        play_table(args.uri, args.players, args.think_ms / 1000, args.stall_s, stats, args.seed + i, ramp)
+        for i in range(args.tables)
+    ))
+    print(report(stats, time.perf_counter() - started, args.tables))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--uri", default="ws://127.0.0.1:8001/ws")
+    ap.add_argument("--tables", type=int, default=10, help="concurrent tables (games)")
+    ap.add_argument("--players", type=int, default=4, help="bot players per table (2-8)")
+    ap.add_argument("--think-ms", type=float, default=200.0, help="mean bot think time per action")
+    ap.add_argument("--stall-s", type=float, default=15.0, help="give up on a game after this long without progress")
+    ap.add_argument("--ramp", type=int, default=50, help="tables connecting at the same time")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--max-error-rate", type=float, default=None,
+                    help="exit 1 if errors/commands exceeds this (for CI)")
+    args = ap.parse_args(argv)
+
+    stats = asyncio.run(run(args))
+    failed = stats.games_stalled + stats.connect_failures > 0
+    if args.max_error_rate is not None and stats.errors / max(1, stats.sent) > args.max_error_rate:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
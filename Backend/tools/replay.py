@@ -0,0 +1,244 @@
+"""
+Replay a recorded session log (SKYJO_RECORD_DIR) through the server's message
+handling, in-process, and check it reproduces the recorded states.
+
+    python Backend/tools/replay.py /var/lib/skyjo/rec/sessions-0.jsonl
+    python Backend/tools/replay.py rec/ --pace original --speed 4
+    python Backend/tools/replay.py rec/ --game K7QM            # one game only
+
+Every recorded connection becomes an in-memory socket and every inbound
+message goes through cluster.route -> handle_message, exactly as
+websocket_endpoint does. Games are re-created with their recorded code and RNG
+seed, so decks and player ids match; tokens are issued anew and translated.
+Table-view flushes and turn-deadline auto-plays happen where the recording
+says they did, not on timers. After the run, the checksums of every
+game_public_state broadcast are compared with the recorded ones per game. Exit status 1 on any mismatch. (Messages are
+replayed one at a time; two messages for the same game whose handlers
+overlapped live can, rarely, broadcast in a different order.)
+
+--pace fast (default) replays back to back, for benchmarking the handlers with
+real traffic; --pace original keeps the recorded gaps (divided by --speed).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SKYJO_SNAPSHOT_DIR", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from Backend.app import ws as ws_module  # noqa: E402
+from Backend.app.coalesce import Coalescer  # noqa: E402
+from Backend.app.game.rules import CLASSIC  # noqa: E402
+from Backend.app.game.store import GameStore  # noqa: E402
+from Backend.app.recorder import SessionRecorder, recording_files  # noqa: E402
+
+Record = Dict[str, Any]
+
+
+def load(paths: List[str]) -> List[Record]:
+    """
+    Records from the given files or directories (rotated backups included).
+    Several files (one per shard) are merged by timestamp; within a file the
+    write order is kept.
+    """
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            for name in sorted(os.listdir(p)):
+                if name.endswith(".jsonl"):
+                    files.extend(recording_files(os.path.join(p, name)))
+        else:
+            files.extend(recording_files(p))
+    # Rotated pieces of one recording are one stream.
+    streams: Dict[str, List[Record]] = defaultdict(list)
+    for f in files:
+        with open(f, encoding="utf-8") as fh:
+            streams[re.sub(r"\.\d+$", "", f)].extend(json.loads(line) for line in fh if line.strip())
+    return list(heapq.merge(*streams.values(), key=lambda r: r["t"]))
+
+
+def only_game(records: List[Record], code: str) -> List[Record]:
+    """The records of one game: its own records plus everything its connections sent."""
+    conns = {r["c"] for r in records if r.get("g") == code and "c" in r}
+    for r in records:
+        if r["k"] == "in" and isinstance(r["m"], dict) and (r["m"].get("payload") or {}).get("code") == code:
+            conns.add(r["c"])
+    return [r for r in records if r.get("g") == code or r.get("c") in conns]
+
+
+class ReplaySocket:
+    """In-memory stand-in for one recorded connection."""
+
+    def __init__(self, conn: str):
+        self.state = SimpleNamespace(code=None, player_id=None, conn_id=conn)
+        self.frames = 0
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        self.frames += 1
+
+
+class ReplayStore(GameStore):
+    """create_game hands out the recorded (code, seed) pairs in order."""
+
+    def __init__(self, games: Deque[Tuple[str, int]]):
+        super().__init__()
+        self.recorded_games = games
+
+    def create_game(self, accept_code=None, code=None, seed=None, rules=CLASSIC):
+        if code is None and self.recorded_games:
+            code, seed = self.recorded_games.popleft()
+        return super().create_game(accept_code, code=code, seed=seed, rules=rules)
+
+
+class RecordedFlushes(Coalescer):
+    """
+    Table-view coalescer for replays: requests are ignored, the flushes happen
+    where the recording says they did ("flush" records), not on a timer.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(0.0, ws_module._flush_table_ui)
+
+    async def request(self, code: str) -> None:
+        return
+
+
+class CaptureRecorder(SessionRecorder):
+    """Recorder that keeps the replay's own records in memory."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.enabled = True
+        self.records: List[Record] = []
+
+    def _write(self, record: Record) -> None:
+        self.records.append(record)
+
+
+def _outputs(records: List[Record]) -> Dict[str, List[int]]:
+    out: Dict[str, List[int]] = defaultdict(list)
+    for r in records:
+        if r["k"] == "out":
+            out[r["g"]].append(r["h"])
+    return out
+
+
+def _translate(raw: Any, tokens: Dict[str, str]) -> Any:
+    payload = raw.get("payload") if isinstance(raw, dict) else None
+    if isinstance(payload, dict) and payload.get("token") in tokens:
+        raw = dict(raw, payload=dict(payload, token=tokens[payload["token"]]))
+    return raw
+
+
+async def replay(records: List[Record], pace: str = "fast", speed: float = 1.0) -> dict:
+    store = ReplayStore(deque((r["g"], r["s"]) for r in records if r["k"] == "game"))
+    capture = CaptureRecorder()
+    saved = ws_module.store, ws_module.cluster.store, ws_module.recorder, ws_module.table_ui
+    ws_module.store = ws_module.cluster.store = store
+    ws_module.recorder = capture
+    ws_module.table_ui = RecordedFlushes()
+
+    sockets: Dict[str, ReplaySocket] = {}
+    tokens: Dict[str, str] = {}
+    handle_s: List[float] = []
+    failures = 0
+    first_t: Optional[float] = None
+    started = time.perf_counter()
+    try:
+        for r in records:
+            kind = r["k"]
+            if kind == "join":
+                # Same seed -> same player id; map the recorded token onto the new one.
+                engine = store.get_game(r["g"])
+                new = next(tok for tok, pid in engine.tokens.items() if pid == r["p"])
+                tokens[r["tok"]] = new
+            elif kind == "flush":
+                await ws_module._flush_table_ui(r["g"])
+            elif kind == "timeout":
+                await ws_module._turn_timeout(r["g"])
+            elif kind == "bye":
+                s = sockets.pop(r["c"], None)
+                if s is not None:
+                    await ws_module.cluster.detach(s)
+            elif kind == "in":
+                if pace == "original":
+                    first_t = r["t"] if first_t is None else first_t
+                    delay = (r["t"] - first_t) / speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                s = sockets.get(r["c"])
+                if s is None:
+                    s = sockets[r["c"]] = ReplaySocket(r["c"])
+                    ws_module.cluster.attach(s)
+                if s.closed:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    await ws_module.cluster.route(s, _translate(r["m"], tokens))
+                except Exception:
+                    # The live endpoint drops the connection on a handler exception.
+                    failures += 1
+                    s.closed = True
+                handle_s.append(time.perf_counter() - t0)
+    finally:
+        ws_module.store, ws_module.cluster.store, ws_module.recorder, ws_module.table_ui = saved
+    elapsed = time.perf_counter() - started
+
+    expected, got = _outputs(records), _outputs(capture.records)
+    mismatches = []
+    for code in sorted(set(expected) | set(got)):
+        a, b = expected.get(code, []), got.get(code, [])
+        if a != b:
+            at = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+            mismatches.append(f"{code}: states diverge at #{at} (recorded {len(a)}, replayed {len(b)})")
+
+    handle_s.sort()
+    return {
+        "messages": len(handle_s),
+        "games": len(expected),
+        "elapsed_s": elapsed,
+        "handler_failures": failures,
+        "p50_ms": handle_s[len(handle_s) // 2] * 1000 if handle_s else 0.0,
+        "p99_ms": handle_s[min(len(handle_s) - 1, int(0.99 * len(handle_s)))] * 1000 if handle_s else 0.0,
+        "mismatches": mismatches,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("paths", nargs="+", help="recording files or directories")
+    ap.add_argument("--pace", choices=("fast", "original"), default="fast")
+    ap.add_argument("--speed", type=float, default=1.0, help="with --pace original: time compression factor")
+    ap.add_argument("--game", default=None, help="replay only this game code")
+    args = ap.parse_args(argv)
+
+    records = load(args.paths)
+    if args.game:
+        records = only_game(records, args.game.upper())
+    result = asyncio.run(replay(records, args.pace, args.speed))
+
+    rate = result["messages"] / result["elapsed_s"] if result["elapsed_s"] else 0.0
+    print(f"replayed {result['messages']} messages for {result['games']} games in {result['elapsed_s']:.2f}s "
+          f"({rate:.0f} msg/s; handler p50 {result['p50_ms']:.3f}ms, p99 {result['p99_ms']:.3f}ms; "
+          f"{result['handler_failures']} handler failures)")
+    for line in result["mismatches"]:
+        print("❌ " + line)
+    if not result["mismatches"]:
+        print("✅ all recorded states reproduced")
+    return 1 if result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
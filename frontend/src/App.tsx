@@ -9,7 +9,13 @@ import {
   saveTableStorage,
   savePlayerMirror,
 } from './lib/storage'
-import type { GameMeta, GamePublicState, PlayerPrivateState, ServerMessage } from './types/skyjo'
+import type {
+  GameMeta,
+  GamePublicState,
+  PlayerConnection,
+  PlayerPrivateState,
+  ServerMessage,
+} from './types/skyjo'
 import { PlayerView } from './views/PlayerView'
 import { TableView } from './views/TableView'
 
@@ -38,6 +44,8 @@ function App() {
   const [publicState, setPublicState] = useState<GamePublicState | null>(null)
   const [privateState, setPrivateState] = useState<PlayerPrivateState | null>(null)
   const [privateMeta, setPrivateMeta] = useState<GameMeta | null>(null)
+  const [roundHistory, setRoundHistory] = useState<Array<Record<string, number>>>([])
+  const [connections, setConnections] = useState<Record<string, PlayerConnection>>({})
   const [playerName, setPlayerName] = useState(storedPlayer.name ?? '')
   const [playerSession, setPlayerSession] = useState<PlayerSession | null>(() => {
     if (storedPlayer.token && storedPlayer.playerId && storedPlayer.code) {
@@ -57,7 +65,31 @@ function App() {
   const handleMessage = useCallback(
     (message: ServerMessage) => {
       if (message.type === 'game_public_state') {
-        setPublicState(message.payload.game)
+        const game = message.payload.game
+        setPublicState(game)
+        // Public state only carries the latest round; older rounds come from round_history.
+        setRoundHistory((prev) => {
+          if (game.roundHistoryCount < prev.length) return []
+          if (game.roundHistoryCount === prev.length + 1 && game.lastRoundScores) {
+            return [...prev, game.lastRoundScores]
+          }
+          return prev
+        })
+        return
+      }
+      if (message.type === 'round_history') {
+        const { items } = message.payload
+        setRoundHistory((prev) => {
+          const next = [...prev]
+          for (const item of items) next[item.roundIndex - 1] = item.scores
+          return next
+        })
+        return
+      }
+      if (message.type === 'connection_stats') {
+        setConnections(
+          Object.fromEntries(message.payload.players.map((player) => [player.playerId, player])),
+        )
         return
       }
       if (message.type === 'player_private_state') {
@@ -113,6 +145,8 @@ function App() {
           <TableView
             socket={socket}
             publicState={publicState}
+            roundHistory={roundHistory}
+            connections={connections}
             tableCode={tableCode}
             lastInfo={lastInfo}
             lastError={combinedError}
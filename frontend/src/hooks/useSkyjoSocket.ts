@@ -38,6 +38,11 @@ export function useSkyjoSocket(options: UseSkyjoSocketOptions = {}) {
     const handleMessage = (event: MessageEvent<string>) => {
       try {
         const parsed = JSON.parse(event.data) as ServerMessage
+        if (parsed.type === 'ping') {
+          // Heartbeat: answer right away; it is no app state, so no re-render.
+          socket.send(JSON.stringify({ type: 'pong', payload: { id: parsed.payload.id } }))
+          return
+        }
         setLastMessage(parsed)
         onMessageRef.current?.(parsed)
       } catch (error) {
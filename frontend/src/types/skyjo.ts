@@ -11,7 +11,7 @@ export type TableSelectedSource = 'deck' | 'discard' | null
 export type TableDeckMode = 'swap' | 'reveal'
 
 export type ClientMessage =
-  | { type: 'create_table'; payload: Record<string, never> }
+  | { type: 'create_table'; payload: { rules?: RuleSetName | Partial<RuleSet> & { preset?: RuleSetName } } }
   | { type: 'join_game'; payload: { code: string; name: string } }
   | { type: 'resume_game'; payload: { code: string; token: string } }
   | { type: 'set_ready'; payload: { token: string; ready: boolean } }
@@ -24,6 +24,27 @@ export type ClientMessage =
   | { type: 'start_new_round'; payload: { token: string } }
   | { type: 'table_set_selection'; payload: { source: TableSelectedSource } }
   | { type: 'table_set_deck_mode'; payload: { mode: TableDeckMode } }
+  | { type: 'get_round_history'; payload: { offset: number; limit: number } }
+  | { type: 'get_card_counts'; payload: Record<string, never> }
+  | { type: 'request_hint'; payload: { token: string } }
+  | { type: 'pong'; payload: { id: number } }
+  | { type: 'spectate_game'; payload: { code: string } }
+  | { type: 'undo_turn'; payload: Record<string, never> }
+
+export type RuleSetName = 'classic' | 'quick' | 'rows_and_columns' | 'no_doubling'
+
+// Rules of one game (create_table `rules`); `deck` is [value, copies] pairs.
+export type RuleSet = {
+  name: string
+  gameOverThreshold: number
+  deck: [number, number][]
+  rows: number
+  cols: number
+  setupReveals: number
+  removeColumns: boolean
+  removeRows: boolean
+  finisherDoubling: boolean
+}
 
 export type RankedTotal = {
   playerId: string
@@ -54,13 +75,41 @@ export type GamePublicState = {
   roundScores: Record<string, number> | null
   finisherDoubled: boolean | null
   roundIndex: number
-  roundHistory: Array<Record<string, number>>
+  rules: RuleSet
+  roundHistoryCount: number
+  lastRoundScores: Record<string, number> | null
   totalScores: Record<string, number>
   winnerId: string | null
   rankedTotals: RankedTotal[] | null
   players: PublicPlayer[]
 }
 
+export type RoundHistoryItem = {
+  roundIndex: number
+  scores: Record<string, number>
+}
+
+// Cards nobody can see yet (deck + face-down grid cards); keys are card values "-2".."12".
+export type CardCounts = {
+  unseen: Record<string, number>
+  unseenTotal: number
+  deckCount: number
+}
+
+export type HintAction = {
+  action: 'take_discard' | 'draw_from_deck' | 'swap_into_grid' | 'discard_drawn_and_reveal' | 'discard_drawn'
+  index?: number
+  card?: number
+  expectedDelta: number // expected change of the own grid score; lower is better
+}
+
+export type Hint = {
+  phase: 'TURN_CHOOSE_SOURCE' | 'TURN_RESOLVE'
+  card: number | null
+  actions: HintAction[]
+  best: HintAction | null
+}
+
 export type GridCell = {
   i: number
   isRemoved: boolean
@@ -88,6 +137,18 @@ export type GameMeta = {
   rankedTotals: RankedTotal[] | null
 }
 
+export type PlayerConnection = {
+  playerId: string
+  connected: boolean
+  rttMs: number | null
+}
+
+export type RoundReveal = {
+  roundIndex: number
+  scores: Record<string, number>
+  grids: { playerId: string; values: (number | null)[] }[]
+}
+
 export type InfoEvent =
   | {
       type: 'final_round_started'
@@ -107,6 +168,18 @@ export type InfoEvent =
       rankedTotals: RankedTotal[]
       totalScores: Record<string, number>
     }
+  | {
+      type: 'turn_undone'
+      playerIds: string[]
+      canUndo: boolean
+    }
+  | {
+      type: 'turn_timed_out'
+      playerId: string
+      phase: GamePhase
+      action: 'setup_reveal' | 'discard_and_reveal' | 'discard'
+      indices: number[]
+    }
   | Record<string, unknown>
 
 export type ServerMessage =
@@ -120,5 +193,15 @@ export type ServerMessage =
       type: 'player_private_state'
       payload: { me: PlayerPrivateState; gameMeta: GameMeta }
     }
+  | {
+      type: 'round_history'
+      payload: { total: number; offset: number; items: RoundHistoryItem[] }
+    }
+  | { type: 'card_counts'; payload: CardCounts }
+  | { type: 'hint'; payload: Hint }
   | { type: 'info'; payload: { message: string; event?: InfoEvent } }
   | { type: 'error'; payload: { message: string } }
+  | { type: 'ping'; payload: { id: number } }
+  | { type: 'connection_stats'; payload: { players: PlayerConnection[] } }
+  | { type: 'spectating'; payload: { code: string } }
+  | { type: 'round_reveal'; payload: RoundReveal }
@@ -24,14 +24,18 @@ type PlayerViewProps = {
   onClearPlayerSession: () => void
 }
 
-const GRID_SIZE = 12
-
-const emptyGrid: GridCell[] = Array.from({ length: GRID_SIZE }, (_, i) => ({
-  i,
-  isRemoved: false,
-  isFaceUp: false,
-  value: null,
-}))
+// Classic layout, used until the game's rules arrive with the public state.
+const DEFAULT_ROWS = 3
+const DEFAULT_COLS = 4
+const DEFAULT_SETUP_REVEALS = 2
+
+const emptyGrid = (size: number): GridCell[] =>
+  Array.from({ length: size }, (_, i) => ({
+    i,
+    isRemoved: false,
+    isFaceUp: false,
+    value: null,
+  }))
 
 const cardImageMap = Object.fromEntries(
   Object.entries(
@@ -90,8 +94,10 @@ export function PlayerView({
     hasResumedRef.current = true
   }, [playerSession?.code, playerSession?.token, sendMessageWithLog, status])
 
-  const currentPlayerId = privateMeta?.currentPlayerId ?? publicState?.currentPlayerId ?? null
-  const phase = privateMeta?.phase ?? publicState?.phase ?? 'LOBBY'
+  // Shared meta comes from the public broadcast; private state is only resent
+  // when this player's own view changed, so its gameMeta can lag behind.
+  const currentPlayerId = publicState?.currentPlayerId ?? privateMeta?.currentPlayerId ?? null
+  const phase = publicState?.phase ?? privateMeta?.phase ?? 'LOBBY'
   const isSocketOpen = status === 'open'
   const tableSelectedSource = publicState?.tableSelectedSource ?? null
   const tableDeckMode = publicState?.tableDeckMode ?? 'swap'
@@ -116,15 +122,19 @@ export function PlayerView({
   const hasSelection = tableSelectedSource !== null
   const canGridAction = canResolveTurn && hasSelection
 
+  const gridRows = publicState?.rules?.rows ?? DEFAULT_ROWS
+  const gridCols = publicState?.rules?.cols ?? DEFAULT_COLS
+  const setupReveals = publicState?.rules?.setupReveals ?? DEFAULT_SETUP_REVEALS
+
   const setupRevealsDone = privateState?.setupRevealsDone ?? 0
   const canSetupReveal =
-    phase === 'SETUP_REVEAL' && Boolean(playerSession?.token) && setupRevealsDone < 2
+    phase === 'SETUP_REVEAL' && Boolean(playerSession?.token) && setupRevealsDone < setupReveals
 
   const backImage = cardImageMap['Rückseite']
 
   const gridToRender = useMemo<GridCell[]>(
-    () => privateState?.grid ?? emptyGrid,
-    [privateState?.grid],
+    () => privateState?.grid ?? emptyGrid(gridRows * gridCols),
+    [privateState?.grid, gridRows, gridCols],
   )
 
   const points = useMemo(() => {
@@ -275,9 +285,12 @@ export function PlayerView({
       )}
 
       <div className="player-view__table">
-        <div className={`player-grid ${showActionCue ? 'player-grid--pulse' : ''}`}>
+        <div
+          className={`player-grid ${showActionCue ? 'player-grid--pulse' : ''}`}
+          style={{ gridTemplateColumns: `repeat(${gridCols}, minmax(90px, 1fr))` }}
+        >
           {gridToRender.map((cell) => {
-            const isRightColumn = cell.i % 4 === 3
+            const isRightColumn = cell.i % gridCols === gridCols - 1
             const canRevealCell = canSetupReveal && !cell.isFaceUp && !cell.isRemoved
             const canResolveCell = canGridAction && !cell.isRemoved
 
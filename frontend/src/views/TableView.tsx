@@ -1,12 +1,14 @@
-import { useMemo } from 'react'
+import { useEffect, useMemo } from 'react'
 import type { useSkyjoSocket } from '../hooks/useSkyjoSocket'
 import { clearTableStorage } from '../lib/storage'
-import type { GamePublicState } from '../types/skyjo'
+import type { GamePublicState, PlayerConnection } from '../types/skyjo'
 import './TableView.css'
 
 type TableViewProps = {
   socket: ReturnType<typeof useSkyjoSocket>
   publicState: GamePublicState | null
+  roundHistory: Array<Record<string, number>>
+  connections: Record<string, PlayerConnection>
   tableCode: string | null
   lastInfo: string | null
   lastError: string | null
@@ -28,6 +30,8 @@ const cardImageMap = Object.fromEntries(
 export function TableView({
   socket,
   publicState,
+  roundHistory,
+  connections,
   tableCode,
   lastError,
   onClearTableCode,
@@ -38,13 +42,25 @@ export function TableView({
   const tableSelectedSource = publicState?.tableSelectedSource ?? null
   const tableDeckMode = publicState?.tableDeckMode ?? 'swap'
   const isLocked = tableSelectedSource !== null
+  const canUndo = phase === 'TURN_CHOOSE_SOURCE' || phase === 'TURN_RESOLVE' || phase === 'ROUND_OVER'
 
   const players = useMemo(() => publicState?.players ?? [], [publicState])
   const playersToShow = useMemo(() => players.slice(0, 4), [players])
   const rows = useMemo(() => Array.from({ length: 10 }, (_, i) => i + 1), [])
   const totalScores = publicState?.totalScores ?? {}
-  const roundHistory = publicState?.roundHistory ?? []
-  const lastCompletedRoundIndex = roundHistory.length
+  const roundHistoryCount = publicState?.roundHistoryCount ?? 0
+  const lastCompletedRoundIndex = roundHistoryCount
+  const { sendMessage } = socket
+
+  useEffect(() => {
+    // Fetch only the rounds we are missing (first load or after reconnect).
+    if (roundHistoryCount > roundHistory.length) {
+      sendMessage({
+        type: 'get_round_history',
+        payload: { offset: roundHistory.length, limit: roundHistoryCount - roundHistory.length },
+      })
+    }
+  }, [roundHistoryCount, roundHistory.length, sendMessage])
 
   const currentPlayerName = useMemo(() => {
     if (!currentPlayerId) return '—'
@@ -104,6 +120,14 @@ export function TableView({
           >
             Spiel zurücksetzen
           </button>
+          <button
+            type="button"
+            className="table-view__button"
+            onClick={() => socket.sendMessage({ type: 'undo_turn', payload: {} })}
+            disabled={!canUndo}
+          >
+            Zug rückgängig
+          </button>
         </div>
         {lastError && <p className="table-view__error">{lastError}</p>}
       </div>
@@ -116,6 +140,9 @@ export function TableView({
               {playersToShow.map((player) => (
                 <th key={`header-${player.id}`} className="scoreboard__header">
                   {player.name}
+                  <span className={connectionClassName(connections[player.id])}>
+                    {connectionLabel(connections[player.id])}
+                  </span>
                 </th>
               ))}
             </tr>